@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from simulate_minimal_combat_v1 import (
+    OUT_DIR,
+    CombatEngine,
+    CombatTables,
+    build_monster_stats,
+    run_trial_chunk,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SCENARIO_FILE = ROOT / "data/sim/combat_diff_scenarios_v1.json"
+DEFAULT_BASELINE = OUT_DIR / "combat_bench_baseline_v1.json"
+# Synthetic cases on top of the diff scenarios: tanky monsters for long fights and
+# guaranteed skill statuses against on-hit status monsters.
+SYNTHETIC_CASES = (
+    {
+        "name": "synthetic_long_fight",
+        "difficulty_index": 20,
+        "player_level": 30,
+        "rebirth_count": 2,
+        "seed": 20260301,
+        "max_turns": 600,
+        "skill_ids": ["sk_atk_001", "sk_atk_002"],
+        "monster_ids": ["mob_m_001", "mob_m_006", "mob_m_008"],
+        "monster_overrides": {"hp_mult": "12.0", "atk_mult": "0.15"},
+    },
+    {
+        "name": "synthetic_many_status",
+        "difficulty_index": 20,
+        "player_level": 30,
+        "rebirth_count": 2,
+        "seed": 20260302,
+        "max_turns": 300,
+        "skill_ids": ["sk_atk_002", "sk_atk_004"],
+        "monster_ids": ["mob_m_003", "mob_m_009", "mob_m_010"],
+        "monster_overrides": {"hp_mult": "4.0", "atk_mult": "0.3"},
+        "skill_overrides": {"status_chance_pct": 100.0},
+    },
+)
+# Pure-Python loop timed right before and after every engine repetition; throughput is
+# gated relative to it so a baseline recorded on one machine still applies on a slower
+# or faster runner, and a slow stretch on a shared runner hits both sides of the ratio.
+CALIBRATION_LOOPS = 1000000
+# Share of repetitions dropped from each end before averaging: a shared runner stalls or
+# boosts a few reps, and neither the slowest nor the single fastest rep is representative.
+TRIM_FRACTION = 0.25
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Python combat engine and gate throughput against a stored baseline."
+    )
+    parser.add_argument("--scenario-file", type=Path, default=DEFAULT_SCENARIO_FILE)
+    parser.add_argument("--trials", type=int, default=600, help="duels per monster per repetition")
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=15,
+        help="timed repetitions per case (the trimmed mean of the per-repetition ratios is gated)",
+    )
+    parser.add_argument("--warmup", type=int, default=1, help="untimed repetitions per case")
+    parser.add_argument("--case", action="append", dest="cases", help="run only these case names (repeatable)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--write-baseline",
+        action="store_true",
+        help="record this run as the baseline instead of comparing against it",
+    )
+    parser.add_argument(
+        "--max-regression-pct",
+        type=float,
+        default=15.0,
+        help="fail when normalized duels/sec drops more than this vs the baseline",
+    )
+    parser.add_argument(
+        "--report-only",
+        action="store_true",
+        help="mark regressions in the output and report but exit 0",
+    )
+    parser.add_argument("--report-file", type=Path, help="Optional JSON report output path.")
+    return parser.parse_args()
+
+
+def load_cases(path: Path) -> list[dict[str, Any]]:
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    entries = raw.get("scenarios", []) if isinstance(raw, dict) else raw
+    if not isinstance(entries, list) or not entries:
+        raise SystemExit(f"scenario file has no scenarios: {path}")
+    return [*entries, *SYNTHETIC_CASES]
+
+
+def build_tasks(engine: CombatEngine, case: dict[str, Any], trials: int) -> list[dict[str, Any]]:
+    config = {
+        "difficulty_index": int(case["difficulty_index"]),
+        "player_level": int(case["player_level"]),
+        "rebirth_count": int(case["rebirth_count"]),
+        "seed": int(case["seed"]),
+        "max_turns": int(case["max_turns"]),
+        "skill_ids": list(case["skill_ids"]),
+        "monster_ids": list(case["monster_ids"]),
+    }
+    constants = engine.tables.constants
+    player_stats = engine.player_stats(config)
+    skills = [{**skill, **case.get("skill_overrides", {})} for skill in engine.skills(config)]
+    tasks = []
+    for idx, monster in enumerate(engine.monsters(config)):
+        monster_row = {**monster, **case.get("monster_overrides", {})}
+        tasks.append(
+            {
+                "player_stats": player_stats,
+                "monster_row": monster_row,
+                "monster_stats": build_monster_stats(player_stats, monster_row, constants),
+                "skills": skills,
+                "constants": constants,
+                "base_seed": config["seed"],
+                "monster_index": idx,
+                "trial_start": 0,
+                "trial_end": trials,
+                "max_turns": config["max_turns"],
+                "engine": "scalar",
+                # SeededRng with or without NumPy, so a baseline recorded on one setup gates the other.
+                "block_rng": False,
+            }
+        )
+    return tasks
+
+
+def calibration_sec() -> float:
+    started = time.process_time()
+    acc = 0
+    for i in range(CALIBRATION_LOOPS):
+        acc += i & 7
+    return time.process_time() - started
+
+
+def trimmed(values: list[float]) -> list[float]:
+    """values sorted, without the TRIM_FRACTION lowest and highest (at least one value kept)."""
+    ordered = sorted(values)
+    cut = min(int(len(ordered) * TRIM_FRACTION), (len(ordered) - 1) // 2)
+    return ordered[cut : len(ordered) - cut]
+
+
+def peak_rss_kb() -> int:
+    """High-water RSS of this whole process so far (it never goes down between cases)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def bench_case(
+    engine: CombatEngine, case: dict[str, Any], trials: int, repeat: int, warmup: int
+) -> dict[str, Any]:
+    rss_before = peak_rss_kb()
+    tasks = build_tasks(engine, case, trials)
+    for _ in range(warmup):
+        for task in tasks:
+            run_trial_chunk(task)
+
+    # Seeded duels: every repetition plays the same duels and turns.
+    duels = 0
+    turns = 0
+    elapsed_secs: list[float] = []
+    calibration_rates: list[float] = []
+    normalized: list[float] = []
+    for _ in range(repeat):
+        # Calibration brackets the engine run, so both sides of each ratio see the same machine state.
+        before = calibration_sec()
+        started = time.process_time()
+        rows = [row for task in tasks for row in run_trial_chunk(task)]
+        elapsed = time.process_time() - started
+        after = calibration_sec()
+        duels = len(rows)
+        turns = sum(row[1] for row in rows)
+        calibration = CALIBRATION_LOOPS / ((before + after) / 2)
+        elapsed_secs.append(elapsed)
+        calibration_rates.append(calibration)
+        normalized.append(duels / elapsed / calibration * 1e6)
+
+    median_sec = statistics.median(elapsed_secs)
+    kept = trimmed(normalized)
+    gated_normalized = statistics.fmean(kept)
+    return {
+        "id": str(case.get("name", "case")),
+        "duels": duels,
+        "turns": turns,
+        "median_sec": round(median_sec, 6),
+        "duels_per_sec": round(duels / median_sec, 1),
+        "turns_per_sec": round(turns / median_sec, 1),
+        "calibration_loops_per_sec": round(statistics.median(calibration_rates), 1),
+        # Trimmed mean of per-repetition duels per million calibration loops: the machine-independent figure that is gated.
+        "normalized_duels": round(gated_normalized, 2),
+        # Spread of the kept ratios within this run; a gate tighter than this is measuring noise.
+        "normalized_spread_pct": round((kept[-1] - kept[0]) / gated_normalized * 100, 2),
+        "normalized_reps_kept": len(kept),
+        # How far this case pushed the process peak; 0 when it fit under an earlier case's peak.
+        "rss_growth_kb": peak_rss_kb() - rss_before,
+    }
+
+
+def load_baseline(path: Path) -> dict[str, Any] | None:
+    if not path.exists():
+        return None
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    return raw if isinstance(raw, dict) else None
+
+
+def compare_to_baseline(
+    results: list[dict[str, Any]],
+    baseline: dict[str, Any],
+    max_regression_pct: float,
+) -> None:
+    """Fill in baseline/delta fields and passed/errors per result, in place."""
+    base_by_id = {row["id"]: row for row in baseline.get("results", []) if isinstance(row, dict)}
+    for result in results:
+        base = base_by_id.get(result["id"])
+        errors: list[str] = []
+        if base is None:
+            result["baseline_duels_per_sec"] = None
+            result["delta_pct"] = None
+        else:
+            # Baseline throughput scaled to this machine's calibration speed.
+            expected = float(base["normalized_duels"]) * result["calibration_loops_per_sec"] / 1e6
+            delta_pct = (result["normalized_duels"] / float(base["normalized_duels"]) - 1) * 100
+            result["baseline_duels_per_sec"] = round(expected, 1)
+            result["delta_pct"] = round(delta_pct, 2)
+            if delta_pct < -max_regression_pct:
+                errors.append(
+                    f"duels/sec {result['duels_per_sec']} vs baseline {round(expected, 1)} "
+                    f"({round(delta_pct, 2)}% < -{max_regression_pct}%)"
+                )
+        result["passed"] = not errors
+        result["errors"] = errors
+
+
+def format_diff(results: list[dict[str, Any]]) -> list[str]:
+    lines = [
+        f"{'case':<24} {'duels/s':>10} {'baseline':>10} {'delta%':>8} {'spread%':>8} "
+        f"{'turns/s':>10} {'rss+kb':>8}  result"
+    ]
+    for row in results:
+        lines.append(
+            f"{row['id']:<24} {row['duels_per_sec']:>10} {str(row.get('baseline_duels_per_sec', '-')):>10} "
+            f"{str(row.get('delta_pct', '-')):>8} {row['normalized_spread_pct']:>8} {row['turns_per_sec']:>10} "
+            f"{row['rss_growth_kb']:>8}  "
+            f"{'PASS' if row.get('passed', True) else 'FAIL'}"
+        )
+    return lines
+
+
+def write_json(path: Path, payload: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"{json.dumps(payload, ensure_ascii=False, indent=2)}\n", encoding="utf-8")
+
+
+def main() -> None:
+    args = parse_args()
+    cases = load_cases(args.scenario_file)
+    if args.cases:
+        unknown = sorted(set(args.cases) - {str(case.get("name")) for case in cases})
+        if unknown:
+            raise SystemExit(f"unknown --case: {', '.join(unknown)}")
+        cases = [case for case in cases if case.get("name") in args.cases]
+
+    engine = CombatEngine(CombatTables.load())
+    trials = max(1, args.trials)
+    repeat = max(1, args.repeat)
+    results = [bench_case(engine, case, trials, repeat, max(0, args.warmup)) for case in cases]
+    settings = {"trials": trials, "repeat": repeat, "warmup": max(0, args.warmup)}
+    # ru_maxrss is per process, so peak RSS is one figure for the whole suite.
+    suite_peak_rss_kb = peak_rss_kb()
+
+    if args.write_baseline:
+        write_json(
+            args.baseline,
+            {
+                "suite": "combat_bench",
+                "generated_at_utc": datetime.now(timezone.utc).isoformat(),
+                "python": sys.version.split()[0],
+                **settings,
+                "peak_rss_kb": suite_peak_rss_kb,
+                "results": results,
+            },
+        )
+        for line in format_diff(results):
+            print(line)
+        print(f"suite peak rss: {suite_peak_rss_kb} KB")
+        print(f"wrote combat bench baseline -> {args.baseline}")
+        return
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        raise SystemExit(f"missing baseline: {args.baseline} (record one with --write-baseline)")
+    compare_to_baseline(results, baseline, args.max_regression_pct)
+
+    pass_count = sum(1 for row in results if row["passed"])
+    if args.report_file is not None:
+        write_json(
+            args.report_file.resolve(),
+            {
+                "suite": "combat_bench",
+                "generated_at_utc": datetime.now(timezone.utc).isoformat(),
+                "scenario_count": len(results),
+                "pass_count": pass_count,
+                "fail_count": len(results) - pass_count,
+                "passed": pass_count == len(results),
+                "max_regression_pct": args.max_regression_pct,
+                "report_only": args.report_only,
+                "baseline_generated_at_utc": baseline.get("generated_at_utc"),
+                **settings,
+                "peak_rss_kb": suite_peak_rss_kb,
+                "baseline_peak_rss_kb": baseline.get("peak_rss_kb"),
+                "results": results,
+            },
+        )
+
+    for line in format_diff(results):
+        print(line)
+    print(f"suite peak rss: {suite_peak_rss_kb} KB (baseline {baseline.get('peak_rss_kb', '-')} KB)")
+    failures = [f"{row['id']}: {error}" for row in results for error in row["errors"]]
+    if failures:
+        print("combat bench regression check failed")
+        for row in failures:
+            print(f"- {row}")
+        if not args.report_only:
+            raise SystemExit(1)
+        print("report-only: not failing")
+        return
+    print("all combat bench cases within baseline")
+
+
+if __name__ == "__main__":
+    main()
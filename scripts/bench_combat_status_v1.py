@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+import simulate_minimal_combat_v1 as combat
+from bench_combat_engine_v1 import SYNTHETIC_CASES, build_tasks
+from simulate_minimal_combat_v1 import STATUS_SLOTS, CombatEngine, CombatTables, Unit, run_trial_chunk
+
+# Status-heavy duels: guaranteed skill statuses against on-hit status monsters.
+STATUS_CASE = next(case for case in SYNTHETIC_CASES if case["name"] == "synthetic_many_status")
+STATUS_FUNCTION_NAMES = (
+    "prune_expired_statuses",
+    "get_status",
+    "has_status",
+    "apply_status",
+    "current_speed_multiplier",
+    "current_atk_multiplier",
+    "current_def_multiplier",
+)
+
+
+class LegacyStatusUnit(Unit):
+    """Unit that also carries the pre-slot status list, for the list-of-dicts reference below."""
+
+    __slots__ = ("status_effects",)
+
+    def __init__(self, kind: str, unit_id: str, name: str, stats: dict[str, float], element: str):
+        super().__init__(kind, unit_id, name, stats, element)
+        self.status_effects: list[dict[str, Any]] = []
+
+
+# The list-of-dicts status table the slots replaced, kept as the benchmark reference.
+# get_status returns source_atk like the slot version, so the duel loop runs unchanged.
+def legacy_prune_expired_statuses(unit: LegacyStatusUnit, now_sec: float) -> None:
+    unit.status_effects = [effect for effect in unit.status_effects if float(effect["until_sec"]) > now_sec]
+
+
+def legacy_get_status(unit: LegacyStatusUnit, status_type: str, now_sec: float) -> float | None:
+    for effect in unit.status_effects:
+        if effect["type"] == status_type and float(effect["until_sec"]) > now_sec:
+            return float(effect["source_atk"])
+    return None
+
+
+def legacy_has_status(unit: LegacyStatusUnit, status_type: str, now_sec: float) -> bool:
+    return legacy_get_status(unit, status_type, now_sec) is not None
+
+
+def legacy_apply_status(
+    target: LegacyStatusUnit, status_type: str, duration_sec: float, source_atk: float, now_sec: float
+) -> bool:
+    if duration_sec <= 0:
+        return False
+
+    until_sec = now_sec + duration_sec
+    for effect in target.status_effects:
+        if effect["type"] != status_type:
+            continue
+        effect["until_sec"] = max(float(effect["until_sec"]), until_sec)
+        effect["source_atk"] = max(float(effect["source_atk"]), source_atk)
+        return True
+
+    target.status_effects.append({"type": status_type, "until_sec": until_sec, "source_atk": max(0.0, source_atk)})
+    return True
+
+
+def legacy_current_speed_multiplier(unit: LegacyStatusUnit, now_sec: float) -> float:
+    return 0.75 if legacy_has_status(unit, "slow", now_sec) else 1.0
+
+
+def legacy_current_atk_multiplier(unit: LegacyStatusUnit, now_sec: float) -> float:
+    return 0.85 if legacy_has_status(unit, "weaken", now_sec) else 1.0
+
+
+def legacy_current_def_multiplier(unit: LegacyStatusUnit, now_sec: float) -> float:
+    return 0.80 if legacy_has_status(unit, "armor_break", now_sec) else 1.0
+
+
+LEGACY_STATUS_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    name: globals()[f"legacy_{name}"] for name in STATUS_FUNCTION_NAMES
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the fixed-slot status table against the list-of-dicts one it replaced."
+    )
+    parser.add_argument("--turns", type=int, default=200000, help="simulated turns for the status-op benchmark")
+    parser.add_argument("--trials", type=int, default=300, help="duels per monster for the duel benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="best-of repeats for timings")
+    parser.add_argument("--seed", type=int, default=20260303)
+    parser.add_argument(
+        "--min-turn-speedup",
+        type=float,
+        default=0.0,
+        help="fail when the status-heavy duel turns/sec speedup is below this (0 = report only)",
+    )
+    return parser.parse_args()
+
+
+@contextmanager
+def legacy_status_table() -> Iterator[None]:
+    """Runs the combat module on LegacyStatusUnit and the list-of-dicts status functions."""
+    saved = {name: getattr(combat, name) for name in ("Unit", *STATUS_FUNCTION_NAMES)}
+    combat.Unit = LegacyStatusUnit
+    for name, fn in LEGACY_STATUS_FUNCTIONS.items():
+        setattr(combat, name, fn)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(combat, name, value)
+
+
+def best_of(repeat: int, fn: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def status_schedule(turns: int, seed: int) -> list[tuple[float, str | None, float, float]]:
+    """Per turn: (now_sec, status to apply or None, duration_sec, source_atk); about one apply in four turns."""
+    rng = random.Random(seed)
+    statuses = list(STATUS_SLOTS)
+    now_sec = 0.0
+    schedule = []
+    for _ in range(turns):
+        now_sec += rng.uniform(0.2, 0.6)
+        status = rng.choice(statuses) if rng.random() < 0.25 else None
+        schedule.append((now_sec, status, rng.uniform(1.0, 4.0), rng.uniform(50.0, 150.0)))
+    return schedule
+
+
+def run_status_ops(
+    unit: Unit, fns: dict[str, Callable[..., Any]], schedule: list[tuple[float, str | None, float, float]]
+) -> list[tuple[Any, ...]]:
+    """The status work of one turn in simulate_duel, for every scheduled turn."""
+    prune = fns["prune_expired_statuses"]
+    get_status = fns["get_status"]
+    has_status = fns["has_status"]
+    apply_status = fns["apply_status"]
+    speed = fns["current_speed_multiplier"]
+    atk = fns["current_atk_multiplier"]
+    defense = fns["current_def_multiplier"]
+    out = []
+    for now_sec, status, duration_sec, source_atk in schedule:
+        prune(unit, now_sec)
+        out.append(
+            (
+                get_status(unit, "burn", now_sec),
+                has_status(unit, "stun", now_sec),
+                speed(unit, now_sec),
+                atk(unit, now_sec),
+                defense(unit, now_sec),
+            )
+        )
+        if status is not None:
+            apply_status(unit, status, duration_sec, source_atk, now_sec)
+    return out
+
+
+def bench_status_ops(turns: int, repeat: int, seed: int) -> dict[str, float]:
+    schedule = status_schedule(turns, seed)
+    stats = {"hp": 1000.0, "mp": 100.0, "speed": 1.0}
+    slot_fns = {name: getattr(combat, name) for name in STATUS_FUNCTION_NAMES}
+
+    def slot_run() -> list[tuple[Any, ...]]:
+        return run_status_ops(Unit("monster", "m", "m", stats, "none"), slot_fns, schedule)
+
+    def legacy_run() -> list[tuple[Any, ...]]:
+        return run_status_ops(LegacyStatusUnit("monster", "m", "m", stats, "none"), LEGACY_STATUS_FUNCTIONS, schedule)
+
+    if slot_run() != legacy_run():
+        raise SystemExit("[status-bench] FAIL status op results differ between slot and list tables")
+    legacy_ns = best_of(repeat, legacy_run) / turns * 1e9
+    slot_ns = best_of(repeat, slot_run) / turns * 1e9
+    return {
+        "turns": turns,
+        "legacy_ns_per_turn": round(legacy_ns, 1),
+        "slot_ns_per_turn": round(slot_ns, 1),
+        "speedup": round(legacy_ns / slot_ns, 2),
+    }
+
+
+def bench_duels(trials: int, repeat: int) -> list[dict[str, Any]]:
+    engine = CombatEngine(CombatTables.load())
+    rows = []
+    for task in build_tasks(engine, STATUS_CASE, trials):
+        slot_results = run_trial_chunk(task)
+        with legacy_status_table():
+            legacy_results = run_trial_chunk(task)
+        monster_id = task["monster_row"]["monster_id"]
+        if slot_results != legacy_results:
+            raise SystemExit(f"[status-bench] FAIL duel results differ for {monster_id}")
+
+        turns = sum(row[1] for row in slot_results)
+        with legacy_status_table():
+            legacy_sec = best_of(repeat, lambda: run_trial_chunk(task))
+        slot_sec = best_of(repeat, lambda: run_trial_chunk(task))
+        rows.append(
+            {
+                "monster_id": monster_id,
+                "turns": turns,
+                "legacy_turns_per_sec": round(turns / legacy_sec, 1),
+                "slot_turns_per_sec": round(turns / slot_sec, 1),
+                "speedup": round(legacy_sec / slot_sec, 3),
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    args = parse_args()
+    repeat = max(1, args.repeat)
+    ops = bench_status_ops(max(1, args.turns), repeat, args.seed)
+    print("[status-bench] status ops " + json.dumps(ops))
+
+    duel_rows = bench_duels(max(1, args.trials), repeat)
+    for row in duel_rows:
+        print("[status-bench] duels " + json.dumps(row, ensure_ascii=False))
+    turns = sum(row["turns"] for row in duel_rows)
+    legacy_sec = sum(row["turns"] / row["legacy_turns_per_sec"] for row in duel_rows)
+    slot_sec = sum(row["turns"] / row["slot_turns_per_sec"] for row in duel_rows)
+    speedup = round(legacy_sec / slot_sec, 3)
+    print(
+        f"[status-bench] {STATUS_CASE['name']} turns/sec legacy={round(turns / legacy_sec, 1)} "
+        f"slot={round(turns / slot_sec, 1)} speedup={speedup}"
+    )
+
+    if args.min_turn_speedup > 0 and speedup < args.min_turn_speedup:
+        raise SystemExit(f"turns/sec speedup {speedup} below --min-turn-speedup {args.min_turn_speedup}")
+
+
+if __name__ == "__main__":
+    main()
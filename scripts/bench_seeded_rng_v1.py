@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from seeded_rng_block_v1 import (
+    RNG_PREFETCH_DRAWS,
+    BlockSeededRng,
+    block_rngs,
+    normalize_seed,
+    np,
+    python_xorshift_blocks,
+)
+from simulate_minimal_combat_v1 import (
+    COMBAT_CONSTANTS_CSV,
+    DEFAULT_CONFIG,
+    MONSTERS_CSV,
+    PROGRESSION_CSV,
+    SKILLS_CSV,
+    STAT_GROWTH_CSV,
+    SeededRng,
+    build_monster_stats,
+    build_player_stats,
+    combat_constants_by_key,
+    get_progression_row,
+    pick_monsters,
+    pick_skills,
+    read_csv_rows,
+    run_trial_chunk,
+    stat_rows_by_id,
+)
+
+# Edge seeds: zero maps to the fixed fallback state, negatives and >32-bit values are masked.
+EDGE_SEEDS = (0, 1, -1, 0xFFFFFFFF, 1 << 32, 20260223)
+# Block size for single long streams (jump-table blocks when NumPy is available).
+BENCH_BLOCK_SIZE = 4096
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check and benchmark BlockSeededRng against SeededRng.")
+    parser.add_argument("--seeds", type=int, default=2000, help="seeds for the sequence check")
+    parser.add_argument("--draws", type=int, default=RNG_PREFETCH_DRAWS * 4, help="draws per seed checked")
+    parser.add_argument("--bench-draws", type=int, default=500000)
+    parser.add_argument("--trials", type=int, default=2000, help="duels per monster for the simulator benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="best-of repeats for timings")
+    parser.add_argument(
+        "--min-draw-speedup",
+        type=float,
+        default=0.0,
+        help="fail when per-draw speedup is below this (0 = report only)",
+    )
+    return parser.parse_args()
+
+
+def check_sequences(seed_count: int, draws: int) -> int:
+    seeds = list(EDGE_SEEDS) + list(range(seed_count))
+    mismatches = 0
+    for seed, prefetched in zip(seeds, block_rngs(seeds)):
+        scalar = SeededRng(seed)
+        jump_table = BlockSeededRng(seed, block_size=BENCH_BLOCK_SIZE)
+        expected = [scalar.next() for _ in range(draws)]
+        candidates = {
+            "prefetched": [prefetched.next() for _ in range(draws)],
+            "jump_table": [jump_table.next() for _ in range(draws)],
+            "python": next(python_xorshift_blocks(normalize_seed(seed), draws)),
+        }
+        for name, got in candidates.items():
+            if got != expected:
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"  - seed={seed} {name} differs")
+    return mismatches
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def bench_draws(count: int, repeat: int) -> dict[str, float]:
+    def scalar() -> None:
+        draw = SeededRng(7).next
+        for _ in range(count):
+            draw()
+
+    def block() -> None:
+        draw = BlockSeededRng(7, block_size=BENCH_BLOCK_SIZE).next
+        for _ in range(count):
+            draw()
+
+    def empty() -> None:
+        for _ in range(count):
+            pass
+
+    loop_ns = best_of(repeat, empty) / count * 1e9
+    scalar_ns = best_of(repeat, scalar) / count * 1e9 - loop_ns
+    block_ns = best_of(repeat, block) / count * 1e9 - loop_ns
+    return {
+        "scalar_ns_per_draw": round(scalar_ns, 1),
+        "block_ns_per_draw": round(block_ns, 1),
+        "speedup": round(scalar_ns / max(block_ns, 1e-9), 2),
+    }
+
+
+def bench_simulator(trials: int, repeat: int) -> list[dict[str, float]]:
+    config = dict(DEFAULT_CONFIG)
+    constants = combat_constants_by_key(read_csv_rows(COMBAT_CONSTANTS_CSV))
+    progression = get_progression_row(read_csv_rows(PROGRESSION_CSV), config["difficulty_index"])
+    player_stats = build_player_stats(stat_rows_by_id(read_csv_rows(STAT_GROWTH_CSV)), progression, config, constants)
+    skills = pick_skills(read_csv_rows(SKILLS_CSV), config)
+
+    rows = []
+    for idx, monster in enumerate(pick_monsters(read_csv_rows(MONSTERS_CSV), config)):
+        task = {
+            "player_stats": player_stats,
+            "monster_row": monster,
+            "monster_stats": build_monster_stats(player_stats, monster, constants),
+            "skills": skills,
+            "constants": constants,
+            "base_seed": config["seed"],
+            "monster_index": idx,
+            "trial_start": 0,
+            "trial_end": trials,
+            "max_turns": config["max_turns"],
+            "engine": "scalar",
+            "block_rng": True,
+        }
+        if run_trial_chunk({**task, "block_rng": False}) != run_trial_chunk(task):
+            raise SystemExit(f"[rng-bench] FAIL simulator results differ for {monster['monster_id']}")
+        scalar_sec = best_of(repeat, lambda: run_trial_chunk({**task, "block_rng": False}))
+        block_sec = best_of(repeat, lambda: run_trial_chunk(task))
+        rows.append(
+            {
+                "monster_id": monster["monster_id"],
+                "scalar_us_per_duel": round(scalar_sec / trials * 1e6, 1),
+                "block_us_per_duel": round(block_sec / trials * 1e6, 1),
+                "speedup": round(scalar_sec / block_sec, 3),
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    args = parse_args()
+    mismatches = check_sequences(max(1, args.seeds), max(1, args.draws))
+    if mismatches:
+        raise SystemExit(f"[rng-bench] FAIL sequence mismatches={mismatches}")
+    print(
+        f"[rng-bench] PASS sequences identical: seeds={max(1, args.seeds) + len(EDGE_SEEDS)} "
+        f"draws={max(1, args.draws)} numpy={'yes' if np is not None else 'no'}"
+    )
+
+    draws = bench_draws(max(1, args.bench_draws), max(1, args.repeat))
+    print("[rng-bench] draws " + json.dumps(draws))
+    for row in bench_simulator(max(1, args.trials), max(1, args.repeat)):
+        print("[rng-bench] simulator " + json.dumps(row))
+
+    if args.min_draw_speedup > 0 and draws["speedup"] < args.min_draw_speedup:
+        raise SystemExit(f"per-draw speedup {draws['speedup']} below --min-draw-speedup {args.min_draw_speedup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import time
+from pathlib import Path
+
+import numpy as np
+
+from simulate_minimal_combat_v1 import (
+    COMBAT_CONSTANTS_CSV,
+    OUT_DIR,
+    PLAYER_STAT_IDS,
+    PROGRESSION_CSV,
+    STAT_GROWTH_CSV,
+    build_player_stats,
+    combat_constants_by_key,
+    player_stat_bounds,
+    read_csv_rows,
+    stat_rows_by_id,
+    to_float,
+)
+
+OUT_PLAYER_STAT_TABLE = OUT_DIR / "player_stat_table_v1.npz"
+DEFAULT_MAX_LEVEL = 120
+DEFAULT_MAX_REBIRTH = 20
+TABLE_INPUT_FILES = (PROGRESSION_CSV, STAT_GROWTH_CSV, COMBAT_CONSTANTS_CSV)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Precompute build_player_stats over difficulty x level x rebirth into data/sim."
+    )
+    parser.add_argument("--max-level", type=int, default=DEFAULT_MAX_LEVEL)
+    parser.add_argument("--max-rebirth", type=int, default=DEFAULT_MAX_REBIRTH)
+    parser.add_argument("--out", type=Path, default=OUT_PLAYER_STAT_TABLE)
+    parser.add_argument(
+        "--check",
+        type=int,
+        default=2000,
+        help="compare N random entries against build_player_stats (0 = skip, -1 = every entry)",
+    )
+    return parser.parse_args()
+
+
+def table_input_hash() -> str:
+    digest = hashlib.sha1()
+    for path in TABLE_INPUT_FILES:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class PlayerStatTable:
+    """build_player_stats for every (difficulty_index, player_level, rebirth_count).
+
+    stats[d, level - 1, rebirth, k] holds PLAYER_STAT_IDS[k] for the d-th
+    progression row. Values are bit-identical to build_player_stats because the
+    vectorized build keeps its operation order.
+    """
+
+    def __init__(self, difficulty_indexes: np.ndarray, stats: np.ndarray, input_hash: str):
+        self.difficulty_indexes = difficulty_indexes
+        self.stats = stats
+        self.input_hash = input_hash
+        self.max_level = stats.shape[1]
+        self.max_rebirth = stats.shape[2] - 1
+        self.row_by_difficulty = {int(d): i for i, d in enumerate(difficulty_indexes)}
+
+    def covers(self, difficulty_index: int, player_level: int, rebirth_count: int) -> bool:
+        return (
+            difficulty_index in self.row_by_difficulty
+            and 1 <= player_level <= self.max_level
+            and 0 <= rebirth_count <= self.max_rebirth
+        )
+
+    def lookup(self, difficulty_index: int, player_level: int, rebirth_count: int) -> dict[str, float]:
+        if not self.covers(difficulty_index, player_level, rebirth_count):
+            raise SystemExit(
+                "player stat table miss: "
+                f"difficulty_index={difficulty_index} player_level={player_level} rebirth_count={rebirth_count}"
+            )
+        row = self.stats[self.row_by_difficulty[difficulty_index], player_level - 1, rebirth_count]
+        return dict(zip(PLAYER_STAT_IDS, row.tolist()))
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as f:
+            np.savez_compressed(
+                f,
+                difficulty_indexes=self.difficulty_indexes,
+                stats=self.stats,
+                stat_ids=np.array(PLAYER_STAT_IDS),
+                input_hash=np.array(self.input_hash),
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "PlayerStatTable | None":
+        if not path.exists():
+            return None
+        with np.load(path) as raw:
+            if tuple(raw["stat_ids"].tolist()) != PLAYER_STAT_IDS:
+                return None
+            return cls(raw["difficulty_indexes"], raw["stats"], str(raw["input_hash"]))
+
+
+def build_player_stat_table(
+    progression_rows: list[dict[str, str]],
+    stat_rows: dict[str, dict[str, str]],
+    constants: dict[str, float],
+    max_level: int = DEFAULT_MAX_LEVEL,
+    max_rebirth: int = DEFAULT_MAX_REBIRTH,
+    input_hash: str = "",
+) -> PlayerStatTable:
+    difficulty_indexes = np.array([int(row["difficulty_index"]) for row in progression_rows], dtype=np.int64)
+    major_steps = np.array(
+        [max(0, int(row["major_stage_index"]) - 1) for row in progression_rows], dtype=np.int64
+    )[:, None, None]
+    sub_steps = np.array(
+        [max(0, int(row["sub_stage_index"]) - 1) for row in progression_rows], dtype=np.int64
+    )[:, None, None]
+    level_steps = np.arange(0, max_level, dtype=np.int64)[None, :, None]
+    rebirths = np.arange(0, max_rebirth + 1, dtype=np.int64)[None, None, :]
+    bounds = player_stat_bounds(constants)
+
+    stats = np.empty(
+        (len(progression_rows), max_level, max_rebirth + 1, len(PLAYER_STAT_IDS)), dtype=np.float64
+    )
+    for k, stat_id in enumerate(PLAYER_STAT_IDS):
+        row = stat_rows.get(stat_id)
+        if row is None:
+            raise SystemExit(f"missing stat row: {stat_id}")
+        hard_cap = to_float(row["hard_cap"], -1)
+        soft_cap_start = to_float(row["soft_cap_start"], -1)
+        soft_cap_slope = to_float(row["soft_cap_slope"], -1)
+
+        raw = (
+            to_float(row["base_value"])
+            + to_float(row["per_player_level"]) * level_steps
+            + to_float(row["per_major_stage"]) * major_steps
+            + to_float(row["per_sub_stage"]) * sub_steps
+        )
+        value = raw * (1 + rebirths * to_float(row["rebirth_scale_pct"]) * 0.01)
+        if hard_cap >= 0:
+            if soft_cap_start >= 0 and soft_cap_slope > 0:
+                value = np.where(
+                    value > soft_cap_start,
+                    soft_cap_start + (value - soft_cap_start) * soft_cap_slope,
+                    value,
+                )
+            value = np.minimum(value, hard_cap)
+
+        lo, hi = bounds[stat_id]
+        stats[..., k] = np.maximum(lo, np.minimum(hi, value))
+
+    return PlayerStatTable(difficulty_indexes, stats, input_hash)
+
+
+def load_player_stat_table(
+    path: Path = OUT_PLAYER_STAT_TABLE,
+    max_level: int = DEFAULT_MAX_LEVEL,
+    max_rebirth: int = DEFAULT_MAX_REBIRTH,
+) -> PlayerStatTable:
+    """Load the persisted table, or build one in memory when it is missing, stale or too small.
+
+    Nothing is written here; `npm run combat:stats:table` is the step that persists the table.
+    """
+    input_hash = table_input_hash()
+    table = PlayerStatTable.load(path)
+    if (
+        table is not None
+        and table.input_hash == input_hash
+        and table.max_level >= max_level
+        and table.max_rebirth >= max_rebirth
+    ):
+        return table
+
+    return build_player_stat_table(
+        read_csv_rows(PROGRESSION_CSV),
+        stat_rows_by_id(read_csv_rows(STAT_GROWTH_CSV)),
+        combat_constants_by_key(read_csv_rows(COMBAT_CONSTANTS_CSV)),
+        max_level,
+        max_rebirth,
+        input_hash,
+    )
+
+
+def check_table(
+    table: PlayerStatTable,
+    progression_rows: list[dict[str, str]],
+    stat_rows: dict[str, dict[str, str]],
+    constants: dict[str, float],
+    samples: int,
+) -> int:
+    keys = [
+        (row, level, rebirth)
+        for row in progression_rows
+        for level in range(1, table.max_level + 1)
+        for rebirth in range(0, table.max_rebirth + 1)
+    ]
+    if 0 <= samples < len(keys):
+        keys = random.Random(20260223).sample(keys, samples)
+
+    mismatches = 0
+    for row, level, rebirth in keys:
+        expected = build_player_stats(
+            stat_rows, row, {"player_level": level, "rebirth_count": rebirth}, constants
+        )
+        got = table.lookup(int(row["difficulty_index"]), level, rebirth)
+        if got != expected:
+            mismatches += 1
+            if mismatches <= 5:
+                print(
+                    f"  - difficulty_index={row['difficulty_index']} level={level} rebirth={rebirth} "
+                    f"table={got} scalar={expected}"
+                )
+    return len(keys) if mismatches == 0 else -mismatches
+
+
+def main() -> None:
+    args = parse_args()
+    progression_rows = read_csv_rows(PROGRESSION_CSV)
+    stat_rows = stat_rows_by_id(read_csv_rows(STAT_GROWTH_CSV))
+    constants = combat_constants_by_key(read_csv_rows(COMBAT_CONSTANTS_CSV))
+
+    started = time.perf_counter()
+    table = build_player_stat_table(
+        progression_rows,
+        stat_rows,
+        constants,
+        max(1, args.max_level),
+        max(0, args.max_rebirth),
+        table_input_hash(),
+    )
+    build_sec = time.perf_counter() - started
+    table.save(args.out)
+
+    entries = table.stats.shape[0] * table.stats.shape[1] * table.stats.shape[2]
+    print(f"wrote player stat table -> {args.out} ({entries} entries)")
+    print(
+        "[player-stat-table] "
+        + json.dumps(
+            {
+                "difficulties": int(table.stats.shape[0]),
+                "max_level": table.max_level,
+                "max_rebirth": table.max_rebirth,
+                "build_sec": round(build_sec, 3),
+            }
+        )
+    )
+
+    if args.check != 0:
+        checked = check_table(table, progression_rows, stat_rows, constants, args.check)
+        if checked < 0:
+            raise SystemExit(f"[player-stat-table] FAIL mismatches={-checked}")
+        print(f"[player-stat-table] PASS checked={checked} entries against build_player_stats")
+
+
+if __name__ == "__main__":
+    main()
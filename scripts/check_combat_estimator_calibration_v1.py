@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+from combat_estimator_v1 import LOPSIDED_MARGIN, WIN_PROBABILITY_LOGIT_SCALE, estimate_matchup
+from simulate_minimal_combat_v1 import (
+    COMBAT_CONSTANTS_CSV,
+    MONSTERS_CSV,
+    OUT_DIR,
+    PROGRESSION_CSV,
+    SKILLS_CSV,
+    STAT_GROWTH_CSV,
+    build_monster_stats,
+    build_player_stats,
+    combat_constants_by_key,
+    get_progression_row,
+    pick_monsters,
+    pick_skills,
+    read_csv_rows,
+    resolve_jobs,
+    run_monte_carlo,
+    stat_rows_by_id,
+    to_fixed,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SCENARIO_FILE = ROOT / "data/sim/combat_diff_scenarios_v1.json"
+OUT_CALIBRATION_CSV = OUT_DIR / "combat_estimator_calibration_v1.csv"
+OUT_CALIBRATION_JSON = OUT_DIR / "combat_estimator_calibration_v1.json"
+# A lopsided estimate agrees with Monte Carlo when the observed win rate is this decisive.
+DECISIVE_WIN_RATE = 0.95
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare the analytic combat estimator against simulate_duel Monte Carlo."
+    )
+    parser.add_argument("--scenario-file", type=Path, default=DEFAULT_SCENARIO_FILE)
+    parser.add_argument(
+        "--all-monsters",
+        action="store_true",
+        help="estimate every monster in monsters_v1.csv per scenario instead of the scenario's monster_ids",
+    )
+    parser.add_argument("--trials", type=int, default=400, help="Monte Carlo duels per matchup")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes (0 = os.cpu_count())")
+    parser.add_argument(
+        "--min-lopsided-agreement",
+        type=float,
+        default=0.0,
+        help="fail when the share of lopsided estimates confirmed by Monte Carlo is below this (0 = report only)",
+    )
+    return parser.parse_args()
+
+
+def load_scenarios(path: Path) -> list[dict[str, Any]]:
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    entries = raw.get("scenarios", []) if isinstance(raw, dict) else raw
+    if not isinstance(entries, list) or not entries:
+        raise SystemExit(f"scenario file has no scenarios: {path}")
+    return entries
+
+
+def main() -> None:
+    args = parse_args()
+    progression_rows = read_csv_rows(PROGRESSION_CSV)
+    stat_rows = stat_rows_by_id(read_csv_rows(STAT_GROWTH_CSV))
+    constants = combat_constants_by_key(read_csv_rows(COMBAT_CONSTANTS_CSV))
+    skill_rows = read_csv_rows(SKILLS_CSV)
+    monster_rows = read_csv_rows(MONSTERS_CSV)
+
+    trials = max(1, args.trials)
+    jobs = resolve_jobs(args.jobs)
+    rows: list[dict[str, Any]] = []
+    estimate_sec = 0.0
+    estimate_count = 0
+    monte_carlo_sec = 0.0
+
+    for scenario in load_scenarios(args.scenario_file):
+        name = str(scenario.get("name", "scenario"))
+        config = {
+            "difficulty_index": int(scenario["difficulty_index"]),
+            "player_level": int(scenario["player_level"]),
+            "rebirth_count": int(scenario["rebirth_count"]),
+            "seed": int(scenario["seed"]),
+            "max_turns": int(scenario["max_turns"]),
+            "skill_ids": list(scenario["skill_ids"]),
+            "monster_ids": list(scenario["monster_ids"]),
+        }
+        progression = get_progression_row(progression_rows, config["difficulty_index"])
+        player_stats = build_player_stats(stat_rows, progression, config, constants)
+        skills = pick_skills(skill_rows, config)
+        monsters = monster_rows if args.all_monsters else pick_monsters(monster_rows, config)
+
+        estimates = []
+        for monster in monsters:
+            monster_stats = build_monster_stats(player_stats, monster, constants)
+            started = time.perf_counter()
+            estimates.append(
+                estimate_matchup(player_stats, monster, monster_stats, skills, constants, config["max_turns"])
+            )
+            estimate_sec += time.perf_counter() - started
+            estimate_count += 1
+
+        started = time.perf_counter()
+        matchups = run_monte_carlo(player_stats, monsters, skills, constants, config, trials, jobs)
+        monte_carlo_sec += time.perf_counter() - started
+
+        for estimate, matchup in zip(estimates, matchups):
+            ttk_error = ""
+            if matchup["win_rate"] >= DECISIVE_WIN_RATE and estimate["monster_ttk_sec"] != float("inf"):
+                observed = matchup["elapsed_sec"]["mean"]
+                ttk_error = to_fixed((estimate["monster_ttk_sec"] - observed) / max(observed, 1e-9), 4)
+            decisive = matchup["win_rate"] >= DECISIVE_WIN_RATE or matchup["win_rate"] <= 1 - DECISIVE_WIN_RATE
+            rows.append(
+                {
+                    "scenario": name,
+                    "monster_id": matchup["monster_id"],
+                    "monster_type": matchup["monster_type"],
+                    "estimated_win_probability": to_fixed(estimate["win_probability"], 4),
+                    "monte_carlo_win_rate": matchup["win_rate"],
+                    "estimated_monster_ttk_sec": to_fixed(min(estimate["monster_ttk_sec"], 1e9), 3),
+                    "estimated_player_ttk_sec": to_fixed(min(estimate["player_ttk_sec"], 1e9), 3),
+                    "monte_carlo_elapsed_sec_mean": matchup["elapsed_sec"]["mean"],
+                    "ttk_relative_error": ttk_error,
+                    "margin": to_fixed(max(-99.0, min(99.0, estimate["margin"])), 4),
+                    "lopsided": estimate["lopsided"],
+                    "lopsided_confirmed": estimate["lopsided"]
+                    and decisive
+                    and (estimate["margin"] > 0) == (matchup["win_rate"] >= DECISIVE_WIN_RATE),
+                }
+            )
+
+    lopsided = [row for row in rows if row["lopsided"]]
+    confirmed = sum(1 for row in lopsided if row["lopsided_confirmed"])
+    agreement = confirmed / len(lopsided) if lopsided else 1.0
+    brier = sum(
+        (row["estimated_win_probability"] - row["monte_carlo_win_rate"]) ** 2 for row in rows
+    ) / len(rows)
+    ttk_errors = [abs(row["ttk_relative_error"]) for row in rows if row["ttk_relative_error"] != ""]
+    estimate_us = estimate_sec / max(1, estimate_count) * 1e6
+    duel_us = monte_carlo_sec / max(1, len(rows) * trials) * 1e6
+
+    report = {
+        "suite": "combat_estimator_calibration_v1",
+        "scenario_file": str(args.scenario_file),
+        "trials_per_matchup": trials,
+        "win_probability_logit_scale": WIN_PROBABILITY_LOGIT_SCALE,
+        "lopsided_margin": LOPSIDED_MARGIN,
+        "matchup_count": len(rows),
+        "brier_score": to_fixed(brier, 4),
+        "win_side_accuracy": to_fixed(
+            sum(
+                1
+                for row in rows
+                if (row["estimated_win_probability"] >= 0.5) == (row["monte_carlo_win_rate"] >= 0.5)
+            )
+            / len(rows),
+            4,
+        ),
+        "lopsided_count": len(lopsided),
+        "lopsided_confirmed": confirmed,
+        "lopsided_agreement": to_fixed(agreement, 4),
+        "ttk_mean_abs_relative_error": to_fixed(sum(ttk_errors) / len(ttk_errors), 4) if ttk_errors else None,
+        "estimate_us_per_matchup": to_fixed(estimate_us, 2),
+        "monte_carlo_us_per_duel": to_fixed(duel_us, 2),
+        "results": rows,
+    }
+    OUT_CALIBRATION_JSON.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    with OUT_CALIBRATION_CSV.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print(f"wrote estimator calibration json -> {OUT_CALIBRATION_JSON}")
+    print(f"wrote estimator calibration csv -> {OUT_CALIBRATION_CSV} ({len(rows)} rows)")
+    print(
+        "[estimator-calibration] "
+        f"matchups={len(rows)} brier={report['brier_score']} "
+        f"win_side_accuracy={report['win_side_accuracy']} "
+        f"lopsided={len(lopsided)} agreement={report['lopsided_agreement']} "
+        f"ttk_mare={report['ttk_mean_abs_relative_error']} "
+        f"estimate={estimate_us:.1f}us/matchup mc={duel_us:.1f}us/duel"
+    )
+    if args.min_lopsided_agreement > 0 and agreement < args.min_lopsided_agreement:
+        raise SystemExit(
+            f"lopsided agreement {agreement:.4f} below --min-lopsided-agreement {args.min_lopsided_agreement}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+from simulate_minimal_combat_v1 import (
+    COMBAT_CONSTANTS_CSV,
+    MONSTERS_CSV,
+    PROGRESSION_CSV,
+    SKILLS_CSV,
+    STAT_GROWTH_CSV,
+    build_monster_stats,
+    build_player_stats,
+    combat_constants_by_key,
+    get_progression_row,
+    pick_monsters,
+    pick_skills,
+    read_csv_rows,
+    simulate_duel,
+    stat_rows_by_id,
+    to_fixed,
+    trial_seed,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SCENARIO_FILE = ROOT / "data/sim/combat_diff_scenarios_v1.json"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Check the NumPy lockstep combat kernel against the scalar simulate_duel."
+    )
+    parser.add_argument("--scenario-file", type=Path, default=DEFAULT_SCENARIO_FILE)
+    parser.add_argument("--trials", type=int, default=2000, help="seeds per monster")
+    parser.add_argument(
+        "--min-speedup",
+        type=float,
+        default=0.0,
+        help="fail when scalar/lockstep wall time ratio is below this value (0 = report only)",
+    )
+    return parser.parse_args()
+
+
+def load_scenarios(path: Path) -> list[dict[str, Any]]:
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    entries = raw.get("scenarios", []) if isinstance(raw, dict) else raw
+    if not isinstance(entries, list) or not entries:
+        raise SystemExit(f"scenario file has no scenarios: {path}")
+    return entries
+
+
+def main() -> None:
+    args = parse_args()
+    try:
+        from combat_lockstep_kernel_v1 import simulate_duels_lockstep
+    except ImportError as exc:
+        raise SystemExit(f"lockstep kernel requires numpy: {exc}")
+
+    progression_rows = read_csv_rows(PROGRESSION_CSV)
+    stat_rows = stat_rows_by_id(read_csv_rows(STAT_GROWTH_CSV))
+    constants = combat_constants_by_key(read_csv_rows(COMBAT_CONSTANTS_CSV))
+    skill_rows = read_csv_rows(SKILLS_CSV)
+    monster_rows = read_csv_rows(MONSTERS_CSV)
+
+    trials = max(1, args.trials)
+    errors: list[str] = []
+    scalar_total_sec = 0.0
+    lockstep_total_sec = 0.0
+
+    for scenario in load_scenarios(args.scenario_file):
+        name = str(scenario.get("name", "scenario"))
+        config = {
+            "difficulty_index": int(scenario["difficulty_index"]),
+            "player_level": int(scenario["player_level"]),
+            "rebirth_count": int(scenario["rebirth_count"]),
+            "seed": int(scenario["seed"]),
+            "max_turns": int(scenario["max_turns"]),
+            "skill_ids": list(scenario["skill_ids"]),
+            "monster_ids": list(scenario["monster_ids"]),
+        }
+        progression = get_progression_row(progression_rows, config["difficulty_index"])
+        player_stats = build_player_stats(stat_rows, progression, config, constants)
+        skills = pick_skills(skill_rows, config)
+
+        for idx, monster in enumerate(pick_monsters(monster_rows, config)):
+            monster_stats = build_monster_stats(player_stats, monster, constants)
+            seeds = [trial_seed(config["seed"], idx, t) for t in range(trials)]
+
+            started = time.perf_counter()
+            scalar = [
+                simulate_duel(
+                    player_stats,
+                    monster,
+                    monster_stats,
+                    skills,
+                    seed,
+                    config["max_turns"],
+                    False,
+                    constants,
+                )
+                for seed in seeds
+            ]
+            scalar_sec = time.perf_counter() - started
+
+            started = time.perf_counter()
+            lockstep = simulate_duels_lockstep(
+                player_stats,
+                monster,
+                monster_stats,
+                skills,
+                seeds,
+                config["max_turns"],
+                constants,
+            )
+            lockstep_sec = time.perf_counter() - started
+            scalar_total_sec += scalar_sec
+            lockstep_total_sec += lockstep_sec
+
+            mismatches = 0
+            for t, duel in enumerate(scalar):
+                lane = {
+                    "winner": "player" if lockstep["player_won"][t] else "monster",
+                    "turns": int(lockstep["turns"][t]),
+                    "elapsed_sec": to_fixed(float(lockstep["elapsed_sec"][t]), 3),
+                    "player_hp_left": to_fixed(float(lockstep["player_hp_left"][t]), 2),
+                    "monster_hp_left": to_fixed(float(lockstep["monster_hp_left"][t]), 2),
+                }
+                for key, value in lane.items():
+                    if duel[key] != value:
+                        mismatches += 1
+                        if mismatches <= 5:
+                            errors.append(
+                                f"{name}/{monster['monster_id']} seed={seeds[t]} "
+                                f"{key} scalar={duel[key]!r} lockstep={value!r}"
+                            )
+
+            status = "PASS" if mismatches == 0 else "FAIL"
+            print(
+                f"[lockstep-parity] {status} {name}/{monster['monster_id']} "
+                f"trials={trials} scalar={scalar_sec:.3f}s lockstep={lockstep_sec:.3f}s "
+                f"speedup={scalar_sec / max(lockstep_sec, 1e-9):.1f}x"
+            )
+
+    speedup = scalar_total_sec / max(lockstep_total_sec, 1e-9)
+    print(f"[lockstep-parity] total speedup={speedup:.1f}x")
+
+    if errors:
+        for error in errors:
+            print(f"  - {error}")
+        raise SystemExit(1)
+    if args.min_speedup > 0 and speedup < args.min_speedup:
+        raise SystemExit(f"speedup {speedup:.1f}x below --min-speedup {args.min_speedup}")
+    print("[lockstep-parity] PASS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+from combat_scheduler_v1 import simulate_encounter
+from simulate_minimal_combat_v1 import (
+    COMBAT_CONSTANTS_CSV,
+    MONSTERS_CSV,
+    PROGRESSION_CSV,
+    SKILLS_CSV,
+    STAT_GROWTH_CSV,
+    build_monster_stats,
+    build_player_stats,
+    combat_constants_by_key,
+    get_progression_row,
+    pick_monsters,
+    pick_skills,
+    read_csv_rows,
+    simulate_duel,
+    stat_rows_by_id,
+    trial_seed,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SCENARIO_FILE = ROOT / "data/sim/combat_diff_scenarios_v1.json"
+COMPARED_KEYS = ("winner", "turns", "elapsed_sec", "used_skills", "status_applied_counts")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Check that the heap scheduler reproduces simulate_duel for one player vs one monster."
+    )
+    parser.add_argument("--scenario-file", type=Path, default=DEFAULT_SCENARIO_FILE)
+    parser.add_argument("--trials", type=int, default=200, help="seeds per monster")
+    return parser.parse_args()
+
+
+def load_scenarios(path: Path) -> list[dict[str, Any]]:
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    entries = raw.get("scenarios", []) if isinstance(raw, dict) else raw
+    if not isinstance(entries, list) or not entries:
+        raise SystemExit(f"scenario file has no scenarios: {path}")
+    return entries
+
+
+def main() -> None:
+    args = parse_args()
+    progression_rows = read_csv_rows(PROGRESSION_CSV)
+    stat_rows = stat_rows_by_id(read_csv_rows(STAT_GROWTH_CSV))
+    constants = combat_constants_by_key(read_csv_rows(COMBAT_CONSTANTS_CSV))
+    skill_rows = read_csv_rows(SKILLS_CSV)
+    monster_rows = read_csv_rows(MONSTERS_CSV)
+
+    trials = max(1, args.trials)
+    errors: list[str] = []
+    duel_sec = 0.0
+    encounter_sec = 0.0
+
+    for scenario in load_scenarios(args.scenario_file):
+        name = str(scenario.get("name", "scenario"))
+        config = {
+            "difficulty_index": int(scenario["difficulty_index"]),
+            "player_level": int(scenario["player_level"]),
+            "rebirth_count": int(scenario["rebirth_count"]),
+            "seed": int(scenario["seed"]),
+            "max_turns": int(scenario["max_turns"]),
+            "skill_ids": list(scenario["skill_ids"]),
+            "monster_ids": list(scenario["monster_ids"]),
+        }
+        progression = get_progression_row(progression_rows, config["difficulty_index"])
+        player_stats = build_player_stats(stat_rows, progression, config, constants)
+        skills = pick_skills(skill_rows, config)
+
+        for idx, monster in enumerate(pick_monsters(monster_rows, config)):
+            monster_stats = build_monster_stats(player_stats, monster, constants)
+            mismatches = 0
+            for t in range(trials):
+                seed = trial_seed(config["seed"], idx, t)
+                started = time.perf_counter()
+                duel = simulate_duel(
+                    player_stats, monster, monster_stats, skills, seed, config["max_turns"], True, constants
+                )
+                duel_sec += time.perf_counter() - started
+
+                started = time.perf_counter()
+                encounter = simulate_encounter(
+                    [{"stats": player_stats, "skills": skills}],
+                    [[{"monster_row": monster, "monster_stats": monster_stats}]],
+                    seed,
+                    config["max_turns"],
+                    True,
+                    constants,
+                )
+                encounter_sec += time.perf_counter() - started
+
+                lane = {key: encounter[key] for key in COMPARED_KEYS}
+                lane["player_hp_left"] = encounter["players"][0]["player_hp_left"]
+                lane["monster_hp_left"] = encounter["waves"][0]["monsters"][0]["monster_hp_left"]
+                lane["logs"] = encounter["logs"].rows()
+                expected = {key: duel[key] for key in lane}
+                expected["logs"] = duel["logs"].rows()
+                for key, value in lane.items():
+                    if expected[key] != value:
+                        mismatches += 1
+                        if mismatches <= 3:
+                            errors.append(f"{name}/{monster['monster_id']} seed={seed} {key} differs")
+
+            status = "PASS" if mismatches == 0 else "FAIL"
+            print(f"[scheduler-parity] {status} {name}/{monster['monster_id']} trials={trials}")
+
+    print(
+        f"[scheduler-parity] duel={duel_sec:.3f}s encounter={encounter_sec:.3f}s "
+        f"overhead={encounter_sec / max(duel_sec, 1e-9):.2f}x"
+    )
+    if errors:
+        for error in errors:
+            print(f"  - {error}")
+        raise SystemExit(1)
+    print("[scheduler-parity] PASS")
+
+
+if __name__ == "__main__":
+    main()
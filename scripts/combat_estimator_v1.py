@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import math
+from typing import Any
+
+from simulate_minimal_combat_v1 import (
+    expected_damage,
+    get_monster_mechanic,
+    js_round_int,
+    normalize_element,
+)
+
+# Mirrors the fixed numbers in simulate_duel / current_*_multiplier.
+BURN_TICK_SCALE = 0.12
+SLOW_SPEED_MULTIPLIER = 0.75
+WEAKEN_ATK_MULTIPLIER = 0.85
+ARMOR_BREAK_DEF_MULTIPLIER = 0.80
+BASIC_ATTACK_MP_REGEN = 6.0
+
+# log(ttk ratio) -> win probability; |margin| >= LOPSIDED_MARGIN is safe to prune.
+WIN_PROBABILITY_LOGIT_SCALE = 8.0
+LOPSIDED_MARGIN = 0.5
+
+
+def status_uptime(rate_duration_pairs: list[tuple[float, float]]) -> float:
+    """Share of time a refreshed status is active, with applications as a Poisson process.
+
+    Re-applying only extends the expiry, so each source of rate r and duration d
+    leaves the status off with probability exp(-r * d).
+    """
+    exposure = sum(rate * duration for rate, duration in rate_duration_pairs if rate > 0 and duration > 0)
+    return 1.0 - math.exp(-exposure)
+
+
+def mean_action_interval(speed: float, slow_uptime: float) -> float:
+    normal = 1.0 / max(0.2, speed)
+    slowed = 1.0 / max(0.2, speed * SLOW_SPEED_MULTIPLIER)
+    return slow_uptime * slowed + (1.0 - slow_uptime) * normal
+
+
+def skill_rotation(skills: list[dict[str, Any]], action_interval: float) -> list[float]:
+    """Steady-state share of player actions per skill, before MP limits.
+
+    Skills are claimed in choose_player_skill order; each one can take at most
+    one action per ceil(cooldown / interval) actions.
+    """
+    order = sorted(range(len(skills)), key=lambda i: (-skills[i]["damage_coeff"], skills[i]["cooldown_sec"]))
+    shares = [0.0] * len(skills)
+    remaining = 1.0
+    for i in order:
+        period = max(1, math.ceil(skills[i]["cooldown_sec"] / action_interval - 1e-9))
+        shares[i] = min(remaining, 1.0 / period)
+        remaining -= shares[i]
+    return shares
+
+
+def mp_limited_shares(skills: list[dict[str, Any]], shares: list[float]) -> list[float]:
+    """Scale skill shares so MP spent per action equals the basic attack regen."""
+    spend = sum(share * skill["cost_mp"] for share, skill in zip(shares, skills))
+    skill_share = sum(shares)
+    if spend <= BASIC_ATTACK_MP_REGEN * (1.0 - skill_share):
+        return shares
+    scale = BASIC_ATTACK_MP_REGEN / (spend + BASIC_ATTACK_MP_REGEN * skill_share)
+    return [share * scale for share in shares]
+
+
+def mp_drain_per_action(skills: list[dict[str, Any]], shares: list[float]) -> float:
+    spend = sum(share * skill["cost_mp"] for share, skill in zip(shares, skills))
+    return spend - BASIC_ATTACK_MP_REGEN * (1.0 - sum(shares))
+
+
+def time_to_deplete(hp: float, dps_full: float, dps_sustained: float, full_phase_sec: float) -> float:
+    if dps_full <= 0 and dps_sustained <= 0:
+        return math.inf
+    if dps_full * full_phase_sec >= hp:
+        return hp / dps_full
+    if dps_sustained <= 0:
+        return math.inf
+    return full_phase_sec + (hp - dps_full * full_phase_sec) / dps_sustained
+
+
+def estimate_matchup(
+    player_stats: dict[str, float],
+    monster_row: dict[str, str],
+    monster_stats: dict[str, float],
+    skills: list[dict[str, Any]],
+    constants: dict[str, float],
+    max_turns: int,
+) -> dict[str, Any]:
+    """Expected-value estimate of one simulate_duel matchup.
+
+    Damage per action is the closed-form mean of calc_damage. Statuses enter
+    through Poisson uptimes: burn as extra DPS, slow as a longer mean action
+    interval, stun as skipped actions, weaken/armor_break as blended
+    multipliers. The player rotation runs at full cooldown rate until MP
+    drains, then at the MP-neutral rate.
+    """
+    mechanic = get_monster_mechanic(monster_row.get("special_mechanic", ""))
+    monster_element = normalize_element(monster_row["element"])
+
+    player_base_interval = 1.0 / max(0.2, player_stats["speed"])
+    monster_base_interval = 1.0 / max(0.2, monster_stats["speed"])
+
+    # Monster -> player on-hit status; monsters only basic attack.
+    monster_hit, _ = expected_damage(monster_stats, player_stats, "none", 1.0, monster_element, constants)
+    player_status_rates: dict[str, float] = {}
+    if mechanic.on_hit_status:
+        player_status_rates[mechanic.on_hit_status] = monster_hit * mechanic.on_hit_chance / monster_base_interval
+    player_uptime = {
+        status: status_uptime([(rate, mechanic.on_hit_duration_sec)])
+        for status, rate in player_status_rates.items()
+    }
+    player_interval = mean_action_interval(player_stats["speed"], player_uptime.get("slow", 0.0))
+    player_action_rate = (1.0 - player_uptime.get("stun", 0.0)) / player_interval
+    player_weaken = player_uptime.get("weaken", 0.0)
+    player_armor_break = player_uptime.get("armor_break", 0.0)
+
+    # Player -> monster: per-skill damage and status exposure.
+    shares_full = skill_rotation(skills, player_base_interval)
+    shares_sustained = mp_limited_shares(skills, shares_full)
+
+    def player_attack(coeff: float, element: str) -> tuple[float, float]:
+        hit, dmg = expected_damage(player_stats, monster_stats, monster_element, coeff, element, constants)
+        if player_weaken > 0:
+            _, weak_dmg = expected_damage(
+                player_stats, monster_stats, monster_element, coeff, element, constants, WEAKEN_ATK_MULTIPLIER
+            )
+            dmg = player_weaken * weak_dmg + (1.0 - player_weaken) * dmg
+        return hit, dmg
+
+    basic_hit, basic_dmg = player_attack(1.0, "none")
+    skill_attacks = [player_attack(skill["damage_coeff"], skill["element"]) for skill in skills]
+
+    def per_action(shares: list[float]) -> float:
+        total = (1.0 - sum(shares)) * basic_dmg
+        for share, (_, dmg) in zip(shares, skill_attacks):
+            total += share * dmg
+        return total
+
+    monster_status_pairs: dict[str, list[tuple[float, float]]] = {}
+    for share, skill, (hit, _) in zip(shares_sustained, skills, skill_attacks):
+        effect = str(skill.get("status_effect", ""))
+        if effect not in ("burn", "slow", "stun"):
+            continue
+        rate = share * player_action_rate * hit * min(1.0, skill["status_chance_pct"] / 100.0)
+        monster_status_pairs.setdefault(effect, []).append((rate, skill["status_duration_sec"]))
+    monster_uptime = {status: status_uptime(pairs) for status, pairs in monster_status_pairs.items()}
+
+    monster_interval = mean_action_interval(monster_stats["speed"], monster_uptime.get("slow", 0.0))
+    monster_turn_rate = 1.0 / monster_interval
+    monster_attack_rate = (1.0 - monster_uptime.get("stun", 0.0)) * monster_turn_rate
+
+    # Player damage output and monster sustain.
+    burn_on_monster = monster_uptime.get("burn", 0.0) * max(
+        1, js_round_int(player_stats["atk"] * BURN_TICK_SCALE)
+    ) * monster_turn_rate
+    _, monster_dmg = expected_damage(monster_stats, player_stats, "none", 1.0, monster_element, constants)
+    if player_armor_break > 0:
+        _, broken_dmg = expected_damage(
+            monster_stats,
+            player_stats,
+            "none",
+            1.0,
+            monster_element,
+            constants,
+            1.0,
+            ARMOR_BREAK_DEF_MULTIPLIER,
+        )
+        monster_dmg = player_armor_break * broken_dmg + (1.0 - player_armor_break) * monster_dmg
+    monster_heal_rate = mechanic.on_hit_heal_ratio * monster_dmg * monster_attack_rate
+
+    player_dps_full = per_action(shares_full) * player_action_rate + burn_on_monster - monster_heal_rate
+    player_dps_sustained = per_action(shares_sustained) * player_action_rate + burn_on_monster - monster_heal_rate
+    drain = mp_drain_per_action(skills, shares_full)
+    full_phase_sec = (
+        math.inf if drain <= 0 else player_stats["mp"] / drain / player_action_rate
+    )
+    monster_ttk_sec = time_to_deplete(monster_stats["hp"], player_dps_full, player_dps_sustained, full_phase_sec)
+
+    # Monster damage output against player effective HP.
+    player_hp = player_stats["hp"]
+    if mechanic.has_execute_bonus and mechanic.execute_damage_multiplier > 0:
+        threshold = mechanic.execute_target_hp_below_ratio
+        player_hp = player_hp * (1.0 - threshold) + player_hp * threshold / mechanic.execute_damage_multiplier
+    if mechanic.first_strike_damage_multiplier > 1.0:
+        player_hp -= (mechanic.first_strike_damage_multiplier - 1.0) * monster_dmg
+    burn_on_player = 0.0
+    if mechanic.on_hit_status == "burn":
+        burn_on_player = player_uptime["burn"] * max(
+            1, js_round_int(monster_stats["atk"] * mechanic.on_hit_source_atk_scale * BURN_TICK_SCALE)
+        ) / player_interval
+    monster_dps = monster_dmg * monster_attack_rate + burn_on_player
+    player_ttk_sec = max(0.0, player_hp) / monster_dps if monster_dps > 0 else math.inf
+
+    expected_turns = min(monster_ttk_sec, player_ttk_sec) * (1.0 / player_interval + monster_turn_rate)
+    timeout = expected_turns > max_turns and monster_ttk_sec <= player_ttk_sec
+    if timeout or monster_ttk_sec == math.inf:
+        margin = -math.inf
+    elif player_ttk_sec == math.inf:
+        margin = math.inf
+    else:
+        margin = math.log(max(player_ttk_sec, 1e-9) / monster_ttk_sec)
+    win_probability = 1.0 / (1.0 + math.exp(-max(-50.0, min(50.0, margin * WIN_PROBABILITY_LOGIT_SCALE))))
+
+    return {
+        "monster_id": monster_row["monster_id"],
+        "player_hit_chance": basic_hit,
+        "monster_hit_chance": monster_hit,
+        "player_damage_per_action": per_action(shares_full),
+        "monster_damage_per_action": monster_dmg,
+        "player_dps": player_dps_full,
+        "monster_dps": monster_dps,
+        "monster_status_uptime": monster_uptime,
+        "player_status_uptime": player_uptime,
+        "monster_ttk_sec": monster_ttk_sec,
+        "player_ttk_sec": player_ttk_sec,
+        "expected_turns": expected_turns,
+        "timeout": timeout,
+        "margin": margin,
+        "win_probability": win_probability,
+        "lopsided": abs(margin) >= LOPSIDED_MARGIN,
+    }
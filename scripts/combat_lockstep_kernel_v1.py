@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+from simulate_minimal_combat_v1 import (
+    calc_element_multiplier,
+    clamp,
+    get_monster_mechanic,
+    normalize_element,
+    to_float,
+)
+
+PLAYER = 0
+MONSTER = 1
+STATUS_ORDER = ("burn", "slow", "stun", "armor_break", "weaken")
+STATUS_INDEX = {status: idx for idx, status in enumerate(STATUS_ORDER)}
+SKILL_STATUS_EFFECTS = ("burn", "slow", "stun")
+XORSHIFT_ZERO_SEED = 0x12345678
+
+
+def seed_states(seeds: list[int]) -> np.ndarray:
+    normalized = [seed & 0xFFFFFFFF for seed in seeds]
+    return np.array(
+        [value if value != 0 else XORSHIFT_ZERO_SEED for value in normalized],
+        dtype=np.uint32,
+    )
+
+
+def round_half_up_array(values: np.ndarray) -> np.ndarray:
+    # Exact ROUND_HALF_UP for non-negative values; matches js_round_int lane by lane.
+    floored = np.floor(values)
+    return floored + ((values - floored) >= 0.5)
+
+
+class LockstepDuels:
+    """Struct-of-arrays state for many 1v1 duels of the same matchup.
+
+    Every lane owns its own xorshift32 state and draws only where the scalar
+    engine would call SeededRng.next(), so each lane replays simulate_duel
+    for its seed exactly.
+    """
+
+    def __init__(
+        self,
+        player_stats: dict[str, float],
+        monster_row: dict[str, str],
+        monster_stats: dict[str, float],
+        skills: list[dict[str, Any]],
+        seeds: list[int],
+        max_turns: int,
+        constants: dict[str, float],
+    ):
+        n = len(seeds)
+        self.max_turns = max_turns
+        self.constants = constants
+        self.stats = (player_stats, monster_stats)
+        self.elements = ("none", normalize_element(monster_row["element"]))
+        self.skills = skills[:2]
+
+        self.rng = seed_states(seeds)
+        self.hp = np.array([[player_stats["hp"]] * n, [monster_stats["hp"]] * n], dtype=np.float64)
+        self.max_hp = (player_stats["hp"], monster_stats["hp"])
+        self.mp = np.full(n, player_stats["mp"], dtype=np.float64)
+        self.max_mp = player_stats["mp"]
+        self.next_sec = np.array(
+            [
+                [1.0 / max(0.2, player_stats["speed"])] * n,
+                [1.0 / max(0.2, monster_stats["speed"])] * n,
+            ],
+            dtype=np.float64,
+        )
+        self.until = np.full((2, len(STATUS_ORDER), n), -np.inf, dtype=np.float64)
+        self.source_atk = np.zeros((2, len(STATUS_ORDER), n), dtype=np.float64)
+        self.cooldown_ready = np.zeros((len(self.skills), n), dtype=np.float64)
+        self.used_skills = np.zeros((len(self.skills), n), dtype=np.int64)
+        self.turn = np.zeros(n, dtype=np.int64)
+        self.now = np.zeros(n, dtype=np.float64)
+
+        accuracy_floor = constants.get("accuracy_floor", 0.55)
+        accuracy_ceiling = constants.get("accuracy_ceiling", 0.98)
+        crit_rate_cap = constants.get("crit_rate_cap", 0.75)
+        self.hit_chance = tuple(
+            clamp(
+                self.stats[side]["accuracy"] - self.stats[1 - side]["evasion"] + 0.75,
+                accuracy_floor,
+                accuracy_ceiling,
+            )
+            for side in (PLAYER, MONSTER)
+        )
+        self.crit_rate = tuple(
+            clamp(self.stats[side]["crit_rate"], 0.0, crit_rate_cap) for side in (PLAYER, MONSTER)
+        )
+
+        # choose_player_skill sorts by (-damage_coeff, cooldown_sec) with a stable sort.
+        self.skill_order = sorted(
+            range(len(self.skills)),
+            key=lambda k: (-self.skills[k]["damage_coeff"], self.skills[k]["cooldown_sec"]),
+        )
+        self.skill_element_multiplier = [
+            calc_element_multiplier(skill["element"], self.elements[MONSTER], constants)
+            for skill in self.skills
+        ]
+        self.basic_element_multiplier = (
+            calc_element_multiplier(self.elements[PLAYER], self.elements[MONSTER], constants),
+            calc_element_multiplier(self.elements[MONSTER], self.elements[PLAYER], constants),
+        )
+
+        mechanic = get_monster_mechanic(monster_row.get("special_mechanic", ""))
+        self.first_strike_multiplier = mechanic.first_strike_damage_multiplier
+        self.first_strike_pending = np.full(n, self.first_strike_multiplier > 1.0, dtype=bool)
+        self.execute_bonus: tuple[float, float] | None = (
+            (mechanic.execute_target_hp_below_ratio, mechanic.execute_damage_multiplier)
+            if mechanic.has_execute_bonus
+            else None
+        )
+        self.on_hit: tuple[int, float, float, float] | None = (
+            (
+                STATUS_INDEX[mechanic.on_hit_status],
+                mechanic.on_hit_chance,
+                mechanic.on_hit_duration_sec,
+                mechanic.on_hit_source_atk_scale,
+            )
+            if mechanic.on_hit_status
+            else None
+        )
+        self.heal_ratio = mechanic.on_hit_heal_ratio
+
+    def draw(self, idx: np.ndarray) -> np.ndarray:
+        x = self.rng[idx]
+        x ^= x << np.uint32(13)
+        x ^= x >> np.uint32(17)
+        x ^= x << np.uint32(5)
+        self.rng[idx] = x
+        return x / 4294967296.0
+
+    def apply_status(
+        self,
+        side: int,
+        status_idx: int,
+        idx: np.ndarray,
+        duration_sec: float,
+        source_atk: float,
+    ) -> None:
+        if duration_sec <= 0 or idx.size == 0:
+            return
+        until = self.now[idx] + duration_sec
+        self.until[side, status_idx, idx] = np.maximum(self.until[side, status_idx, idx], until)
+        self.source_atk[side, status_idx, idx] = np.maximum(
+            self.source_atk[side, status_idx, idx], source_atk
+        )
+
+    def maybe_apply_status_with_chance(
+        self,
+        side: int,
+        status_idx: int,
+        idx: np.ndarray,
+        chance: float,
+        duration_sec: float,
+        source_atk: float,
+    ) -> None:
+        if chance <= 0 or duration_sec <= 0 or idx.size == 0:
+            return
+        roll = self.draw(idx)
+        self.apply_status(side, status_idx, idx[~(roll > chance)], duration_sec, source_atk)
+
+    def calc_damage(
+        self,
+        side: int,
+        idx: np.ndarray,
+        coeff: np.ndarray,
+        element_multiplier: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Returns (hit mask over idx, rounded damage per hit lane)."""
+        attacker = self.stats[side]
+        defender = self.stats[1 - side]
+        now = self.now[idx]
+
+        hit = ~(self.draw(idx) > self.hit_chance[side])
+        hit_idx = idx[hit]
+        now = now[hit]
+        is_crit = self.draw(hit_idx) < self.crit_rate[side]
+
+        atk_multiplier = np.where(self.until[side, STATUS_INDEX["weaken"], hit_idx] > now, 0.85, 1.0)
+        def_multiplier = np.where(
+            self.until[1 - side, STATUS_INDEX["armor_break"], hit_idx] > now, 0.80, 1.0
+        )
+        defense_constant_k = self.constants.get("defense_constant_k", 180)
+        defender_def = defender["def"] * def_multiplier
+        def_after_pen = np.maximum(0.0, defender_def * (1 - attacker["penetration"]))
+        def_ratio = def_after_pen / (def_after_pen + defense_constant_k)
+
+        damage = attacker["atk"] * atk_multiplier * coeff[hit]
+        damage = damage * (1 - def_ratio)
+        damage = damage * (1 - defender["damage_reduction"])
+        damage = damage * element_multiplier[hit]
+        damage = np.where(is_crit, damage * (1 + attacker["crit_damage"]), damage)
+
+        variance = 0.95 + self.draw(hit_idx) * 0.10
+        damage = damage * variance
+        return hit, np.maximum(1.0, round_half_up_array(damage))
+
+    def start_of_turn(self, side: int, idx: np.ndarray) -> np.ndarray:
+        now = self.now[idx]
+        until = self.until[side][:, idx]
+        expired = until <= now
+        until[expired] = -np.inf
+        source_atk = self.source_atk[side][:, idx]
+        source_atk[expired] = 0.0
+        self.until[side][:, idx] = until
+        self.source_atk[side][:, idx] = source_atk
+
+        burn = until[STATUS_INDEX["burn"]] > now
+        if burn.any():
+            burn_idx = idx[burn]
+            burn_damage = np.maximum(
+                1.0, round_half_up_array(source_atk[STATUS_INDEX["burn"]][burn] * 0.12)
+            )
+            self.hp[side, burn_idx] = np.maximum(0.0, self.hp[side, burn_idx] - burn_damage)
+
+        alive = self.hp[side, idx] > 0
+        stunned = alive & (until[STATUS_INDEX["stun"]] > now)
+        speed_multiplier = np.where(until[STATUS_INDEX["slow"]] > now, 0.75, 1.0)
+        step = 1.0 / np.maximum(0.2, self.stats[side]["speed"] * speed_multiplier)
+
+        acting = alive & ~stunned
+        advance = stunned | acting
+        self.next_sec[side, idx[advance]] += step[advance]
+        return idx[acting]
+
+    def player_turn(self, idx: np.ndarray) -> None:
+        now = self.now[idx]
+        mp = self.mp[idx]
+        choice = np.full(idx.size, -1, dtype=np.int64)
+        for k in self.skill_order:
+            skill = self.skills[k]
+            ready = (
+                (choice == -1)
+                & (self.cooldown_ready[k, idx] <= now)
+                & (mp >= skill["cost_mp"])
+            )
+            choice[ready] = k
+
+        coeff = np.ones(idx.size, dtype=np.float64)
+        element_multiplier = np.full(idx.size, self.basic_element_multiplier[PLAYER])
+        basic = choice == -1
+        self.mp[idx[basic]] = np.minimum(self.max_mp, mp[basic] + 6)
+        for k, skill in enumerate(self.skills):
+            picked = choice == k
+            if not picked.any():
+                continue
+            picked_idx = idx[picked]
+            coeff[picked] = skill["damage_coeff"]
+            element_multiplier[picked] = self.skill_element_multiplier[k]
+            self.mp[picked_idx] = mp[picked] - skill["cost_mp"]
+            self.cooldown_ready[k, picked_idx] = now[picked] + skill["cooldown_sec"]
+            self.used_skills[k, picked_idx] += 1
+
+        hit, damage = self.calc_damage(PLAYER, idx, coeff, element_multiplier)
+        hit_idx = idx[hit]
+        self.hp[MONSTER, hit_idx] = np.maximum(0.0, self.hp[MONSTER, hit_idx] - damage)
+
+        hit_choice = choice[hit]
+        for k, skill in enumerate(self.skills):
+            effect = str(skill.get("status_effect", ""))
+            if effect not in SKILL_STATUS_EFFECTS:
+                continue
+            chance_pct = max(0.0, to_float(skill.get("status_chance_pct"), 0.0))
+            duration_sec = max(0.0, to_float(skill.get("status_duration_sec"), 0.0))
+            if chance_pct <= 0 or duration_sec <= 0:
+                continue
+            self.maybe_apply_status_with_chance(
+                MONSTER,
+                STATUS_INDEX[effect],
+                hit_idx[hit_choice == k],
+                clamp(chance_pct / 100.0, 0.0, 1.0),
+                duration_sec,
+                self.stats[PLAYER]["atk"],
+            )
+
+    def monster_turn(self, idx: np.ndarray) -> None:
+        coeff = np.ones(idx.size, dtype=np.float64)
+        if self.first_strike_multiplier > 0:
+            pending = self.first_strike_pending[idx]
+            coeff[pending] *= self.first_strike_multiplier
+            self.first_strike_pending[idx[pending]] = False
+
+        if self.execute_bonus is not None and self.max_hp[PLAYER] > 0:
+            threshold, multiplier = self.execute_bonus
+            ratio = self.hp[PLAYER, idx] / self.max_hp[PLAYER]
+            coeff = np.where(ratio <= threshold, coeff * multiplier, coeff)
+
+        element_multiplier = np.full(idx.size, self.basic_element_multiplier[MONSTER])
+        hit, damage = self.calc_damage(MONSTER, idx, coeff, element_multiplier)
+        hit_idx = idx[hit]
+        self.hp[PLAYER, hit_idx] = np.maximum(0.0, self.hp[PLAYER, hit_idx] - damage)
+
+        if self.on_hit is not None:
+            status_idx, chance, duration_sec, source_scale = self.on_hit
+            self.maybe_apply_status_with_chance(
+                PLAYER,
+                status_idx,
+                hit_idx,
+                chance,
+                duration_sec,
+                self.stats[MONSTER]["atk"] * source_scale,
+            )
+
+        if self.heal_ratio > 0 and hit_idx.size:
+            heal_amount = np.maximum(1.0, round_half_up_array(damage * self.heal_ratio))
+            self.hp[MONSTER, hit_idx] = np.minimum(
+                self.max_hp[MONSTER], self.hp[MONSTER, hit_idx] + heal_amount
+            )
+
+    def run(self) -> dict[str, np.ndarray]:
+        lanes = np.flatnonzero(
+            (self.turn < self.max_turns) & (self.hp[PLAYER] > 0) & (self.hp[MONSTER] > 0)
+        )
+        while lanes.size:
+            is_player = self.next_sec[PLAYER, lanes] <= self.next_sec[MONSTER, lanes]
+            self.now[lanes] = np.where(
+                is_player,
+                self.next_sec[PLAYER, lanes],
+                self.next_sec[MONSTER, lanes],
+            )
+            self.turn[lanes] += 1
+
+            player_idx = self.start_of_turn(PLAYER, lanes[is_player])
+            monster_idx = self.start_of_turn(MONSTER, lanes[~is_player])
+            if player_idx.size:
+                self.player_turn(player_idx)
+            if monster_idx.size:
+                self.monster_turn(monster_idx)
+
+            lanes = lanes[
+                (self.turn[lanes] < self.max_turns)
+                & (self.hp[PLAYER, lanes] > 0)
+                & (self.hp[MONSTER, lanes] > 0)
+            ]
+
+        return {
+            "player_won": (self.hp[PLAYER] > 0) & (self.hp[MONSTER] <= 0),
+            "turns": self.turn,
+            "elapsed_sec": self.now,
+            "player_hp_left": self.hp[PLAYER],
+            "monster_hp_left": self.hp[MONSTER],
+            "used_skills": self.used_skills,
+        }
+
+
+def simulate_duels_lockstep(
+    player_stats: dict[str, float],
+    monster_row: dict[str, str],
+    monster_stats: dict[str, float],
+    skills: list[dict[str, Any]],
+    seeds: list[int],
+    max_turns: int,
+    constants: dict[str, float],
+) -> dict[str, np.ndarray]:
+    """Run one duel per seed in lockstep; raw (unrounded) columns indexed by seed order."""
+    return LockstepDuels(
+        player_stats,
+        monster_row,
+        monster_stats,
+        skills,
+        seeds,
+        max_turns,
+        constants,
+    ).run()
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from combat_estimator_v1 import BASIC_ATTACK_MP_REGEN
+from simulate_combat_matrix_v1 import auto_player_level, cell_key, legal_skill_pairs
+from simulate_minimal_combat_v1 import (
+    OUT_DIR,
+    CombatTables,
+    build_monster_stats,
+    build_player_stats,
+    expected_damage,
+    get_progression_row,
+    normalize_element,
+    skill_entry,
+    to_fixed,
+)
+
+OUT_ROTATION_CSV = OUT_DIR / "combat_rotation_v1.csv"
+OUT_ROTATION_REPORT_JSON = OUT_DIR / "combat_rotation_report_v1.json"
+ROTATION_CACHE_JSON = OUT_DIR / "combat_rotation_cache_v1.json"
+ROTATION_CACHE_VERSION = 2
+# Cell keys hash the cell inputs (skill rows, stats, constants, --mp-bucket), not the search code.
+# Bump this when a change to the DP, the greedy baseline or the damage/MP helpers moves rotation results.
+ROTATION_MODEL_VERSION = 1
+# Player actions searched per matchup: the greedy kill length, clamped to this range.
+MIN_HORIZON = 8
+MAX_HORIZON = 240
+OPENING_ACTIONS = 16
+BASIC_ATTACK_ID = "basic_attack"
+
+ROTATION_FIELDS = (
+    "difficulty_index",
+    "world",
+    "player_level",
+    "monster_id",
+    "best_skill_ids",
+    "horizon_actions",
+    "optimal_dps",
+    "greedy_dps",
+    "gain_pct",
+    "held_actions",
+    "greedy_best_skill_ids",
+    "greedy_best_dps",
+    "gain_vs_greedy_best_pct",
+    "opening",
+)
+
+
+@dataclass(frozen=True)
+class RotationSkill:
+    skill_id: str
+    damage_coeff: float
+    cooldown_sec: float
+    expected_damage: float
+    cost_units: int
+    # Actions the skill stays blocked after use: ceil(cooldown / interval) - 1.
+    blocked_actions: int
+    # Largest MP deficit (in buckets below max_mp) that still affords the cost.
+    max_deficit: int
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Search skill rotations per matchup with a memoized (cooldown, MP) DP and compare with greedy."
+    )
+    parser.add_argument("--difficulty-from", type=int, default=1)
+    parser.add_argument("--difficulty-to", type=int, default=0, help="0 = last progression row")
+    parser.add_argument("--difficulty-step", type=int, default=1)
+    parser.add_argument(
+        "--player-level",
+        type=int,
+        default=0,
+        help="fixed level; 0 = floor(8 + difficulty_index * 0.55) clamped to 1..120 (auto-progress rule)",
+    )
+    parser.add_argument("--rebirth-count", type=int, default=0)
+    parser.add_argument(
+        "--monster-scope",
+        choices=("world", "all"),
+        default="world",
+        help="world = monsters of the difficulty's world, all = every monster row",
+    )
+    parser.add_argument("--mp-bucket", type=float, default=1.0, help="MP resolution of the DP state")
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update the rotation cache")
+    parser.add_argument("--out-csv", type=Path, default=OUT_ROTATION_CSV)
+    parser.add_argument("--out-report", type=Path, default=OUT_ROTATION_REPORT_JSON)
+    return parser.parse_args()
+
+
+def rotation_skills(
+    skills: list[dict[str, Any]],
+    player_stats: dict[str, float],
+    monster_stats: dict[str, float],
+    monster_element: str,
+    constants: dict[str, float],
+    mp_bucket: float,
+) -> list[RotationSkill]:
+    interval = 1.0 / max(0.2, player_stats["speed"])
+    out = []
+    for skill in skills:
+        _, damage = expected_damage(
+            player_stats, monster_stats, monster_element, skill["damage_coeff"], skill["element"], constants
+        )
+        out.append(
+            RotationSkill(
+                skill_id=skill["skill_id"],
+                damage_coeff=skill["damage_coeff"],
+                cooldown_sec=skill["cooldown_sec"],
+                expected_damage=damage,
+                cost_units=math.ceil(skill["cost_mp"] / mp_bucket - 1e-9),
+                blocked_actions=max(1, math.ceil(skill["cooldown_sec"] / interval - 1e-9)) - 1,
+                max_deficit=math.floor((player_stats["mp"] - skill["cost_mp"]) / mp_bucket + 1e-9),
+            )
+        )
+    return out
+
+
+def greedy_rotation(skills: list[RotationSkill], regen_units: int, horizon: int) -> list[int]:
+    """choose_player_skill on the (cooldown, MP) model: highest damage_coeff ready skill, else basic.
+
+    Returns the action per step as a skill index, -1 for the basic attack.
+    """
+    order = sorted(range(len(skills)), key=lambda i: (-skills[i].damage_coeff, skills[i].cooldown_sec))
+    blocked = [0] * len(skills)
+    deficit = 0
+    actions = []
+    for _ in range(horizon):
+        chosen = next((i for i in order if blocked[i] == 0 and deficit <= skills[i].max_deficit), -1)
+        blocked = [max(0, b - 1) for b in blocked]
+        if chosen < 0:
+            deficit = max(0, deficit - regen_units)
+        else:
+            blocked[chosen] = skills[chosen].blocked_actions
+            deficit += skills[chosen].cost_units
+        actions.append(chosen)
+    return actions
+
+
+class RotationSearch:
+    """Exact best expected damage for every horizon, by forward DP over reachable states.
+
+    A state is (blocked actions per skill, MP deficit in buckets). Layer t maps
+    each state reachable after t player actions to the best damage collected
+    on the way there plus a back pointer, so one pass up to the longest fight
+    answers every shorter horizon as well. Unlike greedy, the basic attack is
+    allowed while a skill is ready, so the search can hold a skill for MP or
+    for a stronger one coming off cooldown.
+    """
+
+    def __init__(self, skills: list[RotationSkill], basic_damage: float, regen_units: int):
+        self.skills = skills
+        self.basic_damage = basic_damage
+        self.regen_units = regen_units
+        start = (tuple(0 for _ in skills), 0)
+        self.layers: list[dict[tuple[tuple[int, ...], int], tuple[float, Any, int]]] = [{start: (0.0, None, -1)}]
+
+    def _extend(self, horizon: int) -> None:
+        skills = self.skills
+        basic_damage = self.basic_damage
+        regen_units = self.regen_units
+        while len(self.layers) <= horizon:
+            layer: dict[tuple[tuple[int, ...], int], tuple[float, Any, int]] = {}
+            for state, (value, _, _) in self.layers[-1].items():
+                blocked, deficit = state
+                ticked = tuple(b - 1 if b else 0 for b in blocked)
+                moves = [((ticked, deficit - regen_units if deficit > regen_units else 0), basic_damage, -1)]
+                for i, skill in enumerate(skills):
+                    if blocked[i] or deficit > skill.max_deficit:
+                        continue
+                    after = ticked[:i] + (skill.blocked_actions,) + ticked[i + 1 :]
+                    moves.append(((after, deficit + skill.cost_units), skill.expected_damage, i))
+                for nxt, gain, action in moves:
+                    candidate = value + gain
+                    seen = layer.get(nxt)
+                    if seen is None or candidate > seen[0] + 1e-12:
+                        layer[nxt] = (candidate, state, action)
+            self.layers.append(self._prune(layer))
+
+    @staticmethod
+    def _prune(
+        layer: dict[tuple[tuple[int, ...], int], tuple[float, Any, int]],
+    ) -> dict[tuple[tuple[int, ...], int], tuple[float, Any, int]]:
+        """Drop states no better than one with the same cooldowns and less MP deficit.
+
+        Less deficit can only widen the future choices, so such a state never
+        leads to a larger total.
+        """
+        by_blocked: dict[tuple[int, ...], list[tuple[int, float]]] = {}
+        for (blocked, deficit), (value, _, _) in layer.items():
+            by_blocked.setdefault(blocked, []).append((deficit, value))
+        kept = {}
+        for blocked, entries in by_blocked.items():
+            entries.sort()
+            best = -math.inf
+            for deficit, value in entries:
+                if value > best + 1e-12:
+                    best = value
+                    key = (blocked, deficit)
+                    kept[key] = layer[key]
+        return kept
+
+    def best(self, horizon: int) -> tuple[float, list[int]]:
+        """(total, actions) over `horizon` actions; actions are skill indexes, -1 = basic attack."""
+        self._extend(horizon)
+        layer = self.layers[horizon]
+        state = max(layer, key=lambda key: layer[key][0])
+        total = layer[state][0]
+        actions = []
+        for t in range(horizon, 0, -1):
+            _, previous, action = self.layers[t][state]
+            actions.append(action)
+            state = previous
+        actions.reverse()
+        return total, actions
+
+
+def rotation_damage(skills: list[RotationSkill], basic_damage: float, actions: list[int]) -> float:
+    return sum(basic_damage if i < 0 else skills[i].expected_damage for i in actions)
+
+
+def kill_horizon(skills: list[RotationSkill], basic_damage: float, regen_units: int, monster_hp: float) -> int:
+    """Player actions the greedy rotation needs to deplete monster_hp, clamped to MIN/MAX_HORIZON."""
+    dealt = 0.0
+    for step, i in enumerate(greedy_rotation(skills, regen_units, MAX_HORIZON), start=1):
+        dealt += basic_damage if i < 0 else skills[i].expected_damage
+        if dealt >= monster_hp:
+            return max(MIN_HORIZON, step)
+    return MAX_HORIZON
+
+
+def solve_matchup(
+    skills: list[dict[str, Any]],
+    player_stats: dict[str, float],
+    monster_row: dict[str, str],
+    monster_stats: dict[str, float],
+    constants: dict[str, float],
+    mp_bucket: float,
+    dp_memo: dict[tuple[Any, ...], RotationSearch],
+) -> dict[str, Any]:
+    monster_element = normalize_element(monster_row["element"])
+    rotation = rotation_skills(skills, player_stats, monster_stats, monster_element, constants, mp_bucket)
+    _, basic_damage = expected_damage(player_stats, monster_stats, monster_element, 1.0, "none", constants)
+    regen_units = math.floor(BASIC_ATTACK_MP_REGEN / mp_bucket + 1e-9)
+    horizon = kill_horizon(rotation, basic_damage, regen_units, monster_stats["hp"])
+    interval = 1.0 / max(0.2, player_stats["speed"])
+
+    # The search only depends on damage ratios and the integer state rules, so
+    # monsters sharing an element (and difficulties sharing speed/MP buckets)
+    # reuse one search; horizons are read off its layers.
+    shape = (
+        regen_units,
+        tuple(
+            (round(s.expected_damage / basic_damage, 9), s.cost_units, s.blocked_actions, s.max_deficit)
+            for s in rotation
+        ),
+    )
+    search = dp_memo.get(shape)
+    if search is None:
+        unit_rotation = [
+            RotationSkill(s.skill_id, s.damage_coeff, s.cooldown_sec, ratio, cost, blocked, max_deficit)
+            for s, (ratio, cost, blocked, max_deficit) in zip(rotation, shape[1])
+        ]
+        search = RotationSearch(unit_rotation, 1.0, regen_units)
+        dp_memo[shape] = search
+    _, best_actions = search.best(horizon)
+
+    greedy_actions = greedy_rotation(rotation, regen_units, horizon)
+    optimal_total = rotation_damage(rotation, basic_damage, best_actions)
+    greedy_total = rotation_damage(rotation, basic_damage, greedy_actions)
+    if optimal_total <= greedy_total * (1 + 1e-9):
+        # Ties keep the in-game rotation, so held_actions only counts real deviations.
+        best_actions = greedy_actions
+        optimal_total = greedy_total
+    fight_sec = horizon * interval
+    held = 0
+    blocked = [0] * len(rotation)
+    deficit = 0
+    for i in best_actions:
+        ready = any(blocked[j] == 0 and deficit <= s.max_deficit for j, s in enumerate(rotation))
+        if i < 0 and ready:
+            held += 1
+        blocked = [max(0, b - 1) for b in blocked]
+        if i < 0:
+            deficit = max(0, deficit - regen_units)
+        else:
+            blocked[i] = rotation[i].blocked_actions
+            deficit += rotation[i].cost_units
+
+    def action_id(i: int) -> str:
+        return BASIC_ATTACK_ID if i < 0 else rotation[i].skill_id
+
+    return {
+        "horizon_actions": horizon,
+        "optimal_dps": optimal_total / fight_sec,
+        "greedy_dps": greedy_total / fight_sec,
+        "held_actions": held,
+        "opening": [action_id(i) for i in best_actions[:OPENING_ACTIONS]],
+        "action_counts": {
+            action_id(i): best_actions.count(i) for i in sorted(set(best_actions))
+        },
+    }
+
+
+def load_cache(path: Path) -> dict[str, dict[str, Any]]:
+    if not path.exists():
+        return {}
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    if raw.get("version") != ROTATION_CACHE_VERSION or raw.get("model_version") != ROTATION_MODEL_VERSION:
+        return {}
+    return raw.get("cells", {})
+
+
+def save_cache(path: Path, cells: dict[str, dict[str, Any]]) -> None:
+    path.write_text(
+        json.dumps(
+            {"version": ROTATION_CACHE_VERSION, "model_version": ROTATION_MODEL_VERSION, "cells": cells},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ),
+        encoding="utf-8",
+    )
+
+
+def main() -> None:
+    args = parse_args()
+    started = time.perf_counter()
+    tables = CombatTables.load()
+    constants = tables.constants
+    skill_rows_by_id = {row["skill_id"]: row for row in tables.skill_rows}
+    skills_by_id = {skill_id: skill_entry(row) for skill_id, row in skill_rows_by_id.items()}
+
+    last_difficulty = max(int(row["difficulty_index"]) for row in tables.progression_rows)
+    difficulty_from = max(1, args.difficulty_from)
+    difficulty_to = last_difficulty if args.difficulty_to <= 0 else min(last_difficulty, args.difficulty_to)
+    if difficulty_from > difficulty_to:
+        raise SystemExit(f"empty difficulty range: {difficulty_from}..{difficulty_to}")
+    if args.mp_bucket <= 0:
+        raise SystemExit("--mp-bucket must be > 0")
+
+    cache = {} if args.no_cache else load_cache(ROTATION_CACHE_JSON)
+    # Cells of this run; only these are saved, so the file tracks the current sweep instead of every cell ever run.
+    used: dict[str, dict[str, Any]] = {}
+    dp_searches = 0
+    cells = 0
+    computed = 0
+    rows: list[dict[str, Any]] = []
+
+    for difficulty_index in range(difficulty_from, difficulty_to + 1, max(1, args.difficulty_step)):
+        progression = get_progression_row(tables.progression_rows, difficulty_index)
+        player_level = args.player_level if args.player_level > 0 else auto_player_level(difficulty_index)
+        config = {"player_level": player_level, "rebirth_count": max(0, args.rebirth_count)}
+        player_stats = build_player_stats(tables.stat_rows, progression, config, constants)
+        monsters = [
+            row
+            for row in tables.monster_rows
+            if args.monster_scope == "all" or row["world"] == progression["world"]
+        ]
+        pairs = [pair for pair in legal_skill_pairs(tables.skill_rows, difficulty_index) if pair]
+        # Searches keep every layer, so they are shared within a difficulty only;
+        # a whole-table memo grows past available memory on a full sweep.
+        dp_memo: dict[tuple[Any, ...], RotationSearch] = {}
+
+        for monster in monsters:
+            monster_stats = build_monster_stats(player_stats, monster, constants)
+            results = []
+            for skill_ids in pairs:
+                key = cell_key(
+                    {
+                        "skill_rows": [skill_rows_by_id[skill_id] for skill_id in skill_ids],
+                        "player_stats": player_stats,
+                        "monster_row": monster,
+                        "monster_stats": monster_stats,
+                        "constants": constants,
+                        "mp_bucket": args.mp_bucket,
+                    }
+                )
+                cells += 1
+                result = cache.get(key)
+                if result is None:
+                    result = solve_matchup(
+                        [skills_by_id[skill_id] for skill_id in skill_ids],
+                        player_stats,
+                        monster,
+                        monster_stats,
+                        constants,
+                        args.mp_bucket,
+                        dp_memo,
+                    )
+                    cache[key] = result
+                    computed += 1
+                used[key] = result
+                results.append((skill_ids, result))
+
+            best_ids, best = max(results, key=lambda item: item[1]["optimal_dps"])
+            greedy_ids, greedy_best = max(results, key=lambda item: item[1]["greedy_dps"])
+            rows.append(
+                {
+                    "difficulty_index": difficulty_index,
+                    "world": progression["world"],
+                    "player_level": player_level,
+                    "monster_id": monster["monster_id"],
+                    "best_skill_ids": "|".join(best_ids),
+                    "horizon_actions": best["horizon_actions"],
+                    "optimal_dps": to_fixed(best["optimal_dps"], 3),
+                    "greedy_dps": to_fixed(best["greedy_dps"], 3),
+                    "gain_pct": to_fixed((best["optimal_dps"] / best["greedy_dps"] - 1) * 100, 3),
+                    "held_actions": best["held_actions"],
+                    "greedy_best_skill_ids": "|".join(greedy_ids),
+                    "greedy_best_dps": to_fixed(greedy_best["greedy_dps"], 3),
+                    "gain_vs_greedy_best_pct": to_fixed(
+                        (best["optimal_dps"] / greedy_best["greedy_dps"] - 1) * 100, 3
+                    ),
+                    "opening": " ".join(best["opening"]),
+                }
+            )
+        dp_searches += len(dp_memo)
+
+    args.out_csv.parent.mkdir(parents=True, exist_ok=True)
+    with args.out_csv.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(ROTATION_FIELDS))
+        writer.writeheader()
+        writer.writerows(rows)
+    if not args.no_cache:
+        save_cache(ROTATION_CACHE_JSON, used)
+
+    elapsed_sec = time.perf_counter() - started
+    gains = [row["gain_pct"] for row in rows]
+    report = {
+        "config": {
+            "difficulty_from": difficulty_from,
+            "difficulty_to": difficulty_to,
+            "difficulty_step": max(1, args.difficulty_step),
+            "player_level": args.player_level if args.player_level > 0 else "auto",
+            "rebirth_count": max(0, args.rebirth_count),
+            "monster_scope": args.monster_scope,
+            "mp_bucket": args.mp_bucket,
+            "horizon": f"greedy kill length clamped to {MIN_HORIZON}..{MAX_HORIZON} actions",
+        },
+        "matchups": len(rows),
+        "cells": cells,
+        "computed_cells": computed,
+        "cached_cells": cells - computed,
+        "dp_searches": dp_searches,
+        "elapsed_sec": to_fixed(elapsed_sec, 3),
+        "mean_gain_pct": to_fixed(sum(gains) / len(gains), 3) if gains else 0.0,
+        "max_gain_pct": max(gains) if gains else 0.0,
+        "matchups_with_gain": sum(1 for gain in gains if gain > 0),
+        "top_gains": sorted(rows, key=lambda row: -row["gain_pct"])[:10],
+    }
+    args.out_report.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print(f"wrote combat rotation csv -> {args.out_csv} ({len(rows)} rows)")
+    print(f"wrote combat rotation report -> {args.out_report}")
+    print(
+        f"[combat-rotation] difficulties={difficulty_from}..{difficulty_to} matchups={len(rows)} "
+        f"cells={cells} computed={computed} cached={cells - computed} dp_searches={dp_searches} "
+        f"elapsed={elapsed_sec:.1f}s mean_gain_pct={report['mean_gain_pct']} max_gain_pct={report['max_gain_pct']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
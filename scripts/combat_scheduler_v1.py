@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+from pathlib import Path
+from typing import Any
+
+from simulate_minimal_combat_v1 import (
+    COMBAT_CONSTANTS_CSV,
+    DEFAULT_CONFIG,
+    MONSTERS_CSV,
+    OUT_DIR,
+    PROGRESSION_CSV,
+    SKILLS_CSV,
+    STAT_GROWTH_CSV,
+    ActionLogBuffer,
+    SeededRng,
+    Unit,
+    build_monster_stats,
+    build_player_stats,
+    combat_constants_by_key,
+    get_progression_row,
+    make_monster_unit,
+    make_player_unit,
+    pick_skills,
+    read_csv_rows,
+    stat_rows_by_id,
+    take_turn,
+    to_fixed,
+)
+
+OUT_ENCOUNTER_REPORT_JSON = OUT_DIR / "combat_encounter_report_v1.json"
+
+# Heap tie-break: on equal next_action_sec the player side acts first, as in simulate_duel.
+PLAYER_SIDE = 0
+MONSTER_SIDE = 1
+
+
+class EncounterScheduler:
+    """Event queue of (next_action_sec, side, slot) over every live unit.
+
+    Only the unit that just acted changes its next_action_sec, so each action is
+    one heappop plus one heappush. Dead units are dropped lazily when popped.
+    """
+
+    def __init__(self) -> None:
+        self.heap: list[tuple[float, int, int, Unit]] = []
+
+    def push(self, unit: Unit, side: int, slot: int) -> None:
+        heapq.heappush(self.heap, (unit.next_action_sec, side, slot, unit))
+
+    def pop(self) -> tuple[Unit, int, int] | None:
+        while self.heap:
+            _, side, slot, unit = heapq.heappop(self.heap)
+            if unit.hp > 0:
+                return unit, side, slot
+        return None
+
+
+def first_alive(units: list[Unit]) -> Unit | None:
+    for unit in units:
+        if unit.hp > 0:
+            return unit
+    return None
+
+
+def simulate_encounter(
+    player_units: list[dict[str, Any]],
+    waves: list[list[dict[str, Any]]],
+    seed: int,
+    max_turns: int,
+    include_action_logs: bool,
+    constants: dict[str, float],
+    carry_hp: bool = True,
+) -> dict[str, Any]:
+    """N players against sequential waves of monsters, scheduled through a heap.
+
+    player_units: [{"stats", "skills"}]; waves: [[{"monster_row", "monster_stats"}]].
+    Players attack the first live monster and monsters the first live player.
+    max_turns caps each wave. With carry_hp=False players return to full HP/MP
+    between waves; cooldowns, statuses and the clock always carry over.
+    A single player against a single one-monster wave reproduces simulate_duel.
+    """
+    rng = SeededRng(seed)
+    players = [
+        make_player_unit(f"player_{idx:02d}", unit["stats"], unit["skills"])
+        for idx, unit in enumerate(player_units, start=1)
+    ]
+
+    turn = 0
+    now_sec = 0.0
+    action_log = ActionLogBuffer()
+    logs = action_log if include_action_logs else None
+    used_skills: dict[str, int] = {}
+    status_applied_counts: dict[str, int] = {}
+    wave_results: list[dict[str, Any]] = []
+
+    for wave_index, wave in enumerate(waves, start=1):
+        if first_alive(players) is None:
+            break
+        if wave_index > 1 and not carry_hp:
+            for player in players:
+                if player.hp > 0:
+                    player.hp = player.max_hp
+                    player.mp = player.max_mp
+
+        seen: dict[str, int] = {}
+        monsters: list[Unit] = []
+        for entry in wave:
+            monster_id = entry["monster_row"]["monster_id"]
+            seen[monster_id] = seen.get(monster_id, 0) + 1
+            unit_id = monster_id if seen[monster_id] == 1 else f"{monster_id}#{seen[monster_id]}"
+            monster = make_monster_unit(entry["monster_row"], entry["monster_stats"], unit_id)
+            monster.next_action_sec += now_sec
+            monsters.append(monster)
+
+        scheduler = EncounterScheduler()
+        for slot, player in enumerate(players):
+            if player.hp > 0:
+                scheduler.push(player, PLAYER_SIDE, slot)
+        for slot, monster in enumerate(monsters):
+            scheduler.push(monster, MONSTER_SIDE, slot)
+
+        wave_turns = 0
+        wave_started_sec = now_sec
+        while wave_turns < max_turns:
+            target_player = first_alive(players)
+            target_monster = first_alive(monsters)
+            if target_player is None or target_monster is None:
+                break
+            popped = scheduler.pop()
+            if popped is None:
+                break
+            actor, side, slot = popped
+            target = target_monster if side == PLAYER_SIDE else target_player
+
+            now_sec = float(actor.next_action_sec)
+            turn += 1
+            wave_turns += 1
+
+            take_turn(actor, target, turn, now_sec, rng, constants, logs, used_skills, status_applied_counts)
+            if actor.hp > 0:
+                scheduler.push(actor, side, slot)
+
+        cleared = first_alive(monsters) is None and first_alive(players) is not None
+        wave_results.append(
+            {
+                "wave_index": wave_index,
+                "cleared": cleared,
+                "turns": wave_turns,
+                "elapsed_sec": to_fixed(now_sec - wave_started_sec, 3),
+                "monsters": [
+                    {"unit_id": monster.id, "monster_hp_left": to_fixed(monster.hp, 2)} for monster in monsters
+                ],
+            }
+        )
+        if not cleared:
+            break
+
+    waves_cleared = sum(1 for wave in wave_results if wave["cleared"])
+    return {
+        "winner": "player" if waves_cleared == len(waves) else "monster",
+        "waves_cleared": waves_cleared,
+        "turns": turn,
+        "elapsed_sec": to_fixed(now_sec, 3),
+        "players": [{"unit_id": player.id, "player_hp_left": to_fixed(player.hp, 2)} for player in players],
+        "waves": wave_results,
+        "used_skills": used_skills,
+        "status_applied_counts": status_applied_counts,
+        "logs": action_log,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Simulate wave/gauntlet/party combat with a heap scheduler.")
+    parser.add_argument("--difficulty-index", type=int, default=DEFAULT_CONFIG["difficulty_index"])
+    parser.add_argument("--player-level", type=int, default=DEFAULT_CONFIG["player_level"])
+    parser.add_argument("--rebirth-count", type=int, default=DEFAULT_CONFIG["rebirth_count"])
+    parser.add_argument("--seed", type=int, default=DEFAULT_CONFIG["seed"])
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_CONFIG["max_turns"], help="cap per wave")
+    parser.add_argument("--skill-id", action="append", dest="skill_ids")
+    parser.add_argument(
+        "--wave",
+        action="append",
+        dest="waves",
+        help="comma-separated monster ids of one wave; repeat for a gauntlet",
+    )
+    parser.add_argument("--party-size", type=int, default=1, help="identical player units")
+    parser.add_argument("--no-carry-hp", action="store_true", help="restore player HP/MP between waves")
+    parser.add_argument("--no-action-log", action="store_true")
+    parser.add_argument("--out", type=Path, default=OUT_ENCOUNTER_REPORT_JSON)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    config = {
+        "difficulty_index": max(1, args.difficulty_index),
+        "player_level": max(1, args.player_level),
+        "rebirth_count": max(0, args.rebirth_count),
+        "seed": args.seed,
+        "max_turns": max(10, args.max_turns),
+        "skill_ids": args.skill_ids if args.skill_ids else list(DEFAULT_CONFIG["skill_ids"]),
+        "waves": [
+            [mid.strip() for mid in wave.split(",") if mid.strip()]
+            for wave in (args.waves or [",".join(DEFAULT_CONFIG["monster_ids"])])
+        ],
+        "party_size": max(1, args.party_size),
+        "carry_hp": not args.no_carry_hp,
+        "include_action_logs": not args.no_action_log,
+    }
+
+    progression = get_progression_row(read_csv_rows(PROGRESSION_CSV), config["difficulty_index"])
+    stat_rows = stat_rows_by_id(read_csv_rows(STAT_GROWTH_CSV))
+    constants = combat_constants_by_key(read_csv_rows(COMBAT_CONSTANTS_CSV))
+    player_stats = build_player_stats(stat_rows, progression, config, constants)
+    skills = pick_skills(read_csv_rows(SKILLS_CSV), config)
+    monsters_by_id = {row["monster_id"]: row for row in read_csv_rows(MONSTERS_CSV)}
+
+    waves: list[list[dict[str, Any]]] = []
+    for wave_ids in config["waves"]:
+        missing = [mid for mid in wave_ids if mid not in monsters_by_id]
+        if missing or not wave_ids:
+            raise SystemExit(f"invalid wave monster ids: {wave_ids}")
+        waves.append(
+            [
+                {
+                    "monster_row": monsters_by_id[mid],
+                    "monster_stats": build_monster_stats(player_stats, monsters_by_id[mid], constants),
+                }
+                for mid in wave_ids
+            ]
+        )
+
+    encounter = simulate_encounter(
+        [{"stats": player_stats, "skills": skills} for _ in range(config["party_size"])],
+        waves,
+        config["seed"],
+        config["max_turns"],
+        config["include_action_logs"],
+        constants,
+        config["carry_hp"],
+    )
+    report = {
+        "config": config,
+        "encounter": {**encounter, "logs": encounter["logs"].rows()},
+    }
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print(f"wrote combat encounter report -> {args.out}")
+    print(
+        f"summary: winner={encounter['winner']}, waves_cleared={encounter['waves_cleared']}/{len(waves)}, "
+        f"turns={encounter['turns']}, elapsed_sec={encounter['elapsed_sec']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
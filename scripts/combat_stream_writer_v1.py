@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+from pathlib import Path
+from typing import Any, Iterable
+
+STREAM_FORMATS = ("csv", "jsonl")
+INDEX_FIELDS = ("duel_index", "monster_id", "offset", "length", "rows")
+
+
+def stream_path(base: Path, fmt: str, compress: bool) -> Path:
+    """`data/sim/foo_v1` -> `foo_v1.csv`, `foo_v1.jsonl.gz`, ..."""
+    suffix = f".{fmt}.gz" if compress else f".{fmt}"
+    return base.with_name(base.name + suffix)
+
+
+class StreamTableWriter:
+    """Append-only CSV/JSONL table written one duel block at a time.
+
+    Each block is encoded and flushed as soon as the duel finishes, so memory
+    stays at one duel's rows. With compress=True every block is its own gzip
+    member; concatenated members are still a valid .gz file, and a block can be
+    decompressed on its own from the offsets in the index file.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        fieldnames: Iterable[str],
+        fmt: str = "csv",
+        compress: bool = False,
+        index_path: Path | None = None,
+    ):
+        if fmt not in STREAM_FORMATS:
+            raise SystemExit(f"unsupported stream format: {fmt}")
+        self.path = path
+        self.fieldnames = list(fieldnames)
+        self.fmt = fmt
+        self.compress = compress
+        self.row_count = 0
+        self.file = path.open("wb")
+        self.index_file = None
+        self.index_writer = None
+        if index_path is not None:
+            self.index_file = index_path.open("w", newline="", encoding="utf-8")
+            self.index_writer = csv.writer(self.index_file)
+            self.index_writer.writerow(INDEX_FIELDS)
+        if fmt == "csv":
+            self.write_bytes(self.encode_csv([self.fieldnames]))
+
+    def __enter__(self) -> "StreamTableWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def encode_csv(self, rows: Iterable[Iterable[Any]]) -> bytes:
+        buf = io.StringIO(newline="")
+        writer = csv.writer(buf)
+        writer.writerows(rows)
+        return buf.getvalue().encode("utf-8")
+
+    def encode_rows(self, rows: list[dict[str, Any]]) -> bytes:
+        if self.fmt == "csv":
+            return self.encode_csv([row[key] for key in self.fieldnames] for row in rows)
+        return "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows).encode("utf-8")
+
+    def write_bytes(self, data: bytes) -> tuple[int, int]:
+        if self.compress:
+            data = gzip.compress(data, mtime=0)
+        offset = self.file.tell()
+        self.file.write(data)
+        return offset, len(data)
+
+    def write_block(self, duel_index: int, monster_id: str, rows: list[dict[str, Any]]) -> int:
+        offset, length = self.write_bytes(self.encode_rows(rows)) if rows else (self.file.tell(), 0)
+        if self.index_writer is not None:
+            self.index_writer.writerow([duel_index, monster_id, offset, length, len(rows)])
+        self.row_count += len(rows)
+        self.file.flush()
+        return len(rows)
+
+    def close(self) -> None:
+        self.file.close()
+        if self.index_file is not None:
+            self.index_file.close()
+
+
+def read_index(index_path: Path) -> list[dict[str, Any]]:
+    with index_path.open("r", newline="", encoding="utf-8") as f:
+        return [
+            {
+                "duel_index": int(row["duel_index"]),
+                "monster_id": row["monster_id"],
+                "offset": int(row["offset"]),
+                "length": int(row["length"]),
+                "rows": int(row["rows"]),
+            }
+            for row in csv.DictReader(f)
+        ]
+
+
+def read_duel_block(path: Path, index_path: Path, duel_index: int) -> list[dict[str, Any]]:
+    """Fetch one duel's rows by seeking to its indexed block.
+
+    CSV values come back as strings, JSONL values keep their JSON types.
+    """
+    entry = next((e for e in read_index(index_path) if e["duel_index"] == duel_index), None)
+    if entry is None:
+        raise SystemExit(f"duel_index={duel_index} not found in {index_path}")
+
+    compress = path.name.endswith(".gz")
+    fmt = "jsonl" if ".jsonl" in path.name else "csv"
+    with path.open("rb") as f:
+        header = b""
+        if fmt == "csv":
+            if compress:
+                with gzip.open(f, "rb") as gz:
+                    header = gz.readline()
+            else:
+                header = f.readline()
+        f.seek(entry["offset"])
+        data = f.read(entry["length"])
+
+    if compress and data:
+        data = gzip.decompress(data)
+    text = data.decode("utf-8")
+    if fmt == "jsonl":
+        return [json.loads(line) for line in text.splitlines() if line]
+    return list(csv.DictReader(io.StringIO(header.decode("utf-8") + text, newline="")))
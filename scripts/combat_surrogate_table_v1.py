@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import bisect
+import hashlib
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from sim_rng_v1 import derive_seed32
+from simulate_combat_matrix_v1 import auto_player_level
+from simulate_minimal_combat_v1 import (
+    OUT_DIR,
+    CombatTables,
+    build_monster_stats,
+    build_player_stats,
+    get_progression_row,
+    resolve_jobs,
+    run_trial_chunk,
+    skill_entry,
+    to_fixed,
+    to_float,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+# Balance data behind every cell. Code changes are covered by SURROGATE_MODEL_VERSION and the --check sample.
+SURROGATE_INPUT_FILES = (
+    ROOT / "data/progression/realm_progression_v1.csv",
+    ROOT / "data/system/stat_growth_coeffs_v1.csv",
+    ROOT / "data/balance/combat_constants_v1.csv",
+    ROOT / "data/combat/skills_v1.csv",
+    ROOT / "data/combat/monsters_v1.csv",
+)
+OUT_SURROGATE_JSON = ROOT / "data/export/combat_surrogate_v1.json"
+OUT_SURROGATE_ERROR_JSON = OUT_DIR / "combat_surrogate_error_v1.json"
+DEFAULT_REBIRTH_POINTS = (0, 2, 5, 10, 20)
+# runSingleBattle in saveAutoProgressLoop.ts.
+AUTO_PROGRESS_MAX_TURNS = 160
+SURROGATE_FIELDS = ("win_prob", "expected_turns", "expected_hp_loss_pct")
+WORLD_ORDER = {"mortal": 1, "immortal": 2, "true": 3}
+# Bump when a change to the duel engine, its RNG or the cell setup here moves surrogate values, then rebuild.
+SURROGATE_MODEL_VERSION = 1
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Precompute win probability / turns / HP loss per (difficulty, monster, rebirth) for auto-progress."
+    )
+    parser.add_argument("--difficulty-from", type=int, default=1)
+    parser.add_argument("--difficulty-to", type=int, default=0, help="0 = last progression row")
+    parser.add_argument(
+        "--rebirth-points",
+        default=",".join(str(p) for p in DEFAULT_REBIRTH_POINTS),
+        help="rebirth_count grid; lookups interpolate linearly between points and clamp outside",
+    )
+    parser.add_argument("--trials", type=int, default=64, help="duels per (difficulty, monster, rebirth point)")
+    parser.add_argument("--seed", type=int, default=20260223)
+    parser.add_argument("--jobs", type=int, default=0, help="worker processes (0 = os.cpu_count())")
+    parser.add_argument("--check-queries", type=int, default=200, help="random lookups checked against fresh duels")
+    parser.add_argument("--check-trials", type=int, default=64, help="fresh duels per checked lookup")
+    parser.add_argument(
+        "--max-win-rate-mae",
+        type=float,
+        default=0.0,
+        help="fail when the mean |surrogate - fresh| win-rate error exceeds this (0 = report only)",
+    )
+    parser.add_argument(
+        "--check-cells",
+        type=int,
+        default=48,
+        help="--check: exported cells recomputed with the build seed (0 = hash only)",
+    )
+    parser.add_argument(
+        "--check-tolerance",
+        type=float,
+        default=0.02,
+        help="--check: fail when the recomputed cells' mean |win_prob drift| exceeds this",
+    )
+    parser.add_argument("--out", type=Path, default=OUT_SURROGATE_JSON)
+    parser.add_argument("--error-report", type=Path, default=OUT_SURROGATE_ERROR_JSON)
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="do not build; fail when --out is missing, its balance-data hash is stale or sampled cells drift",
+    )
+    return parser.parse_args()
+
+
+def source_hash() -> str:
+    digest = hashlib.sha1(f"model:{SURROGATE_MODEL_VERSION}".encode("utf-8"))
+    for path in SURROGATE_INPUT_FILES:
+        if path.exists():
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def auto_progress_skills(skill_rows: list[dict[str, str]], difficulty_index: int, world: str) -> list[dict[str, Any]]:
+    """pickCombatSkills in saveAutoProgressLoop.ts: the two strongest unlocked actives of this world or earlier."""
+    unlocked = [
+        row
+        for row in skill_rows
+        if row["category"] == "active"
+        and WORLD_ORDER.get(row["world_unlock"], 3) <= WORLD_ORDER.get(world, 3)
+        and to_float(row["unlock_difficulty_index"], float("inf")) <= difficulty_index
+    ]
+    unlocked.sort(key=lambda row: (-to_float(row["damage_coeff"]), to_float(row["cooldown_sec"])))
+    if not unlocked:
+        by_id = {row["skill_id"]: row for row in skill_rows}
+        unlocked = [by_id[skill_id] for skill_id in ("sk_atk_001", "sk_atk_002") if skill_id in by_id]
+    return [skill_entry(row) for row in unlocked[:2]]
+
+
+def run_surrogate_cells(task: dict[str, Any]) -> list[tuple[int, str, int, list[float]]]:
+    """Duels for every (monster, rebirth point) of one difficulty -> (d, monster_id, point, field values)."""
+    out = []
+    for cell in task["cells"]:
+        results = run_trial_chunk(
+            {
+                "player_stats": cell["player_stats"],
+                "monster_row": cell["monster_row"],
+                "monster_stats": cell["monster_stats"],
+                "skills": task["skills"],
+                "constants": task["constants"],
+                "base_seed": cell["base_seed"],
+                "monster_index": 0,
+                "trial_start": 0,
+                "trial_end": task["trials"],
+                "max_turns": AUTO_PROGRESS_MAX_TURNS,
+                "engine": "scalar",
+                "seed_scheme": "stream",
+            }
+        )
+        max_hp = cell["player_stats"]["hp"]
+        trials = len(results)
+        out.append(
+            (
+                task["difficulty_index"],
+                cell["monster_row"]["monster_id"],
+                cell["rebirth_count"],
+                [
+                    sum(1 for r in results if r[0]) / trials,
+                    sum(r[1] for r in results) / trials,
+                    sum(min(1.0, max(0.0, (max_hp - r[3]) / max_hp)) for r in results) / trials,
+                ],
+            )
+        )
+    return out
+
+
+def surrogate_task(
+    tables: CombatTables,
+    difficulty_index: int,
+    rebirth_points: list[int],
+    trials: int,
+    seed: int,
+    label: str,
+) -> dict[str, Any]:
+    progression = get_progression_row(tables.progression_rows, difficulty_index)
+    player_level = auto_player_level(difficulty_index)
+    monsters = [row for row in tables.monster_rows if row["world"] == progression["world"]]
+    cells = []
+    for rebirth_count in rebirth_points:
+        config = {"player_level": player_level, "rebirth_count": rebirth_count}
+        player_stats = build_player_stats(tables.stat_rows, progression, config, tables.constants)
+        for monster in monsters:
+            cells.append(
+                {
+                    "rebirth_count": rebirth_count,
+                    "player_stats": player_stats,
+                    "monster_row": monster,
+                    "monster_stats": build_monster_stats(player_stats, monster, tables.constants),
+                    "base_seed": derive_seed32(seed, label, difficulty_index, monster["monster_id"], rebirth_count),
+                }
+            )
+    return {
+        "difficulty_index": difficulty_index,
+        "skills": auto_progress_skills(tables.skill_rows, difficulty_index, progression["world"]),
+        "constants": tables.constants,
+        "trials": trials,
+        "cells": cells,
+    }
+
+
+def run_tasks(tasks: list[dict[str, Any]], jobs: int) -> list[tuple[int, str, int, list[float]]]:
+    out = []
+    if jobs == 1:
+        for task in tasks:
+            out.extend(run_surrogate_cells(task))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for results in executor.map(run_surrogate_cells, tasks):
+                out.extend(results)
+    return out
+
+
+class CombatSurrogate:
+    """O(1) battle outcome lookup over the exported table.
+
+    cells[difficulty_index][monster_id][i] holds SURROGATE_FIELDS at
+    rebirth_points[i]; rebirth counts between points interpolate linearly and
+    counts outside the grid clamp to the nearest point.
+    """
+
+    def __init__(self, payload: dict[str, Any]):
+        self.rebirth_points = payload["interpolation"]["rebirth_count"]["points"]
+        self.cells = payload["cells"]
+
+    @classmethod
+    def load(cls, path: Path = OUT_SURROGATE_JSON) -> "CombatSurrogate":
+        return cls(json.loads(path.read_text(encoding="utf-8")))
+
+    def lookup(self, difficulty_index: int, monster_id: str, rebirth_count: int) -> dict[str, float]:
+        rows = self.cells[str(difficulty_index)][monster_id]
+        points = self.rebirth_points
+        if rebirth_count <= points[0]:
+            values = rows[0]
+        elif rebirth_count >= points[-1]:
+            values = rows[-1]
+        else:
+            hi = bisect.bisect_right(points, rebirth_count)
+            lo = hi - 1
+            t = (rebirth_count - points[lo]) / (points[hi] - points[lo])
+            values = [a + (b - a) * t for a, b in zip(rows[lo], rows[hi])]
+        return dict(zip(SURROGATE_FIELDS, values))
+
+    def sample_win(self, difficulty_index: int, monster_id: str, rebirth_count: int, u: float) -> bool:
+        """Battle outcome from one uniform draw u in [0, 1)."""
+        return u < self.lookup(difficulty_index, monster_id, rebirth_count)["win_prob"]
+
+
+def check_surrogate(
+    surrogate: CombatSurrogate,
+    tables: CombatTables,
+    difficulties: list[int],
+    queries: int,
+    trials: int,
+    seed: int,
+    jobs: int,
+) -> dict[str, Any]:
+    """Compare surrogate lookups with fresh duels at random (difficulty, monster, rebirth) points.
+
+    Rebirth counts are drawn anywhere in the grid range, so interpolated
+    lookups are checked, and fresh duels use a seed stream disjoint from the
+    build.
+    """
+    rng = random.Random(seed)
+    points = surrogate.rebirth_points
+    picks = []
+    for _ in range(queries):
+        difficulty_index = rng.choice(difficulties)
+        monster_id = rng.choice(sorted(surrogate.cells[str(difficulty_index)]))
+        picks.append((difficulty_index, monster_id, rng.randint(points[0], points[-1])))
+
+    tasks = []
+    for difficulty_index, monster_id, rebirth_count in picks:
+        task = surrogate_task(tables, difficulty_index, [rebirth_count], trials, seed, "surrogate_check")
+        task["cells"] = [cell for cell in task["cells"] if cell["monster_row"]["monster_id"] == monster_id]
+        tasks.append(task)
+    started = time.perf_counter()
+    fresh = run_tasks(tasks, jobs)
+    duel_us = (time.perf_counter() - started) / max(1, queries * trials) * 1e6
+
+    started = time.perf_counter()
+    for difficulty_index, monster_id, rebirth_count in picks:
+        surrogate.lookup(difficulty_index, monster_id, rebirth_count)
+    lookup_us = (time.perf_counter() - started) / max(1, queries) * 1e6
+
+    win_errors = []
+    turn_errors = []
+    hp_errors = []
+    brier_surrogate = 0.0
+    brier_fresh = 0.0
+    rows = []
+    for difficulty_index, monster_id, rebirth_count, values in fresh:
+        predicted = surrogate.lookup(difficulty_index, monster_id, rebirth_count)
+        win_rate, turns, hp_loss = values
+        win_errors.append(abs(predicted["win_prob"] - win_rate))
+        turn_errors.append(abs(predicted["expected_turns"] - turns) / max(1.0, turns))
+        hp_errors.append(abs(predicted["expected_hp_loss_pct"] - hp_loss))
+        # Brier over the fresh outcomes: win_rate of them were 1, the rest 0.
+        p = predicted["win_prob"]
+        brier_surrogate += win_rate * (1 - p) ** 2 + (1 - win_rate) * p**2
+        brier_fresh += win_rate * (1 - win_rate)
+        rows.append(
+            {
+                "difficulty_index": difficulty_index,
+                "monster_id": monster_id,
+                "rebirth_count": rebirth_count,
+                "on_grid": rebirth_count in points,
+                "surrogate_win_prob": to_fixed(p, 4),
+                "fresh_win_rate": to_fixed(win_rate, 4),
+                "surrogate_turns": to_fixed(predicted["expected_turns"], 2),
+                "fresh_turns": to_fixed(turns, 2),
+                "surrogate_hp_loss_pct": to_fixed(predicted["expected_hp_loss_pct"], 4),
+                "fresh_hp_loss_pct": to_fixed(hp_loss, 4),
+            }
+        )
+
+    n = max(1, len(rows))
+    return {
+        "queries": len(rows),
+        "trials_per_query": trials,
+        "win_rate_mae": to_fixed(sum(win_errors) / n, 4),
+        "win_rate_max_error": to_fixed(max(win_errors, default=0.0), 4),
+        "brier_surrogate": to_fixed(brier_surrogate / n, 4),
+        # Floor set by the fresh sample itself: a perfect surrogate still scores p(1-p).
+        "brier_fresh_floor": to_fixed(brier_fresh / n, 4),
+        "turns_mean_rel_error": to_fixed(sum(turn_errors) / n, 4),
+        "hp_loss_mae": to_fixed(sum(hp_errors) / n, 4),
+        "lookup_us": to_fixed(lookup_us, 3),
+        "duel_us": to_fixed(duel_us, 1),
+        "worst": sorted(rows, key=lambda r: -abs(r["surrogate_win_prob"] - r["fresh_win_rate"]))[:10],
+    }
+
+
+def check_export_drift(payload: dict[str, Any], tables: CombatTables, cells: int, jobs: int) -> dict[str, Any]:
+    """Recompute a fixed sample of exported cells with the build seed and compare win_prob.
+
+    An unchanged engine reproduces the exported values exactly; a change that
+    only reorders RNG draws moves each cell by duel noise, not by a trend.
+    """
+    surrogate = CombatSurrogate(payload)
+    points = surrogate.rebirth_points
+    keys = [
+        (int(d), monster_id, i)
+        for d, monsters in surrogate.cells.items()
+        for monster_id in sorted(monsters)
+        for i in range(len(points))
+    ]
+    picks = sorted(random.Random(payload["seed"]).sample(keys, min(cells, len(keys))))
+
+    tasks = []
+    for difficulty_index, monster_id, i in picks:
+        task = surrogate_task(
+            tables, difficulty_index, [points[i]], payload["trials_per_cell"], payload["seed"], "surrogate"
+        )
+        task["cells"] = [cell for cell in task["cells"] if cell["monster_row"]["monster_id"] == monster_id]
+        tasks.append(task)
+    drifts = []
+    for difficulty_index, monster_id, rebirth_count, values in run_tasks(tasks, jobs):
+        exported = surrogate.cells[str(difficulty_index)][monster_id][points.index(rebirth_count)][0]
+        drifts.append(abs(to_fixed(values[0], 4) - exported))
+    return {
+        "cells": len(drifts),
+        "win_prob_mae": to_fixed(sum(drifts) / max(1, len(drifts)), 4),
+        "win_prob_max_drift": to_fixed(max(drifts, default=0.0), 4),
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    if args.check:
+        out_path = args.out.resolve()
+        payload = json.loads(out_path.read_text(encoding="utf-8")) if out_path.exists() else {}
+        recorded = payload.get("source_hash")
+        if recorded != source_hash():
+            raise SystemExit(
+                f"[combat-surrogate] FAIL {out_path} is missing or stale (source_hash {recorded} != {source_hash()}; "
+                "balance data or SURROGATE_MODEL_VERSION changed); run `npm run combat:surrogate:build` and commit the result"
+            )
+        if args.check_cells > 0:
+            drift = check_export_drift(payload, CombatTables.load(), args.check_cells, resolve_jobs(args.jobs))
+            print(
+                f"[combat-surrogate] recomputed cells={drift['cells']} win_prob_mae={drift['win_prob_mae']} "
+                f"max_drift={drift['win_prob_max_drift']}"
+            )
+            if drift["win_prob_mae"] > args.check_tolerance:
+                raise SystemExit(
+                    f"[combat-surrogate] FAIL win_prob drift {drift['win_prob_mae']} > {args.check_tolerance}; "
+                    "bump SURROGATE_MODEL_VERSION, run `npm run combat:surrogate:build` and commit the result"
+                )
+        print(f"[combat-surrogate] OK {out_path} matches the current balance data and duel engine")
+        return
+    started = time.perf_counter()
+    tables = CombatTables.load()
+
+    rebirth_points = sorted({max(0, int(p)) for p in args.rebirth_points.split(",") if p.strip()})
+    if not rebirth_points:
+        raise SystemExit("--rebirth-points is empty")
+    last_difficulty = max(int(row["difficulty_index"]) for row in tables.progression_rows)
+    difficulty_from = max(1, args.difficulty_from)
+    difficulty_to = last_difficulty if args.difficulty_to <= 0 else min(last_difficulty, args.difficulty_to)
+    if difficulty_from > difficulty_to:
+        raise SystemExit(f"empty difficulty range: {difficulty_from}..{difficulty_to}")
+    difficulties = list(range(difficulty_from, difficulty_to + 1))
+    trials = max(1, args.trials)
+    jobs = resolve_jobs(args.jobs)
+
+    tasks = [surrogate_task(tables, d, rebirth_points, trials, args.seed, "surrogate") for d in difficulties]
+    cells: dict[str, dict[str, list[list[float]]]] = {}
+    for difficulty_index, monster_id, rebirth_count, values in run_tasks(tasks, jobs):
+        rows = cells.setdefault(str(difficulty_index), {}).setdefault(monster_id, [[]] * len(rebirth_points))
+        rows[rebirth_points.index(rebirth_count)] = [
+            to_fixed(values[0], 4),
+            to_fixed(values[1], 2),
+            to_fixed(values[2], 4),
+        ]
+    build_sec = time.perf_counter() - started
+
+    payload = {
+        "generator": "scripts/combat_surrogate_table_v1.py",
+        "version": "v1",
+        "source_hash": source_hash(),
+        "model_version": SURROGATE_MODEL_VERSION,
+        "seed": args.seed,
+        "trials_per_cell": trials,
+        "max_turns": AUTO_PROGRESS_MAX_TURNS,
+        "player_level": "floor(8 + difficulty_index * 0.55) clamped to 1..120",
+        "skills": "pickCombatSkills (two strongest unlocked actives)",
+        "fields": list(SURROGATE_FIELDS),
+        "interpolation": {
+            "difficulty_index": {"mode": "exact"},
+            "monster_id": {"mode": "exact"},
+            "rebirth_count": {"mode": "linear", "points": rebirth_points, "extrapolation": "clamp"},
+        },
+        "cells": cells,
+    }
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    # One difficulty per line keeps the export diffable without the size of indent=2.
+    lines = [f"{json.dumps(d)}: {json.dumps(cells[d], separators=(',', ':'))}" for d in cells]
+    head = json.dumps({k: v for k, v in payload.items() if k != "cells"}, ensure_ascii=False, indent=2)
+    args.out.write_text(head[:-2] + ',\n  "cells": {\n    ' + ",\n    ".join(lines) + "\n  }\n}\n", encoding="utf-8")
+    surrogate = CombatSurrogate.load(args.out)
+    cell_count = sum(len(monsters) for monsters in cells.values()) * len(rebirth_points)
+    print(f"wrote combat surrogate table -> {args.out} ({cell_count} cells, {cell_count * trials} duels)")
+
+    error: dict[str, Any] = {}
+    if args.check_queries > 0:
+        error = check_surrogate(
+            surrogate, tables, difficulties, args.check_queries, max(1, args.check_trials), args.seed + 1, jobs
+        )
+    report = {
+        "config": {
+            "difficulty_from": difficulty_from,
+            "difficulty_to": difficulty_to,
+            "rebirth_points": rebirth_points,
+            "trials": trials,
+            "seed": args.seed,
+        },
+        "cells": cell_count,
+        "build_sec": to_fixed(build_sec, 3),
+        "check": error,
+    }
+    args.error_report.parent.mkdir(parents=True, exist_ok=True)
+    args.error_report.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"wrote combat surrogate error report -> {args.error_report}")
+    if error:
+        print(
+            f"[combat-surrogate] queries={error['queries']} win_rate_mae={error['win_rate_mae']} "
+            f"brier={error['brier_surrogate']} (floor {error['brier_fresh_floor']}) "
+            f"turns_rel_err={error['turns_mean_rel_error']} hp_loss_mae={error['hp_loss_mae']} "
+            f"lookup_us={error['lookup_us']} duel_us={error['duel_us']}"
+        )
+        if args.max_win_rate_mae > 0 and error["win_rate_mae"] > args.max_win_rate_mae:
+            raise SystemExit(
+                f"[combat-surrogate] FAIL win_rate_mae={error['win_rate_mae']} > {args.max_win_rate_mae}"
+            )
+
+
+if __name__ == "__main__":
+    main()
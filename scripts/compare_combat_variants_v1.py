@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from simulate_minimal_combat_v1 import (
+    COMBAT_CONSTANTS_CSV,
+    DEFAULT_CONFIG,
+    MONSTERS_CSV,
+    OUT_DIR,
+    PROGRESSION_CSV,
+    SKILLS_CSV,
+    STAT_GROWTH_CSV,
+    TRIAL_CHUNKS_PER_JOB,
+    RunningStats,
+    build_monster_stats,
+    build_player_stats,
+    combat_constants_by_key,
+    get_progression_row,
+    pick_monsters,
+    pick_skills,
+    read_csv_rows,
+    resolve_jobs,
+    run_trial_chunk,
+    stat_rows_by_id,
+    to_fixed,
+)
+
+OUT_AB_REPORT_JSON = OUT_DIR / "combat_ab_compare_v1.json"
+RNG_MODES = ("crn", "shared", "independent")
+MONSTER_OVERRIDE_FIELDS = ("hp_mult", "atk_mult", "def_mult", "speed_mult", "crit_rate", "evasion")
+# Variant B trial offset in independent mode; far past any realistic --trials.
+INDEPENDENT_TRIAL_OFFSET = 1 << 20
+# (name, index in run_trial_chunk rows)
+PAIRED_METRICS = (("win", 0), ("elapsed_sec", 2), ("player_hp_left", 3))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Paired A/B comparison of two skill loadouts or monster tunings on common random numbers."
+    )
+    parser.add_argument("--difficulty-index", type=int, default=DEFAULT_CONFIG["difficulty_index"])
+    parser.add_argument("--player-level", type=int, default=DEFAULT_CONFIG["player_level"])
+    parser.add_argument("--rebirth-count", type=int, default=DEFAULT_CONFIG["rebirth_count"])
+    parser.add_argument("--seed", type=int, default=DEFAULT_CONFIG["seed"])
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_CONFIG["max_turns"])
+    parser.add_argument("--skill-id", action="append", dest="skill_ids", help="variant A skills (repeatable)")
+    parser.add_argument("--monster-id", action="append", dest="monster_ids", help="repeatable")
+    parser.add_argument(
+        "--b-skill-id",
+        action="append",
+        dest="b_skill_ids",
+        help="variant B skills (repeatable, default = variant A skills)",
+    )
+    parser.add_argument(
+        "--b-monster-set",
+        action="append",
+        dest="b_monster_sets",
+        default=[],
+        help=f"variant B monster override FIELD=VALUE, FIELD in {','.join(MONSTER_OVERRIDE_FIELDS)} (repeatable)",
+    )
+    parser.add_argument("--trials", type=int, default=2000, help="paired duels per monster")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes (0 = os.cpu_count())")
+    parser.add_argument(
+        "--rng-mode",
+        choices=RNG_MODES,
+        default="crn",
+        help="crn = per-decision streams, shared = same seed on one stream, independent = unpaired seeds",
+    )
+    parser.add_argument("--out", type=Path, default=OUT_AB_REPORT_JSON)
+    return parser.parse_args()
+
+
+def parse_monster_overrides(raw_sets: list[str]) -> dict[str, str]:
+    overrides: dict[str, str] = {}
+    for raw in raw_sets:
+        field, sep, value = raw.partition("=")
+        field = field.strip()
+        if not sep or field not in MONSTER_OVERRIDE_FIELDS:
+            raise SystemExit(
+                f"invalid --b-monster-set: {raw} (expected FIELD=VALUE, FIELD in {MONSTER_OVERRIDE_FIELDS})"
+            )
+        try:
+            float(value)
+        except ValueError:
+            raise SystemExit(f"invalid --b-monster-set value: {raw}") from None
+        overrides[field] = value.strip()
+    return overrides
+
+
+def paired_delta(a_values: list[float], b_values: list[float]) -> dict[str, float]:
+    """Mean of B - A with its paired standard error and the unpaired SE for the same n.
+
+    trial_reduction is (unpaired SE / paired SE)^2: how many times more
+    independent-seed trials would be needed for the same precision.
+    """
+    a_stats = RunningStats()
+    b_stats = RunningStats()
+    delta_stats = RunningStats()
+    for a, b in zip(a_values, b_values):
+        a_stats.add(a)
+        b_stats.add(b)
+        delta_stats.add(b - a)
+    n = max(1, delta_stats.count)
+    paired_se = math.sqrt(delta_stats.variance / n)
+    unpaired_se = math.sqrt((a_stats.variance + b_stats.variance) / n)
+    return {
+        "a_mean": to_fixed(a_stats.mean, 6),
+        "b_mean": to_fixed(b_stats.mean, 6),
+        "delta": to_fixed(delta_stats.mean, 6),
+        "paired_se": to_fixed(paired_se, 6),
+        "unpaired_se": to_fixed(unpaired_se, 6),
+        "z": to_fixed(delta_stats.mean / paired_se, 3) if paired_se > 0 else None,
+        "trial_reduction": to_fixed((unpaired_se / paired_se) ** 2, 2) if paired_se > 0 else None,
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    config = {
+        "difficulty_index": max(1, args.difficulty_index),
+        "player_level": max(1, args.player_level),
+        "rebirth_count": max(0, args.rebirth_count),
+        "seed": args.seed,
+        "max_turns": max(10, args.max_turns),
+        "skill_ids": args.skill_ids if args.skill_ids else list(DEFAULT_CONFIG["skill_ids"]),
+        "monster_ids": args.monster_ids if args.monster_ids else list(DEFAULT_CONFIG["monster_ids"]),
+    }
+    b_skill_ids = args.b_skill_ids if args.b_skill_ids else config["skill_ids"]
+    overrides = parse_monster_overrides(args.b_monster_sets)
+    if b_skill_ids == config["skill_ids"] and not overrides:
+        raise SystemExit("variant B is identical to A: pass --b-skill-id and/or --b-monster-set")
+
+    progression = get_progression_row(read_csv_rows(PROGRESSION_CSV), config["difficulty_index"])
+    stat_rows = stat_rows_by_id(read_csv_rows(STAT_GROWTH_CSV))
+    constants = combat_constants_by_key(read_csv_rows(COMBAT_CONSTANTS_CSV))
+    skill_rows = read_csv_rows(SKILLS_CSV)
+    player_stats = build_player_stats(stat_rows, progression, config, constants)
+    a_skills = pick_skills(skill_rows, config)
+    b_skills = pick_skills(skill_rows, {**config, "skill_ids": b_skill_ids})
+    monsters = pick_monsters(read_csv_rows(MONSTERS_CSV), config)
+
+    trials = max(2, args.trials)
+    jobs = resolve_jobs(args.jobs)
+    chunk_size = max(1, math.ceil(trials / (jobs * TRIAL_CHUNKS_PER_JOB)))
+    tasks: list[dict[str, Any]] = []
+    for idx, monster in enumerate(monsters):
+        b_monster = {**monster, **overrides}
+        variants = (
+            ("a", monster, a_skills, 0),
+            ("b", b_monster, b_skills, INDEPENDENT_TRIAL_OFFSET if args.rng_mode == "independent" else 0),
+        )
+        for variant, monster_row, skills, trial_offset in variants:
+            monster_stats = build_monster_stats(player_stats, monster_row, constants)
+            for start in range(0, trials, chunk_size):
+                tasks.append(
+                    {
+                        "variant": variant,
+                        "player_stats": player_stats,
+                        "monster_row": monster_row,
+                        "monster_stats": monster_stats,
+                        "skills": skills,
+                        "constants": constants,
+                        "base_seed": config["seed"],
+                        "monster_index": idx,
+                        "trial_start": trial_offset + start,
+                        "trial_end": trial_offset + min(trials, start + chunk_size),
+                        "max_turns": config["max_turns"],
+                        "engine": "scalar",
+                        "common_random_numbers": args.rng_mode == "crn",
+                    }
+                )
+
+    if jobs == 1:
+        chunk_results = [run_trial_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            chunk_results = list(executor.map(run_trial_chunk, tasks))
+
+    per_monster: list[dict[str, list[tuple[bool, int, float, float, float]]]] = [
+        {"a": [], "b": []} for _ in monsters
+    ]
+    for task, rows in zip(tasks, chunk_results):
+        per_monster[task["monster_index"]][task["variant"]].extend(rows)
+
+    comparisons = []
+    for monster, results in zip(monsters, per_monster):
+        entry: dict[str, Any] = {"monster_id": monster["monster_id"], "trials": trials}
+        for metric, column in PAIRED_METRICS:
+            entry[metric] = paired_delta(
+                [float(row[column]) for row in results["a"]],
+                [float(row[column]) for row in results["b"]],
+            )
+        comparisons.append(entry)
+
+    report = {
+        "config": {
+            **config,
+            "b_skill_ids": b_skill_ids,
+            "b_monster_overrides": overrides,
+            "trials": trials,
+            "rng_mode": args.rng_mode,
+        },
+        "comparisons": comparisons,
+    }
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print(f"wrote combat A/B report -> {args.out}")
+    for entry in comparisons:
+        win = entry["win"]
+        ttk = entry["elapsed_sec"]
+        print(
+            f"[combat-ab] {entry['monster_id']} rng={args.rng_mode} "
+            f"win_delta={win['delta']} se={win['paired_se']} reduction={win['trial_reduction']} "
+            f"elapsed_delta={ttk['delta']} se={ttk['paired_se']} reduction={ttk['trial_reduction']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
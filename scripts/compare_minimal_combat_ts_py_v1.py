@@ -9,6 +9,16 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from simulate_minimal_combat_v1 import (
+    OUT_ACTION_LOG_CSV,
+    OUT_SUMMARY_CSV,
+    CombatEngine,
+    CombatTables,
+    write_action_log_csv,
+    write_report_json,
+    write_summary_csv,
+)
+
 ROOT = Path(__file__).resolve().parent.parent
 TS_DUMP_SCRIPT = ROOT / "scripts/dump_minimal_combat_ts_v1.ts"
 PY_DUMP_SCRIPT = ROOT / "scripts/simulate_minimal_combat_v1.py"
@@ -71,6 +81,12 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--scenario-file", type=Path)
     parser.add_argument("--ts-report", type=Path, default=DEFAULT_TS_REPORT)
     parser.add_argument("--py-report", type=Path, default=DEFAULT_PY_REPORT)
+    parser.add_argument(
+        "--py-subprocess",
+        action="store_true",
+        help="run the Python dump as a subprocess and read --py-report instead of calling CombatEngine in-process "
+        "(the in-process report is still written to --py-report)",
+    )
     parser.add_argument("--max-win-rate-delta", type=float, default=0.000001)
     parser.add_argument("--max-turn-delta", type=float, default=0.0)
     parser.add_argument("--max-elapsed-delta", type=float, default=0.0005)
@@ -408,10 +424,24 @@ def print_delta_summary(
         )
 
 
+def scenario_config(scenario: CompareScenario) -> dict[str, Any]:
+    return {
+        "difficulty_index": scenario.difficulty_index,
+        "player_level": scenario.player_level,
+        "rebirth_count": scenario.rebirth_count,
+        "seed": scenario.seed,
+        "max_turns": scenario.max_turns,
+        "skill_ids": list(scenario.skill_ids),
+        "monster_ids": list(scenario.monster_ids),
+        "include_action_logs": scenario.include_action_log,
+    }
+
+
 def run_single_scenario(
     args: argparse.Namespace,
     scenario: CompareScenario,
     ts_report_path: Path,
+    engine: CombatEngine | None,
 ) -> tuple[ReportNorm, ReportNorm]:
     common_args = build_common_args(scenario)
     ts_report_path.parent.mkdir(parents=True, exist_ok=True)
@@ -424,12 +454,18 @@ def run_single_scenario(
         str(ts_report_path),
         *common_args,
     ]
-    py_cmd = [str(PY_DUMP_SCRIPT), *common_args]
-
     run_or_raise(ts_cmd)
-    run_or_raise(py_cmd)
-
-    py_raw = read_json(args.py_report)
+    if engine is None:
+        run_or_raise([str(PY_DUMP_SCRIPT), *common_args])
+        py_raw = read_json(args.py_report)
+    else:
+        py_result = engine.run(scenario_config(scenario))
+        py_raw = py_result.to_dict()
+        # Same files the dump script writes, so CI artifacts keep the PY side when parity fails.
+        args.py_report.parent.mkdir(parents=True, exist_ok=True)
+        write_report_json(py_raw, args.py_report)
+        write_summary_csv(py_result.duels, OUT_SUMMARY_CSV)
+        write_action_log_csv(py_result.duels, OUT_ACTION_LOG_CSV)
     ts_raw = read_json(ts_report_path)
     py_report = norm_report(py_raw)
     ts_report = norm_report(ts_raw)
@@ -449,6 +485,7 @@ def main() -> None:
 
     all_errors: list[str] = []
     suite_mode = len(scenarios) > 1
+    engine = None if args.py_subprocess else CombatEngine(CombatTables.load())
 
     for idx, scenario in enumerate(scenarios, start=1):
         if suite_mode:
@@ -461,7 +498,7 @@ def main() -> None:
             print(f"[combat-diff] running scenario: {scenario.name}")
             ts_report_path = args.ts_report
 
-        py_report, ts_report = run_single_scenario(args, scenario, ts_report_path)
+        py_report, ts_report = run_single_scenario(args, scenario, ts_report_path, engine)
         print_delta_summary(py_report, ts_report, scenario.name)
 
         errors = diff_reports(py_report, ts_report, args)
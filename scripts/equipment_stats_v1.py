@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from simulate_combat_matrix_v1 import auto_player_level
+from simulate_minimal_combat_v1 import (
+    OUT_DIR,
+    PLAYER_STAT_IDS,
+    CombatTables,
+    build_monster_stats,
+    build_player_stats,
+    calc_element_multiplier,
+    calc_player_stat,
+    expected_damage,
+    get_progression_row,
+    normalize_element,
+    player_stat_bounds,
+    read_csv_rows,
+    to_fixed,
+    to_float,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+EQUIPMENT_BASES_CSV = ROOT / "data/equipment/equipment_bases_v1.csv"
+EQUIPMENT_AFFIXES_CSV = ROOT / "data/equipment/equipment_affixes_v1.csv"
+OUT_LOADOUT_REPORT_JSON = OUT_DIR / "equipment_loadout_report_v1.json"
+
+EQUIPMENT_SLOTS = ("weapon", "armor", "accessory", "relic")
+STAT_INDEX = {stat_id: k for k, stat_id in enumerate(PLAYER_STAT_IDS)}
+BASE_STAT_COLUMNS = {
+    "base_hp": "hp",
+    "base_mp": "mp",
+    "base_atk": "atk",
+    "base_def": "def",
+    "base_speed": "speed",
+}
+# affix stat_key -> (stat_id, unit): *_flat_pct rolls are percentage points of a ratio stat.
+AFFIX_STAT_KEYS = {
+    "hp_flat": ("hp", 1.0),
+    "mp_flat": ("mp", 1.0),
+    "atk_flat": ("atk", 1.0),
+    "def_flat": ("def", 1.0),
+    "speed_flat_pct": ("speed", 0.01),
+    "accuracy_flat_pct": ("accuracy", 0.01),
+    "evasion_flat_pct": ("evasion", 0.01),
+    "crit_rate_flat_pct": ("crit_rate", 0.01),
+    "penetration_flat_pct": ("penetration", 0.01),
+    "damage_reduction_flat_pct": ("damage_reduction", 0.01),
+}
+# Non-combat affixes compile to a zero vector; they never change a duel.
+NON_COMBAT_AFFIX_STAT_KEYS = {
+    "tribulation_resist_flat_pct",
+    "mind_resist_flat_pct",
+    "drop_rate_mul_pct",
+    "rebirth_essence_gain_mul_pct",
+}
+ZERO_VECTOR = tuple(0.0 for _ in PLAYER_STAT_IDS)
+# Candidate for a slot with no unlocked base yet: nothing equipped.
+EMPTY_SLOT_ITEM: tuple[str | None, list[tuple[str, float]], tuple[float, ...]] = (None, [], ZERO_VECTOR)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compile equipment into stat vectors and score every gear loadout for one matchup."
+    )
+    parser.add_argument("--difficulty-index", type=int, default=60)
+    parser.add_argument(
+        "--player-level",
+        type=int,
+        default=0,
+        help="fixed level; 0 = floor(8 + difficulty_index * 0.55) clamped to 1..120 (auto-progress rule)",
+    )
+    parser.add_argument("--rebirth-count", type=int, default=0)
+    parser.add_argument("--monster-id", default="", help="target monster (default: first monster of the world)")
+    parser.add_argument("--roll", type=float, default=0.5, help="affix roll position in roll_min..roll_max (0..1)")
+    parser.add_argument("--bases-per-slot", type=int, default=2, help="newest unlocked bases kept per slot")
+    parser.add_argument("--max-loadouts", type=int, default=500000, help="sample down to this many loadouts")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=20260223)
+    parser.add_argument(
+        "--check",
+        type=int,
+        default=2000,
+        help="compare N random loadouts against build_player_stats(equipment_stats=...) (0 = skip)",
+    )
+    parser.add_argument("--out-report", type=Path, default=OUT_LOADOUT_REPORT_JSON)
+    return parser.parse_args()
+
+
+def unlock_difficulty(row: dict[str, str]) -> int:
+    condition = row.get("unlock_condition", "")
+    if not condition.startswith("difficulty>="):
+        return 1
+    return int(to_float(condition.split(">=", 1)[1], 1))
+
+
+def stat_vector(pairs: list[tuple[str, float]]) -> tuple[float, ...]:
+    vector = list(ZERO_VECTOR)
+    for stat_id, value in pairs:
+        vector[STAT_INDEX[stat_id]] += value
+    return tuple(vector)
+
+
+def add_vectors(vectors: list[tuple[float, ...]]) -> tuple[float, ...]:
+    total = ZERO_VECTOR
+    for vector in vectors:
+        total = tuple(a + b for a, b in zip(total, vector))
+    return total
+
+
+@dataclass(frozen=True)
+class EquipmentBase:
+    base_id: str
+    slot: str
+    world: str
+    unlock_difficulty: int
+    vector: tuple[float, ...]
+
+
+@dataclass(frozen=True)
+class EquipmentAffix:
+    affix_id: str
+    affix_type: str
+    stat_key: str
+    target_slots: tuple[str, ...]
+    exclusive_group: str
+    unlock_difficulty: int
+    # roll(q) = low + q * span, q in 0..1 between roll_min and roll_max.
+    low: tuple[float, ...]
+    span: tuple[float, ...]
+
+    def roll(self, q: float) -> tuple[float, ...]:
+        return tuple(lo + q * sp for lo, sp in zip(self.low, self.span))
+
+
+def compile_equipment_base(row: dict[str, str]) -> EquipmentBase:
+    return EquipmentBase(
+        base_id=row["base_id"],
+        slot=row["slot"],
+        world=row["world"],
+        unlock_difficulty=unlock_difficulty(row),
+        vector=stat_vector([(stat_id, to_float(row[column])) for column, stat_id in BASE_STAT_COLUMNS.items()]),
+    )
+
+
+def compile_equipment_affix(row: dict[str, str]) -> EquipmentAffix:
+    stat_key = row["stat_key"]
+    roll_min = to_float(row["roll_min"])
+    roll_max = to_float(row["roll_max"])
+    if stat_key in NON_COMBAT_AFFIX_STAT_KEYS:
+        low = span = ZERO_VECTOR
+    elif stat_key in AFFIX_STAT_KEYS:
+        stat_id, unit = AFFIX_STAT_KEYS[stat_key]
+        low = stat_vector([(stat_id, roll_min * unit)])
+        span = stat_vector([(stat_id, (roll_max - roll_min) * unit)])
+    else:
+        raise SystemExit(f"unknown affix stat_key: {row['affix_id']} -> {stat_key}")
+    return EquipmentAffix(
+        affix_id=row["affix_id"],
+        affix_type=row["affix_type"],
+        stat_key=stat_key,
+        target_slots=tuple(slot for slot in row["target_slots"].split(";") if slot),
+        exclusive_group=row["exclusive_group"],
+        unlock_difficulty=unlock_difficulty(row),
+        low=low,
+        span=span,
+    )
+
+
+@dataclass
+class EquipmentTables:
+    """Equipment bases and affixes compiled once into PLAYER_STAT_IDS-ordered vectors."""
+
+    bases: dict[str, EquipmentBase]
+    affixes: dict[str, EquipmentAffix]
+
+    @classmethod
+    def load(cls) -> "EquipmentTables":
+        bases = [compile_equipment_base(row) for row in read_csv_rows(EQUIPMENT_BASES_CSV)]
+        affixes = [compile_equipment_affix(row) for row in read_csv_rows(EQUIPMENT_AFFIXES_CSV)]
+        return cls({b.base_id: b for b in bases}, {a.affix_id: a for a in affixes})
+
+    def item_vector(self, base_id: str, affix_rolls: list[tuple[str, float]]) -> tuple[float, ...]:
+        """One item: base vector plus each (affix_id, roll position) it carries."""
+        base = self.bases[base_id]
+        vectors = [base.vector]
+        for affix_id, q in affix_rolls:
+            affix = self.affixes[affix_id]
+            if base.slot not in affix.target_slots:
+                raise SystemExit(f"affix {affix_id} cannot roll on {base.slot} ({base_id})")
+            vectors.append(affix.roll(q))
+        return add_vectors(vectors)
+
+
+def equipment_stats_dict(vector: tuple[float, ...]) -> dict[str, float]:
+    return dict(zip(PLAYER_STAT_IDS, vector))
+
+
+class LoadoutScorer:
+    """build_player_stats with gear for one (progression row, level, rebirth), as a vector op.
+
+    The uncapped pre-rebirth vector, equipment_scale_pct, the rebirth
+    multiplier and the soft/hard caps are resolved once, so scoring a loadout is one pass over PLAYER_STAT_IDS
+    (score) or a few array ops over many loadouts (score_many). Both keep
+    build_player_stats' operation order and match it bit for bit.
+    """
+
+    def __init__(
+        self,
+        stat_rows: dict[str, dict[str, str]],
+        progression: dict[str, str],
+        config: dict[str, Any],
+        constants: dict[str, float],
+    ):
+        major_idx = int(progression["major_stage_index"])
+        sub_idx = int(progression["sub_stage_index"])
+        bounds = player_stat_bounds(constants)
+        rebirth_count = max(0, config["rebirth_count"])
+        base = []
+        params = []
+        for stat_id in PLAYER_STAT_IDS:
+            row = stat_rows[stat_id]
+            # No caps and no rebirth on this call (hard_cap < 0 is the uncapped branch of
+            # apply_soft_hard_cap): gear is added to this value before the rebirth multiplier.
+            uncapped = {**row, "hard_cap": "-1"}
+            base.append(calc_player_stat({stat_id: uncapped}, stat_id, config["player_level"], major_idx, sub_idx, 0))
+            lo, hi = bounds[stat_id]
+            params.append(
+                (
+                    to_float(row["equipment_scale_pct"], 1.0),
+                    1 + rebirth_count * to_float(row["rebirth_scale_pct"]) * 0.01,
+                    to_float(row["hard_cap"], -1),
+                    to_float(row["soft_cap_start"], -1),
+                    to_float(row["soft_cap_slope"], -1),
+                    lo,
+                    hi,
+                )
+            )
+        self.base = tuple(base)
+        self.params = tuple(params)
+
+    def score(self, vector: tuple[float, ...]) -> tuple[float, ...]:
+        out = []
+        for value, bonus, (scale, rebirth, hard_cap, soft_start, soft_slope, lo, hi) in zip(
+            self.base, vector, self.params
+        ):
+            if bonus:
+                value += bonus * scale
+            value = value * rebirth
+            if hard_cap >= 0:
+                if soft_start >= 0 and soft_slope > 0 and value > soft_start:
+                    value = soft_start + (value - soft_start) * soft_slope
+                value = min(value, hard_cap)
+            out.append(max(lo, min(hi, value)))
+        return tuple(out)
+
+    def score_many(self, vectors: np.ndarray) -> np.ndarray:
+        """vectors[n, k] gear totals -> final stats[n, k]."""
+        stats = np.empty(vectors.shape, dtype=np.float64)
+        for k, (base, (scale, rebirth, hard_cap, soft_start, soft_slope, lo, hi)) in enumerate(
+            zip(self.base, self.params)
+        ):
+            bonus = vectors[:, k]
+            value = np.where(bonus != 0, base + bonus * scale, base) * rebirth
+            if hard_cap >= 0:
+                if soft_start >= 0 and soft_slope > 0:
+                    value = np.where(value > soft_start, soft_start + (value - soft_start) * soft_slope, value)
+                value = np.minimum(value, hard_cap)
+            stats[:, k] = np.maximum(lo, np.minimum(hi, value))
+        return stats
+
+
+def expected_basic_dps_many(
+    stats: np.ndarray,
+    monster_stats: dict[str, float],
+    monster_element: str,
+    constants: dict[str, float],
+) -> np.ndarray:
+    """expected_damage(coeff=1, element none) * speed for every row of stats."""
+    col = STAT_INDEX
+    hit_chance = np.clip(
+        stats[:, col["accuracy"]] - monster_stats["evasion"] + 0.75,
+        constants.get("accuracy_floor", 0.55),
+        constants.get("accuracy_ceiling", 0.98),
+    )
+    crit_rate = np.clip(stats[:, col["crit_rate"]], 0.0, constants.get("crit_rate_cap", 0.75))
+    def_after_pen = np.maximum(0.0, monster_stats["def"] * (1 - stats[:, col["penetration"]]))
+    def_ratio = def_after_pen / (def_after_pen + constants.get("defense_constant_k", 180))
+
+    damage = stats[:, col["atk"]] * 1.0 * 1.0
+    damage = damage * (1 - def_ratio)
+    damage = damage * (1 - monster_stats["damage_reduction"])
+    damage = damage * calc_element_multiplier("none", monster_element, constants)
+    damage = damage * (1 + crit_rate * stats[:, col["crit_damage"]])
+    return hit_chance * damage * np.maximum(0.2, stats[:, col["speed"]])
+
+
+def slot_candidates(
+    equipment: EquipmentTables,
+    slot: str,
+    difficulty_index: int,
+    roll: float,
+    bases_per_slot: int,
+) -> list[tuple[str | None, list[tuple[str, float]], tuple[float, ...]]]:
+    """(base_id, affix rolls, vector) items for one slot: base x (no/one prefix) x (no/one suffix).
+
+    Affixes keep the newest unlocked tier per exclusive_group, since a higher
+    tier rolls strictly more of the same stat at the same roll position. A
+    slot with no unlocked base has the single EMPTY_SLOT_ITEM.
+    """
+    bases = sorted(
+        (b for b in equipment.bases.values() if b.slot == slot and b.unlock_difficulty <= difficulty_index),
+        key=lambda b: b.unlock_difficulty,
+    )[-max(1, bases_per_slot):]
+    if not bases:
+        return [EMPTY_SLOT_ITEM]
+    newest: dict[str, EquipmentAffix] = {}
+    for affix in equipment.affixes.values():
+        if (
+            slot in affix.target_slots
+            and affix.unlock_difficulty <= difficulty_index
+            and affix.stat_key not in NON_COMBAT_AFFIX_STAT_KEYS
+        ):
+            seen = newest.get(affix.exclusive_group)
+            if seen is None or affix.unlock_difficulty > seen.unlock_difficulty:
+                newest[affix.exclusive_group] = affix
+    prefixes = [None] + [a for a in newest.values() if a.affix_type == "prefix"]
+    suffixes = [None] + [a for a in newest.values() if a.affix_type == "suffix"]
+
+    items = []
+    for base in bases:
+        for prefix in prefixes:
+            for suffix in suffixes:
+                rolls = [(a.affix_id, roll) for a in (prefix, suffix) if a is not None]
+                items.append((base.base_id, rolls, equipment.item_vector(base.base_id, rolls)))
+    return items
+
+
+def loadout_count(per_slot: list[list[Any]]) -> int:
+    count = 1
+    for items in per_slot:
+        count *= len(items)
+    return count
+
+
+def loadout_vectors(
+    per_slot: list[list[tuple[str | None, list[tuple[str, float]], tuple[float, ...]]]],
+    index: np.ndarray,
+) -> np.ndarray:
+    """Gear totals for the loadouts at flat `index` (one item per slot, mixed radix) -> array[n, k].
+
+    Items are summed in slot order, so only the selected rows are materialized.
+    """
+    total = np.zeros((len(index), len(PLAYER_STAT_IDS)), dtype=np.float64)
+    rest = index.copy()
+    digits = []
+    for items in reversed(per_slot):
+        rest, digit = np.divmod(rest, len(items))
+        digits.append(digit)
+    for items, digit in zip(per_slot, reversed(digits)):
+        vectors = np.array([vector for _, _, vector in items], dtype=np.float64)
+        total += vectors[digit]
+    return total
+
+
+def loadout_items(per_slot: list[list[Any]], flat_index: int) -> list[Any]:
+    picked = []
+    for items in reversed(per_slot):
+        flat_index, i = divmod(flat_index, len(items))
+        picked.append(items[i])
+    return picked[::-1]
+
+
+def main() -> None:
+    args = parse_args()
+    tables = CombatTables.load()
+    constants = tables.constants
+    equipment = EquipmentTables.load()
+
+    progression = get_progression_row(tables.progression_rows, args.difficulty_index)
+    player_level = args.player_level if args.player_level > 0 else auto_player_level(args.difficulty_index)
+    config = {"player_level": player_level, "rebirth_count": max(0, args.rebirth_count)}
+    if not 0.0 <= args.roll <= 1.0:
+        raise SystemExit("--roll must be within 0..1")
+
+    monsters = {row["monster_id"]: row for row in tables.monster_rows}
+    monster_id = args.monster_id or next(
+        row["monster_id"] for row in tables.monster_rows if row["world"] == progression["world"]
+    )
+    if monster_id not in monsters:
+        raise SystemExit(f"unknown monster_id: {monster_id}")
+    monster = monsters[monster_id]
+    monster_element = normalize_element(monster["element"])
+    # Monsters scale off the gearless player; gear must not make the enemy stronger.
+    gearless = build_player_stats(tables.stat_rows, progression, config, constants)
+    monster_stats = build_monster_stats(gearless, monster, constants)
+
+    started = time.perf_counter()
+    scorer = LoadoutScorer(tables.stat_rows, progression, config, constants)
+    per_slot = [
+        slot_candidates(equipment, slot, args.difficulty_index, args.roll, args.bases_per_slot)
+        for slot in EQUIPMENT_SLOTS
+    ]
+    total_loadouts = loadout_count(per_slot)
+    index = np.arange(total_loadouts, dtype=np.int64)
+    if total_loadouts > args.max_loadouts > 0:
+        index = np.sort(np.random.default_rng(args.seed).choice(total_loadouts, args.max_loadouts, replace=False))
+    vectors = loadout_vectors(per_slot, index)
+    compile_sec = time.perf_counter() - started
+
+    started = time.perf_counter()
+    stats = scorer.score_many(vectors)
+    dps = expected_basic_dps_many(stats, monster_stats, monster_element, constants)
+    batch_sec = time.perf_counter() - started
+
+    scalar_samples = min(len(vectors), 20000)
+    scalar_rows = [tuple(row) for row in vectors[:scalar_samples].tolist()]
+    started = time.perf_counter()
+    for row in scalar_rows:
+        scorer.score(row)
+    scalar_sec = time.perf_counter() - started
+
+    checked = 0
+    mismatches = 0
+    if args.check > 0:
+        sample = random.Random(args.seed).sample(range(len(vectors)), min(args.check, len(vectors)))
+        for i in sample:
+            row = tuple(vectors[i].tolist())
+            expected = build_player_stats(
+                tables.stat_rows, progression, config, constants, equipment_stats_dict(row)
+            )
+            got_scalar = equipment_stats_dict(scorer.score(row))
+            got_batch = equipment_stats_dict(tuple(stats[i].tolist()))
+            _, damage = expected_damage(expected, monster_stats, monster_element, 1.0, "none", constants)
+            dps_close = abs(damage * max(0.2, expected["speed"]) - dps[i]) <= 1e-9 * max(1.0, dps[i])
+            if got_scalar != expected or got_batch != expected or not dps_close:
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"  - loadout #{int(index[i])}: scalar={got_scalar} batch={got_batch} expected={expected}")
+            checked += 1
+        # Empty-slot case: an all-empty loadout must score exactly as the gearless player.
+        empty_scalar = equipment_stats_dict(scorer.score(ZERO_VECTOR))
+        empty_batch = equipment_stats_dict(tuple(scorer.score_many(np.zeros((1, len(PLAYER_STAT_IDS))))[0].tolist()))
+        if empty_scalar != gearless or empty_batch != gearless:
+            mismatches += 1
+            print(f"  - empty loadout: scalar={empty_scalar} batch={empty_batch} expected={gearless}")
+        checked += 1
+
+    _, gearless_damage = expected_damage(gearless, monster_stats, monster_element, 1.0, "none", constants)
+    gearless_dps = gearless_damage * max(0.2, gearless["speed"])
+    top = []
+    for i in np.argsort(-dps, kind="stable")[: max(0, args.top)]:
+        items = loadout_items(per_slot, int(index[i]))
+        top.append(
+            {
+                "dps": to_fixed(float(dps[i]), 3),
+                "dps_gain_pct": to_fixed((float(dps[i]) / gearless_dps - 1) * 100, 3),
+                "items": {
+                    slot: {"base_id": base_id, "affixes": [affix_id for affix_id, _ in rolls]}
+                    for slot, (base_id, rolls, _) in zip(EQUIPMENT_SLOTS, items)
+                },
+                "stats": {k: to_fixed(v, 4) for k, v in zip(PLAYER_STAT_IDS, stats[i].tolist())},
+            }
+        )
+
+    report = {
+        "config": {
+            "difficulty_index": args.difficulty_index,
+            "world": progression["world"],
+            "player_level": player_level,
+            "rebirth_count": config["rebirth_count"],
+            "monster_id": monster_id,
+            "roll": args.roll,
+            "bases_per_slot": args.bases_per_slot,
+            "max_loadouts": args.max_loadouts,
+        },
+        "candidates_per_slot": {slot: len(items) for slot, items in zip(EQUIPMENT_SLOTS, per_slot)},
+        "total_loadouts": total_loadouts,
+        "loadouts": int(len(vectors)),
+        "compile_sec": to_fixed(compile_sec, 4),
+        "batch_us_per_loadout": to_fixed(batch_sec / max(1, len(vectors)) * 1e6, 4),
+        "scalar_us_per_loadout": to_fixed(scalar_sec / max(1, scalar_samples) * 1e6, 4),
+        "checked": checked,
+        "mismatches": mismatches,
+        "gearless_dps": to_fixed(gearless_dps, 3),
+        "top_loadouts": top,
+    }
+    args.out_report.parent.mkdir(parents=True, exist_ok=True)
+    args.out_report.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print(f"wrote equipment loadout report -> {args.out_report}")
+    print(
+        f"[equipment-loadout] difficulty={args.difficulty_index} monster={monster_id} loadouts={len(vectors)} "
+        f"batch_us={report['batch_us_per_loadout']} scalar_us={report['scalar_us_per_loadout']} "
+        f"best_dps_gain_pct={top[0]['dps_gain_pct'] if top else 0.0}"
+    )
+    if mismatches:
+        raise SystemExit(f"[equipment-loadout] FAIL mismatches={mismatches}/{checked} against build_player_stats")
+    if checked:
+        print(f"[equipment-loadout] PASS checked={checked} loadouts against build_player_stats")
+
+
+if __name__ == "__main__":
+    main()
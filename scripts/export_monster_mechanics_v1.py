@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from simulate_minimal_combat_v1 import monster_mechanic_rows
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT = ROOT / "data/export/monster_mechanics_v1.json"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Export compiled monster special_mechanic records for the TS combat loop."
+    )
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="do not write; fail when --output differs from the compiled MONSTER_MECHANIC_RULES",
+    )
+    return parser.parse_args()
+
+
+def render_monster_mechanics() -> str:
+    # Same layout as generate_balance_tables.write_json, so both writers produce identical bytes.
+    return json.dumps(monster_mechanic_rows(), ensure_ascii=False, indent=2)
+
+
+def write_monster_mechanics(path: Path) -> int:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(render_monster_mechanics(), encoding="utf-8")
+    return len(monster_mechanic_rows())
+
+
+def main() -> None:
+    args = parse_args()
+    output_path = args.output.resolve()
+    if args.check:
+        current = output_path.read_text(encoding="utf-8") if output_path.exists() else None
+        if current != render_monster_mechanics():
+            raise SystemExit(
+                f"[monster-mechanics] FAIL {output_path} is missing or stale; "
+                "run `npm run combat:mechanics:export` and commit the result"
+            )
+        print(f"[monster-mechanics] OK {output_path} matches MONSTER_MECHANIC_RULES")
+        return
+    count = write_monster_mechanics(output_path)
+    print(f"wrote monster mechanics json -> {output_path} ({count} rows)")
+
+
+if __name__ == "__main__":
+    main()
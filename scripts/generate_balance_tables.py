@@ -5,6 +5,8 @@ import json
 from datetime import datetime, timezone
 from pathlib import Path
 
+from export_monster_mechanics_v1 import write_monster_mechanics
+
 ROOT = Path(__file__).resolve().parent.parent
 PROGRESSION_OUT = ROOT / "data/progression/realm_progression_v1.csv"
 LOCALE_OUT = ROOT / "data/progression/realm_locale_ko_v1.csv"
@@ -38,6 +40,7 @@ EQUIPMENT_AFFIX_POOLS_OUT = ROOT / "data/equipment/equipment_affix_pools_v1.csv"
 EQUIPMENT_DROP_LINKS_OUT = ROOT / "data/equipment/equipment_drop_links_v1.csv"
 EXPORT_DIR = ROOT / "data/export"
 EXPORT_MANIFEST_OUT = EXPORT_DIR / "balance_manifest_v1.json"
+MONSTER_MECHANICS_EXPORT_OUT = EXPORT_DIR / "monster_mechanics_v1.json"
 
 
 def clamp(val, lo, hi):
@@ -530,6 +533,9 @@ def main(economy_profile: str) -> None:
     equipment_drop_link_rows = read_csv_rows(EQUIPMENT_DROP_LINKS_OUT)
     write_json(EXPORT_DIR / "equipment_drop_links_v1.json", equipment_drop_link_rows)
 
+    # balanceLoader.ts requires this export; the records come from MONSTER_MECHANIC_RULES, not a CSV.
+    monster_mechanic_count = write_monster_mechanics(MONSTER_MECHANICS_EXPORT_OUT)
+
     manifest = {
         "generator": "scripts/generate_balance_tables.py",
         "version": "v1",
@@ -578,6 +584,7 @@ def main(economy_profile: str) -> None:
     print(f"wrote {len(equipment_base_pool_rows)} equipment base-pool rows -> {EQUIPMENT_BASE_POOLS_OUT}")
     print(f"wrote {len(equipment_affix_pool_rows)} equipment affix-pool rows -> {EQUIPMENT_AFFIX_POOLS_OUT}")
     print(f"wrote {len(equipment_drop_link_rows)} equipment drop-link rows -> {EQUIPMENT_DROP_LINKS_OUT}")
+    print(f"wrote {monster_mechanic_count} monster mechanic records -> {MONSTER_MECHANICS_EXPORT_OUT}")
     print(f"wrote export manifest -> {EXPORT_MANIFEST_OUT}")
     print(f"wrote json exports -> {EXPORT_DIR}")
 
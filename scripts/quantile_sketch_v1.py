@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import math
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # add() only; add_many() needs numpy
+    np = None
+
+DEFAULT_RELATIVE_ACCURACY = 0.005
+# Values at or below this go to the zero bucket (log buckets cannot hold 0).
+ZERO_THRESHOLD = 1e-9
+
+
+class QuantileSketch:
+    """Log-bucketed quantile sketch for non-negative values (DDSketch layout).
+
+    Bucket k holds values in (gamma^(k-1), gamma^k] with
+    gamma = (1 + a) / (1 - a), so every quantile is returned within relative
+    error a of a true sample value. Memory grows with log(max / min), not
+    with the number of values. merge() adds bucket counts, which is exact,
+    associative and commutative: shards merged in any order or grouping give
+    the same sketch as one run over all values.
+    """
+
+    __slots__ = ("relative_accuracy", "gamma", "log_gamma", "bins", "zero_count", "count", "min", "max", "total")
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError(f"relative_accuracy must be in (0, 1), got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.bins: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.total = 0.0
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value < 0:
+            raise ValueError(f"QuantileSketch holds non-negative values, got {value}")
+        if value <= ZERO_THRESHOLD:
+            self.zero_count += count
+        else:
+            key = math.ceil(math.log(value) / self.log_gamma)
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.count += count
+        self.total += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def add_many(self, values) -> None:
+        """Vectorized add() of a 1-D array."""
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        if values.min() < 0:
+            raise ValueError("QuantileSketch holds non-negative values")
+        positive = values[values > ZERO_THRESHOLD]
+        self.zero_count += int(values.size - positive.size)
+        if positive.size:
+            keys = np.ceil(np.log(positive) / self.log_gamma).astype(np.int64)
+            low = int(keys.min())
+            counts = np.bincount(keys - low)
+            for offset in np.flatnonzero(counts):
+                key = low + int(offset)
+                self.bins[key] = self.bins.get(key, 0) + int(counts[offset])
+        self.count += int(values.size)
+        self.total += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError(
+                f"cannot merge sketches with relative_accuracy {self.relative_accuracy} and {other.relative_accuracy}"
+            )
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Value at rank q * (count - 1), 0 <= q <= 1."""
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                value = 2.0 * self.gamma**key / (self.gamma + 1.0)
+                return min(self.max, max(self.min, value))
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "count": self.count,
+            "zero_count": self.zero_count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "bins": {str(k): v for k, v in sorted(self.bins.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(float(data["relative_accuracy"]))
+        sketch.bins = {int(k): int(v) for k, v in data["bins"].items()}
+        sketch.zero_count = int(data["zero_count"])
+        sketch.count = int(data["count"])
+        sketch.total = float(data["total"])
+        if sketch.count:
+            sketch.min = float(data["min"])
+            sketch.max = float(data["max"])
+        return sketch
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import hashlib
+import random
+
+MASK64 = (1 << 64) - 1
+MASK32 = 0xFFFFFFFF
+
+
+def splitmix64(x: int) -> int:
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+def path_part(part: int | str) -> int:
+    """Map one path element to 64 bits; strings hash the same in every process."""
+    if isinstance(part, str):
+        return int.from_bytes(hashlib.sha1(part.encode("utf-8")).digest()[:8], "little")
+    return int(part) & MASK64
+
+
+def derive_seed(root: int, *path: int | str) -> int:
+    """64-bit seed of the node at path under root, e.g. (SEED, "progression", difficulty_index).
+
+    Each level is one splitmix64 round over (parent ^ part), so a node depends
+    only on its own path, never on how many siblings were derived before it.
+    """
+    h = splitmix64(root & MASK64)
+    for part in path:
+        h = splitmix64(h ^ path_part(part))
+    return h
+
+
+def derive_seed32(root: int, *path: int | str) -> int:
+    """derive_seed folded to 32 bits for SeededRng (xorshift32)."""
+    h = derive_seed(root, *path)
+    return (h ^ (h >> 32)) & MASK32
+
+
+class RngStream:
+    """A node of the seed tree: root seed plus path.
+
+    child() extends the path, so work units named by (scenario, stage, trial)
+    get the same generator on any worker and in any order. python_random()
+    seeds a Mersenne Twister from the full 64-bit seed; seed32() feeds the
+    combat SeededRng, whose single 2^32-1 cycle makes children distinct start
+    points rather than provably disjoint ranges (fine for duels of a few
+    hundred draws).
+    """
+
+    __slots__ = ("root", "path", "seed")
+
+    def __init__(self, root: int, path: tuple[int | str, ...] = ()):
+        self.root = root
+        self.path = tuple(path)
+        self.seed = derive_seed(root, *self.path)
+
+    def child(self, *parts: int | str) -> "RngStream":
+        return RngStream(self.root, self.path + parts)
+
+    def seed32(self) -> int:
+        return (self.seed ^ (self.seed >> 32)) & MASK32
+
+    def python_random(self) -> random.Random:
+        return random.Random(self.seed)
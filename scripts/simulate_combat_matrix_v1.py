@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import importlib.util
+import itertools
+import json
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from simulate_minimal_combat_v1 import (
+    COMBAT_CONSTANTS_CSV,
+    DEFAULT_CONFIG,
+    MONSTERS_CSV,
+    OUT_DIR,
+    PROGRESSION_CSV,
+    SEED_SCHEMES,
+    SKILLS_CSV,
+    STAT_GROWTH_CSV,
+    build_monster_stats,
+    build_player_stats,
+    combat_constants_by_key,
+    get_progression_row,
+    read_csv_rows,
+    resolve_jobs,
+    run_adaptive_trials,
+    run_trial_chunk,
+    skill_entry,
+    stat_rows_by_id,
+    to_fixed,
+    to_float,
+)
+
+OUT_MATRIX_CSV = OUT_DIR / "combat_matrix_v1.csv"
+OUT_MATRIX_REPORT_JSON = OUT_DIR / "combat_matrix_report_v1.json"
+MATRIX_CACHE_JSON = OUT_DIR / "combat_matrix_cache_v1.json"
+MATRIX_CACHE_VERSION = 3
+# Cell keys hash the cell inputs, not the code that turns them into duels.
+# Bump this when a change to the duel engines, their RNGs or the cell runner moves cell results.
+MATRIX_MODEL_VERSION = 1
+
+MATRIX_FIELDS = (
+    "difficulty_index",
+    "world",
+    "player_level",
+    "rebirth_count",
+    "monster_id",
+    "monster_type",
+    "skill_ids",
+    "trials",
+    "wins",
+    "win_rate",
+    "avg_turns",
+    "avg_elapsed_sec",
+    "avg_ttk_sec",
+    "cell_key",
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Sweep every monster x legal active skill pair over a difficulty_index range."
+    )
+    parser.add_argument("--difficulty-from", type=int, default=1)
+    parser.add_argument("--difficulty-to", type=int, default=0, help="0 = last progression row")
+    parser.add_argument(
+        "--player-level",
+        type=int,
+        default=0,
+        help="fixed level; 0 = floor(8 + difficulty_index * 0.55) clamped to 1..120 (auto-progress rule)",
+    )
+    parser.add_argument("--rebirth-count", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=DEFAULT_CONFIG["seed"])
+    parser.add_argument("--seed-scheme", choices=SEED_SCHEMES, default="stream")
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_CONFIG["max_turns"])
+    parser.add_argument("--trials", type=int, default=8, help="duels per cell (cap with --target-ci)")
+    parser.add_argument(
+        "--target-ci",
+        type=float,
+        default=0.0,
+        help="adaptive cells: stop once the win-rate CI width is below this",
+    )
+    parser.add_argument("--jobs", type=int, default=0, help="worker processes (0 = os.cpu_count())")
+    parser.add_argument(
+        "--engine",
+        choices=("scalar", "lockstep"),
+        default="scalar",
+        help="duel engine per cell; lockstep only pays off with large --trials",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update the cell cache")
+    parser.add_argument("--out-csv", type=Path, default=OUT_MATRIX_CSV)
+    parser.add_argument("--out-report", type=Path, default=OUT_MATRIX_REPORT_JSON)
+    return parser.parse_args()
+
+
+def auto_player_level(difficulty_index: int) -> int:
+    return min(120, max(1, math.floor(8 + difficulty_index * 0.55)))
+
+
+def legal_skill_pairs(skill_rows: list[dict[str, str]], difficulty_index: int) -> list[tuple[str, ...]]:
+    """Unordered pairs of unlocked damage actives; fewer than 2 unlocked -> one smaller set."""
+    unlocked = [
+        row["skill_id"]
+        for row in skill_rows
+        if row["category"] == "active"
+        and to_float(row["damage_coeff"]) > 0
+        and int(to_float(row["unlock_difficulty_index"], 1)) <= difficulty_index
+    ]
+    if len(unlocked) < 2:
+        return [tuple(unlocked)]
+    return list(itertools.combinations(unlocked, 2))
+
+
+def cell_key(parts: dict[str, Any]) -> str:
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def load_cache(path: Path) -> dict[str, list[float]]:
+    if not path.exists():
+        return {}
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    if raw.get("version") != MATRIX_CACHE_VERSION or raw.get("model_version") != MATRIX_MODEL_VERSION:
+        return {}
+    return raw.get("cells", {})
+
+
+def save_cache(path: Path, cells: dict[str, list[float]]) -> None:
+    path.write_text(
+        json.dumps(
+            {"version": MATRIX_CACHE_VERSION, "model_version": MATRIX_MODEL_VERSION, "cells": cells},
+            separators=(",", ":"),
+        ),
+        encoding="utf-8",
+    )
+
+
+def run_difficulty_cells(task: dict[str, Any]) -> list[tuple[str, list[float]]]:
+    """Run every uncached cell of one difficulty; stats are shared across cells."""
+    out: list[tuple[str, list[float]]] = []
+    for cell in task["cells"]:
+        trial_task = {
+            "player_stats": task["player_stats"],
+            "monster_row": cell["monster_row"],
+            "monster_stats": cell["monster_stats"],
+            "skills": cell["skills"],
+            "constants": task["constants"],
+            "base_seed": task["seed"],
+            "monster_index": cell["monster_index"],
+            "trial_start": 0,
+            "trial_end": task["trials"],
+            "max_turns": task["max_turns"],
+            "engine": task["engine"],
+            "target_ci": task["target_ci"],
+            "seed_scheme": task["seed_scheme"],
+        }
+        if task["target_ci"] > 0:
+            results, _ = run_adaptive_trials(trial_task)
+        else:
+            results = run_trial_chunk(trial_task)
+        wins = sum(1 for r in results if r[0])
+        out.append(
+            (
+                cell["key"],
+                [
+                    len(results),
+                    wins,
+                    sum(r[1] for r in results),
+                    sum(r[2] for r in results),
+                    sum(r[2] for r in results if r[0]),
+                ],
+            )
+        )
+    return out
+
+
+def matrix_row(cell: dict[str, Any], result: list[float]) -> dict[str, Any]:
+    trials, wins, turns_sum, elapsed_sum, win_elapsed_sum = result
+    return {
+        "difficulty_index": cell["difficulty_index"],
+        "world": cell["world"],
+        "player_level": cell["player_level"],
+        "rebirth_count": cell["rebirth_count"],
+        "monster_id": cell["monster_row"]["monster_id"],
+        "monster_type": cell["monster_row"]["type"],
+        "skill_ids": "+".join(cell["skill_ids"]),
+        "trials": int(trials),
+        "wins": int(wins),
+        "win_rate": to_fixed(wins / trials, 4),
+        "avg_turns": to_fixed(turns_sum / trials, 2),
+        "avg_elapsed_sec": to_fixed(elapsed_sum / trials, 3),
+        "avg_ttk_sec": to_fixed(win_elapsed_sum / wins, 3) if wins else "",
+        "cell_key": cell["key"],
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    if args.engine == "lockstep" and importlib.util.find_spec("numpy") is None:
+        raise SystemExit("--engine lockstep requires numpy (pip install numpy)")
+    started = time.perf_counter()
+
+    progression_rows = read_csv_rows(PROGRESSION_CSV)
+    stat_rows = stat_rows_by_id(read_csv_rows(STAT_GROWTH_CSV))
+    constants = combat_constants_by_key(read_csv_rows(COMBAT_CONSTANTS_CSV))
+    skill_rows = read_csv_rows(SKILLS_CSV)
+    monster_rows = read_csv_rows(MONSTERS_CSV)
+
+    last_difficulty = max(int(row["difficulty_index"]) for row in progression_rows)
+    difficulty_from = max(1, args.difficulty_from)
+    difficulty_to = last_difficulty if args.difficulty_to <= 0 else min(last_difficulty, args.difficulty_to)
+    if difficulty_from > difficulty_to:
+        raise SystemExit(f"empty difficulty range: {difficulty_from}..{difficulty_to}")
+
+    trials = max(1, args.trials)
+    target_ci = max(0.0, args.target_ci)
+    max_turns = max(10, args.max_turns)
+    rebirth_count = max(0, args.rebirth_count)
+    cache = {} if args.no_cache else load_cache(MATRIX_CACHE_JSON)
+    skills_by_id = {row["skill_id"]: skill_entry(row) for row in skill_rows}
+    try:
+        from build_player_stat_table_v1 import DEFAULT_MAX_REBIRTH, load_player_stat_table
+
+        stat_table = load_player_stat_table(max_rebirth=max(rebirth_count, DEFAULT_MAX_REBIRTH))
+    except ImportError:
+        stat_table = None
+
+    cells: list[dict[str, Any]] = []
+    tasks: list[dict[str, Any]] = []
+    for difficulty_index in range(difficulty_from, difficulty_to + 1):
+        progression = get_progression_row(progression_rows, difficulty_index)
+        player_level = args.player_level if args.player_level > 0 else auto_player_level(difficulty_index)
+        if stat_table is not None and stat_table.covers(difficulty_index, player_level, rebirth_count):
+            player_stats = stat_table.lookup(difficulty_index, player_level, rebirth_count)
+        else:
+            config = {"player_level": player_level, "rebirth_count": rebirth_count}
+            player_stats = build_player_stats(stat_rows, progression, config, constants)
+        monster_stats = [build_monster_stats(player_stats, row, constants) for row in monster_rows]
+        pending: list[dict[str, Any]] = []
+
+        for skill_ids in legal_skill_pairs(skill_rows, difficulty_index):
+            skills = [skills_by_id[skill_id] for skill_id in skill_ids]
+            for monster_index, monster in enumerate(monster_rows):
+                cell = {
+                    "difficulty_index": difficulty_index,
+                    "world": progression["world"],
+                    "player_level": player_level,
+                    "rebirth_count": rebirth_count,
+                    "skill_ids": skill_ids,
+                    "monster_index": monster_index,
+                    "monster_row": monster,
+                    "monster_stats": monster_stats[monster_index],
+                    "skills": skills,
+                }
+                key_parts = {
+                    "player_stats": player_stats,
+                    "monster_row": monster,
+                    "monster_stats": cell["monster_stats"],
+                    "skills": skills,
+                    "constants": constants,
+                    "seed": args.seed,
+                    "seed_scheme": args.seed_scheme,
+                    "trials": trials,
+                    "target_ci": target_ci,
+                    "max_turns": max_turns,
+                }
+                if args.seed_scheme == "stride":
+                    # Only stride seeds move with the monster's row position; stream seeds key on monster_id.
+                    key_parts["monster_index"] = monster_index
+                cell["key"] = cell_key(key_parts)
+                cells.append(cell)
+                if cell["key"] not in cache:
+                    pending.append(cell)
+
+        if pending:
+            tasks.append(
+                {
+                    "player_stats": player_stats,
+                    "constants": constants,
+                    "seed": args.seed,
+                    "seed_scheme": args.seed_scheme,
+                    "trials": trials,
+                    "max_turns": max_turns,
+                    "engine": args.engine,
+                    "target_ci": target_ci,
+                    "cells": pending,
+                }
+            )
+
+    jobs = resolve_jobs(args.jobs)
+    computed = 0
+    if tasks:
+        if jobs == 1:
+            task_results = map(run_difficulty_cells, tasks)
+            for results in task_results:
+                cache.update(results)
+                computed += len(results)
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                for results in executor.map(run_difficulty_cells, tasks):
+                    cache.update(results)
+                    computed += len(results)
+
+    rows = [matrix_row(cell, cache[cell["key"]]) for cell in cells]
+    trials_used = sum(row["trials"] for row in rows)
+    args.out_csv.parent.mkdir(parents=True, exist_ok=True)
+    with args.out_csv.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(MATRIX_FIELDS))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    if not args.no_cache:
+        # Only this run's cells are kept, so the file tracks the current sweep instead of every cell ever run.
+        save_cache(MATRIX_CACHE_JSON, {cell["key"]: cache[cell["key"]] for cell in cells})
+
+    per_difficulty: dict[int, dict[str, Any]] = {}
+    for row in rows:
+        entry = per_difficulty.setdefault(
+            row["difficulty_index"], {"cells": 0, "win_rate_sum": 0.0, "best": {}}
+        )
+        entry["cells"] += 1
+        entry["win_rate_sum"] += row["win_rate"]
+        best = entry["best"].get(row["monster_id"])
+        if best is None or row["win_rate"] > best["win_rate"]:
+            entry["best"][row["monster_id"]] = {"skill_ids": row["skill_ids"], "win_rate": row["win_rate"]}
+
+    elapsed_sec = time.perf_counter() - started
+    report = {
+        "config": {
+            "difficulty_from": difficulty_from,
+            "difficulty_to": difficulty_to,
+            "player_level": args.player_level if args.player_level > 0 else "auto",
+            "rebirth_count": rebirth_count,
+            "seed": args.seed,
+            "seed_scheme": args.seed_scheme,
+            "max_turns": max_turns,
+            "trials_per_cell": trials,
+            "target_ci": target_ci,
+            "engine": args.engine,
+        },
+        "cells": len(cells),
+        "computed_cells": computed,
+        "cached_cells": len(cells) - computed,
+        "trials_used": trials_used,
+        "trials_saved": trials * len(cells) - trials_used,
+        "jobs": jobs,
+        "elapsed_sec": to_fixed(elapsed_sec, 3),
+        "difficulties": [
+            {
+                "difficulty_index": difficulty_index,
+                "cells": entry["cells"],
+                "mean_win_rate": to_fixed(entry["win_rate_sum"] / entry["cells"], 4),
+                "best_pair_by_monster": entry["best"],
+            }
+            for difficulty_index, entry in sorted(per_difficulty.items())
+        ],
+    }
+    args.out_report.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print(f"wrote combat matrix csv -> {args.out_csv} ({len(rows)} rows)")
+    print(f"wrote combat matrix report -> {args.out_report}")
+    print(
+        f"[combat-matrix] difficulties={difficulty_from}..{difficulty_to} cells={len(cells)} "
+        f"computed={computed} cached={len(cells) - computed} jobs={jobs} elapsed={elapsed_sec:.1f}s "
+        f"duels_used={trials_used} duels_saved={trials * len(cells) - trials_used}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,21 @@ from __future__ import annotations
 
 import argparse
 import csv
+import importlib.util
 import json
+import math
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 from decimal import Decimal, ROUND_HALF_UP
 
+from sim_rng_v1 import RngStream, derive_seed32
+
 ROOT = Path(__file__).resolve().parent.parent
 PROGRESSION_CSV = ROOT / "data/progression/realm_progression_v1.csv"
 STAT_GROWTH_CSV = ROOT / "data/system/stat_growth_coeffs_v1.csv"
@@ -19,6 +29,11 @@ OUT_DIR = ROOT / "data/sim"
 OUT_REPORT_JSON = OUT_DIR / "minimal_combat_report_v1.json"
 OUT_SUMMARY_CSV = OUT_DIR / "minimal_combat_summary_v1.csv"
 OUT_ACTION_LOG_CSV = OUT_DIR / "minimal_combat_action_log_v1.csv"
+OUT_MONTE_CARLO_CSV = OUT_DIR / "minimal_combat_monte_carlo_v1.csv"
+OUT_SUMMARY_STREAM_BASE = OUT_DIR / "minimal_combat_summary_v1"
+OUT_ACTION_LOG_STREAM_BASE = OUT_DIR / "minimal_combat_action_log_v1"
+OUT_ACTION_LOG_INDEX_CSV = OUT_DIR / "minimal_combat_action_log_index_v1.csv"
+OUT_TRIAL_STREAM_BASE = OUT_DIR / "minimal_combat_trials_v1"
 
 DEFAULT_CONFIG = {
     "difficulty_index": 20,
@@ -33,6 +48,36 @@ DEFAULT_CONFIG = {
 
 SUPPORTED_ELEMENTS = {"fire", "ice", "thunder", "wind", "earth"}
 SUPPORTED_STATUSES = {"burn", "slow", "stun", "armor_break", "weaken"}
+STATUS_SLOTS = {"burn": 0, "slow": 1, "stun": 2, "armor_break": 3, "weaken": 4}
+BURN_SLOT = STATUS_SLOTS["burn"]
+SLOW_SLOT = STATUS_SLOTS["slow"]
+STUN_SLOT = STATUS_SLOTS["stun"]
+ARMOR_BREAK_SLOT = STATUS_SLOTS["armor_break"]
+WEAKEN_SLOT = STATUS_SLOTS["weaken"]
+NO_STATUS_UNTIL = float("-inf")
+
+MONSTER_SEED_STRIDE = 1009
+TRIAL_SEED_STRIDE = 104729
+# stride: seed + monster_index * 1009 + trial_index * 104729 (default, matches TS dumps)
+# stream: sim_rng_v1 seed tree (seed, "combat", monster_id, trial_index)
+SEED_SCHEMES = ("stride", "stream")
+WIN_RATE_CI_Z = 1.96
+TRIAL_PERCENTILES = (10, 50, 90, 99)
+TRIAL_CHUNKS_PER_JOB = 4
+ADAPTIVE_BATCH_SIZE = 32
+# (phase, module-level functions timed under it); ActionLogBuffer.record is the "logging" phase.
+PROFILE_PHASES = (
+    ("status", ("process_start_of_turn_statuses",)),
+    ("skill_choice", ("choose_player_skill",)),
+    ("calc_damage", ("calc_damage",)),
+    ("on_hit_status", ("maybe_apply_skill_status", "maybe_apply_monster_on_hit_status")),
+)
+# Timed inside whichever phase (or the duel body) calls them, so reported under that phase rather than beside it.
+PROFILE_SUB_PHASES = (("rounding", ("js_round_int", "to_fixed")),)
+PROFILE_CALIBRATION_CALLS = 20000
+# BlockSeededRng only pays off when NumPy prefetches the first draws of every seed; without it
+# the pure-Python blocks measured no faster than SeededRng, so Monte Carlo chunks keep SeededRng.
+BLOCK_RNG_DEFAULT = importlib.util.find_spec("numpy") is not None
 
 
 def clamp(value: float, lo: float, hi: float) -> float:
@@ -75,162 +120,259 @@ def normalize_element(raw: str) -> str:
     return "none"
 
 
+MONSTER_MECHANIC_RULES: dict[str, dict[str, Any]] = {
+    "burn_claw": {
+        "on_hit_status": {
+            "type": "burn",
+            "chance": 0.42,
+            "duration_sec": 4.0,
+            "source_atk_scale": 0.9,
+        },
+    },
+    "burn_field": {
+        "on_hit_status": {
+            "type": "burn",
+            "chance": 0.35,
+            "duration_sec": 4.5,
+            "source_atk_scale": 0.9,
+        },
+    },
+    "burn_stack": {
+        "on_hit_status": {
+            "type": "burn",
+            "chance": 0.45,
+            "duration_sec": 5.0,
+            "source_atk_scale": 0.95,
+        },
+    },
+    "root_bind": {
+        "on_hit_status": {
+            "type": "stun",
+            "chance": 0.26,
+            "duration_sec": 1.4,
+        },
+    },
+    "frozen_prison": {
+        "on_hit_status": {
+            "type": "stun",
+            "chance": 0.3,
+            "duration_sec": 1.6,
+        },
+    },
+    "time_stop": {
+        "on_hit_status": {
+            "type": "stun",
+            "chance": 0.34,
+            "duration_sec": 1.6,
+        },
+    },
+    "slow_aura": {
+        "on_hit_status": {
+            "type": "slow",
+            "chance": 0.7,
+            "duration_sec": 4.5,
+        },
+    },
+    "slow_field": {
+        "on_hit_status": {
+            "type": "slow",
+            "chance": 0.62,
+            "duration_sec": 4.0,
+        },
+    },
+    "charm_gaze": {
+        "on_hit_status": {
+            "type": "slow",
+            "chance": 0.58,
+            "duration_sec": 3.8,
+        },
+    },
+    "armor_break": {
+        "on_hit_status": {
+            "type": "armor_break",
+            "chance": 0.56,
+            "duration_sec": 4.0,
+        },
+    },
+    "time_cut": {
+        "on_hit_status": {
+            "type": "armor_break",
+            "chance": 0.56,
+            "duration_sec": 4.0,
+        },
+    },
+    "law_suppress": {
+        "on_hit_status": {
+            "type": "weaken",
+            "chance": 0.55,
+            "duration_sec": 4.2,
+        },
+    },
+    "fear_aura": {
+        "on_hit_status": {
+            "type": "weaken",
+            "chance": 0.55,
+            "duration_sec": 4.2,
+        },
+    },
+    "poison_stack": {
+        "on_hit_status": {
+            "type": "burn",
+            "chance": 0.38,
+            "duration_sec": 4.5,
+            "source_atk_scale": 0.75,
+        },
+    },
+    "chain_lightning": {
+        "on_hit_status": {
+            "type": "stun",
+            "chance": 0.18,
+            "duration_sec": 1.0,
+        },
+    },
+    "thunderstorm": {
+        "on_hit_status": {
+            "type": "stun",
+            "chance": 0.18,
+            "duration_sec": 1.0,
+        },
+    },
+    "judgment_mark": {
+        "on_hit_status": {
+            "type": "stun",
+            "chance": 0.18,
+            "duration_sec": 1.0,
+        },
+    },
+    "triple_tribulation": {
+        "on_hit_status": {
+            "type": "stun",
+            "chance": 0.18,
+            "duration_sec": 1.0,
+        },
+    },
+    "high_crit": {
+        "passive_crit_rate_add": 0.08,
+    },
+    "high_def": {
+        "passive_def_multiplier": 1.14,
+        "passive_damage_reduction_add": 0.08,
+    },
+    "adaptive_armor": {
+        "passive_def_multiplier": 1.12,
+        "passive_damage_reduction_add": 0.06,
+    },
+    "law_barrier": {
+        "passive_def_multiplier": 1.18,
+        "passive_damage_reduction_add": 0.16,
+    },
+    "shield_cast": {
+        "passive_damage_reduction_add": 0.12,
+    },
+    "invuln_phase": {
+        "passive_damage_reduction_add": 0.18,
+    },
+    "blink_strike": {
+        "first_strike_damage_multiplier": 1.28,
+    },
+    "multi_dash": {
+        "first_strike_damage_multiplier": 1.28,
+    },
+    "phase_shift": {
+        "first_strike_damage_multiplier": 1.28,
+    },
+    "execute_mark": {
+        "execute_bonus": {
+            "target_hp_below_ratio": 0.35,
+            "damage_multiplier": 1.3,
+        },
+    },
+    "soul_harvest": {
+        "execute_bonus": {
+            "target_hp_below_ratio": 0.3,
+            "damage_multiplier": 1.35,
+        },
+    },
+    "origin_tribulation": {
+        "execute_bonus": {
+            "target_hp_below_ratio": 0.45,
+            "damage_multiplier": 1.4,
+        },
+    },
+    "heal_link": {
+        "on_hit_heal_ratio": 0.08,
+    },
+}
+
+
+@dataclass(frozen=True)
+class MonsterMechanic:
+    special_mechanic: str
+    on_hit_status: str = ""
+    on_hit_chance: float = 0.0
+    on_hit_duration_sec: float = 0.0
+    on_hit_source_atk_scale: float = 1.0
+    passive_def_multiplier: float = 1.0
+    passive_crit_rate_add: float = 0.0
+    passive_damage_reduction_add: float = 0.0
+    first_strike_damage_multiplier: float = 1.0
+    has_execute_bonus: bool = False
+    execute_target_hp_below_ratio: float = 0.0
+    execute_damage_multiplier: float = 1.0
+    on_hit_heal_ratio: float = 0.0
+
+
 def get_monster_mechanic_rule(tag: str) -> dict[str, Any] | None:
-    if tag == "burn_claw":
-        return {
-            "on_hit_status": {
-                "type": "burn",
-                "chance": 0.42,
-                "duration_sec": 4.0,
-                "source_atk_scale": 0.9,
-            }
-        }
-    if tag == "burn_field":
-        return {
-            "on_hit_status": {
-                "type": "burn",
-                "chance": 0.35,
-                "duration_sec": 4.5,
-                "source_atk_scale": 0.9,
-            }
-        }
-    if tag == "burn_stack":
-        return {
-            "on_hit_status": {
-                "type": "burn",
-                "chance": 0.45,
-                "duration_sec": 5.0,
-                "source_atk_scale": 0.95,
-            }
-        }
-    if tag == "root_bind":
-        return {
-            "on_hit_status": {
-                "type": "stun",
-                "chance": 0.26,
-                "duration_sec": 1.4,
-            }
-        }
-    if tag == "frozen_prison":
-        return {
-            "on_hit_status": {
-                "type": "stun",
-                "chance": 0.30,
-                "duration_sec": 1.6,
-            }
-        }
-    if tag == "time_stop":
-        return {
-            "on_hit_status": {
-                "type": "stun",
-                "chance": 0.34,
-                "duration_sec": 1.6,
-            }
-        }
-    if tag == "slow_aura":
-        return {
-            "on_hit_status": {
-                "type": "slow",
-                "chance": 0.70,
-                "duration_sec": 4.5,
-            }
-        }
-    if tag == "slow_field":
-        return {
-            "on_hit_status": {
-                "type": "slow",
-                "chance": 0.62,
-                "duration_sec": 4.0,
-            }
-        }
-    if tag == "charm_gaze":
-        return {
-            "on_hit_status": {
-                "type": "slow",
-                "chance": 0.58,
-                "duration_sec": 3.8,
-            }
-        }
-    if tag in ("armor_break", "time_cut"):
-        return {
-            "on_hit_status": {
-                "type": "armor_break",
-                "chance": 0.56,
-                "duration_sec": 4.0,
-            }
-        }
-    if tag in ("law_suppress", "fear_aura"):
-        return {
-            "on_hit_status": {
-                "type": "weaken",
-                "chance": 0.55,
-                "duration_sec": 4.2,
-            }
-        }
-    if tag == "poison_stack":
-        return {
-            "on_hit_status": {
-                "type": "burn",
-                "chance": 0.38,
-                "duration_sec": 4.5,
-                "source_atk_scale": 0.75,
-            }
-        }
-    if tag in ("chain_lightning", "thunderstorm", "judgment_mark", "triple_tribulation"):
-        return {
-            "on_hit_status": {
-                "type": "stun",
-                "chance": 0.18,
-                "duration_sec": 1.0,
-            }
-        }
-    if tag == "high_crit":
-        return {"passive_crit_rate_add": 0.08}
-    if tag == "high_def":
-        return {
-            "passive_def_multiplier": 1.14,
-            "passive_damage_reduction_add": 0.08,
-        }
-    if tag == "adaptive_armor":
-        return {
-            "passive_def_multiplier": 1.12,
-            "passive_damage_reduction_add": 0.06,
-        }
-    if tag == "law_barrier":
-        return {
-            "passive_def_multiplier": 1.18,
-            "passive_damage_reduction_add": 0.16,
-        }
-    if tag == "shield_cast":
-        return {"passive_damage_reduction_add": 0.12}
-    if tag == "invuln_phase":
-        return {"passive_damage_reduction_add": 0.18}
-    if tag in ("blink_strike", "multi_dash", "phase_shift"):
-        return {"first_strike_damage_multiplier": 1.28}
-    if tag == "execute_mark":
-        return {
-            "execute_bonus": {
-                "target_hp_below_ratio": 0.35,
-                "damage_multiplier": 1.30,
-            }
-        }
-    if tag == "soul_harvest":
-        return {
-            "execute_bonus": {
-                "target_hp_below_ratio": 0.30,
-                "damage_multiplier": 1.35,
-            }
+    return MONSTER_MECHANIC_RULES.get(tag)
+
+
+def compile_monster_mechanic(tag: str, rule: dict[str, Any] | None) -> MonsterMechanic:
+    if not rule:
+        return MonsterMechanic(special_mechanic=tag)
+
+    on_hit_fields: dict[str, Any] = {}
+    on_hit = rule.get("on_hit_status")
+    if isinstance(on_hit, dict) and str(on_hit.get("type", "")) in SUPPORTED_STATUSES:
+        on_hit_fields = {
+            "on_hit_status": str(on_hit["type"]),
+            "on_hit_chance": clamp(to_float(on_hit.get("chance"), 0.0), 0.0, 1.0),
+            "on_hit_duration_sec": max(0.0, to_float(on_hit.get("duration_sec"), 0.0)),
+            "on_hit_source_atk_scale": max(0.0, to_float(on_hit.get("source_atk_scale"), 1.0)),
         }
-    if tag == "origin_tribulation":
-        return {
-            "execute_bonus": {
-                "target_hp_below_ratio": 0.45,
-                "damage_multiplier": 1.40,
-            }
+
+    execute_fields: dict[str, Any] = {}
+    execute_bonus = rule.get("execute_bonus")
+    if isinstance(execute_bonus, dict):
+        execute_fields = {
+            "has_execute_bonus": True,
+            "execute_target_hp_below_ratio": to_float(execute_bonus.get("target_hp_below_ratio"), 0.0),
+            "execute_damage_multiplier": to_float(execute_bonus.get("damage_multiplier"), 1.0),
         }
-    if tag == "heal_link":
-        return {"on_hit_heal_ratio": 0.08}
-    return None
+
+    return MonsterMechanic(
+        special_mechanic=tag,
+        passive_def_multiplier=to_float(rule.get("passive_def_multiplier"), 1.0),
+        passive_crit_rate_add=to_float(rule.get("passive_crit_rate_add"), 0.0),
+        passive_damage_reduction_add=to_float(rule.get("passive_damage_reduction_add"), 0.0),
+        first_strike_damage_multiplier=to_float(rule.get("first_strike_damage_multiplier"), 1.0),
+        on_hit_heal_ratio=clamp(to_float(rule.get("on_hit_heal_ratio"), 0.0), 0.0, 1.0),
+        **on_hit_fields,
+        **execute_fields,
+    )
+
+
+MONSTER_MECHANICS: dict[str, MonsterMechanic] = {
+    tag: compile_monster_mechanic(tag, rule) for tag, rule in MONSTER_MECHANIC_RULES.items()
+}
+NO_MONSTER_MECHANIC = compile_monster_mechanic("none", None)
+
+
+def get_monster_mechanic(tag: str) -> MonsterMechanic:
+    return MONSTER_MECHANICS.get(tag, NO_MONSTER_MECHANIC)
+
+
+def monster_mechanic_rows() -> list[dict[str, Any]]:
+    return [asdict(MONSTER_MECHANICS[tag]) for tag in sorted(MONSTER_MECHANICS)]
 
 
 class SeededRng:
@@ -246,6 +388,27 @@ class SeededRng:
         self.state = x & 0xFFFFFFFF
         return self.state / 0x100000000
 
+    # Every decision kind reads the same stream; DecisionStreams splits them.
+    hit_roll = crit_roll = variance_roll = status_roll = next
+
+
+class DecisionStreams:
+    """Common random numbers for one side of a duel.
+
+    Hit, crit, variance and status rolls each get their own xorshift stream
+    seeded from the sim_rng_v1 path (seed, "decision", side, kind). The k-th hit roll of a side is then the same
+    draw in every variant, even when another variant skipped a crit or status
+    roll in between, so paired A/B duels stay aligned.
+    """
+
+    __slots__ = ("hit_roll", "crit_roll", "variance_roll", "status_roll")
+
+    def __init__(self, seed: int, side: int):
+        self.hit_roll = SeededRng(derive_seed32(seed, "decision", side, 0)).next
+        self.crit_roll = SeededRng(derive_seed32(seed, "decision", side, 1)).next
+        self.variance_roll = SeededRng(derive_seed32(seed, "decision", side, 2)).next
+        self.status_roll = SeededRng(derive_seed32(seed, "decision", side, 3)).next
+
 
 def is_element_advantage(attacker: str, defender: str) -> bool:
     table = {
@@ -294,11 +457,75 @@ def parse_args() -> argparse.Namespace:
         help="repeatable, up to 3 effective monsters",
     )
     parser.add_argument("--no-action-log", action="store_true")
+    parser.add_argument(
+        "--action-log-cap",
+        type=int,
+        default=None,
+        help="keep at most N action log rows per duel; adds logs_dropped to each duel",
+    )
+    parser.add_argument(
+        "--action-log-ring",
+        action="store_true",
+        help="with --action-log-cap, keep the last N rows instead of the first N",
+    )
+    parser.add_argument(
+        "--trials",
+        type=int,
+        default=1,
+        help="Monte Carlo duels per monster; >1 adds a monte_carlo block to the report",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="worker processes for --trials (0 = os.cpu_count())",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=("scalar", "lockstep"),
+        default="scalar",
+        help="duel engine for --trials; lockstep uses the NumPy kernel (same results)",
+    )
+    parser.add_argument(
+        "--target-ci",
+        type=float,
+        default=0.0,
+        help="adaptive --trials: stop a matchup once its win-rate CI width is below this (--trials is the cap)",
+    )
+    parser.add_argument(
+        "--target-ttk-rel-ci",
+        type=float,
+        default=0.0,
+        help="adaptive --trials: stop once the winning-duel elapsed_sec 95%% CI half-width / mean is below this "
+        "(alone or with --target-ci; both must hold when both are set)",
+    )
+    parser.add_argument(
+        "--seed-scheme",
+        choices=SEED_SCHEMES,
+        default="stride",
+        help="per-duel seeds: stride (seed + idx*1009 + trial*104729) or stream (seed tree by monster_id/trial)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="add per-phase ns timers and call counts (scalar engine, in-process) as a profile block",
+    )
+    parser.add_argument(
+        "--stream-format",
+        choices=("csv", "jsonl"),
+        default=None,
+        help="write summary/action log rows per duel and Monte Carlo trial rows per chunk as they finish",
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="with --stream-format, gzip each duel/trial-chunk block (.gz)",
+    )
     return parser.parse_args()
 
 
 def build_config(args: argparse.Namespace) -> dict[str, Any]:
-    return {
+    config = {
         "difficulty_index": max(1, args.difficulty_index),
         "player_level": max(1, args.player_level),
         "rebirth_count": max(0, args.rebirth_count),
@@ -308,6 +535,9 @@ def build_config(args: argparse.Namespace) -> dict[str, Any]:
         "monster_ids": args.monster_ids if args.monster_ids else list(DEFAULT_CONFIG["monster_ids"]),
         "include_action_logs": not args.no_action_log,
     }
+    if args.seed_scheme != "stride":
+        config["seed_scheme"] = args.seed_scheme
+    return config
 
 
 def get_progression_row(rows: list[dict[str, str]], difficulty_index: int) -> dict[str, str]:
@@ -347,6 +577,7 @@ def calc_player_stat(
     major_stage_index: int,
     sub_stage_index: int,
     rebirth_count: int,
+    equipment_bonus: float = 0.0,
 ) -> float:
     row = stat_rows.get(stat_id)
     if row is None:
@@ -369,47 +600,86 @@ def calc_player_stat(
         + per_sub * max(0, sub_stage_index - 1)
     )
 
+    if equipment_bonus:
+        # Gear applies before the rebirth multiplier, as in stat_option_tables_v1_kr.md, but as a flat
+        # amount: equipment tables roll flat stats, so the sum is scaled by equipment_scale_pct and added.
+        raw += equipment_bonus * to_float(row["equipment_scale_pct"], 1.0)
     rebirth_scaled = raw * (1 + max(0, rebirth_count) * rebirth_scale_pct * 0.01)
     return apply_soft_hard_cap(rebirth_scaled, soft_cap_start, hard_cap, soft_cap_slope)
 
 
+PLAYER_STAT_IDS = (
+    "hp",
+    "mp",
+    "atk",
+    "def",
+    "speed",
+    "accuracy",
+    "evasion",
+    "crit_rate",
+    "crit_damage",
+    "penetration",
+    "damage_reduction",
+)
+
+
+def player_stat_bounds(constants: dict[str, float]) -> dict[str, tuple[float, float]]:
+    inf = float("inf")
+    return {
+        "hp": (-inf, inf),
+        "mp": (-inf, inf),
+        "atk": (-inf, inf),
+        "def": (-inf, inf),
+        "speed": (0.2, inf),
+        "accuracy": (constants.get("accuracy_floor", 0.55), constants.get("accuracy_ceiling", 0.98)),
+        "evasion": (0.0, constants.get("evasion_cap", 0.60)),
+        "crit_rate": (0.0, constants.get("crit_rate_cap", 0.75)),
+        "crit_damage": (0.0, inf),
+        "penetration": (0.0, 0.65),
+        "damage_reduction": (0.0, constants.get("damage_reduction_cap", 0.70)),
+    }
+
+
 def build_player_stats(
     stat_rows: dict[str, dict[str, str]],
     progression: dict[str, str],
     config: dict[str, Any],
     constants: dict[str, float],
+    equipment_stats: dict[str, float] | None = None,
 ) -> dict[str, float]:
+    """Player stats for a progression row; equipment_stats is an unscaled gear total per stat_id."""
     major_idx = int(progression["major_stage_index"])
     sub_idx = int(progression["sub_stage_index"])
+    bounds = player_stat_bounds(constants)
+    equipment_stats = equipment_stats or {}
 
-    def s(stat_id: str) -> float:
-        return calc_player_stat(
+    out: dict[str, float] = {}
+    for stat_id in PLAYER_STAT_IDS:
+        value = calc_player_stat(
             stat_rows,
             stat_id,
             config["player_level"],
             major_idx,
             sub_idx,
             config["rebirth_count"],
+            equipment_stats.get(stat_id, 0.0),
         )
+        lo, hi = bounds[stat_id]
+        out[stat_id] = clamp(value, lo, hi)
+    return out
 
-    accuracy_floor = constants.get("accuracy_floor", 0.55)
-    accuracy_ceiling = constants.get("accuracy_ceiling", 0.98)
-    crit_rate_cap = constants.get("crit_rate_cap", 0.75)
-    evasion_cap = constants.get("evasion_cap", 0.60)
-    damage_reduction_cap = constants.get("damage_reduction_cap", 0.70)
 
+def skill_entry(row: dict[str, str]) -> dict[str, Any]:
     return {
-        "hp": s("hp"),
-        "mp": s("mp"),
-        "atk": s("atk"),
-        "def": s("def"),
-        "speed": max(0.2, s("speed")),
-        "accuracy": clamp(s("accuracy"), accuracy_floor, accuracy_ceiling),
-        "evasion": clamp(s("evasion"), 0.0, evasion_cap),
-        "crit_rate": clamp(s("crit_rate"), 0.0, crit_rate_cap),
-        "crit_damage": max(0.0, s("crit_damage")),
-        "penetration": clamp(s("penetration"), 0.0, 0.65),
-        "damage_reduction": clamp(s("damage_reduction"), 0.0, damage_reduction_cap),
+        "skill_id": row["skill_id"],
+        "name_ko": row["name_ko"],
+        "damage_coeff": to_float(row["damage_coeff"]),
+        "cooldown_sec": max(0.0, to_float(row["cooldown_sec"])),
+        "cost_mp": max(0.0, to_float(row["cost_mp"])),
+        "element": normalize_element(row["element"]),
+        "status_effect": row["status_effect"],
+        "status_chance_pct": max(0.0, to_float(row["status_chance_pct"])),
+        "status_duration_sec": max(0.0, to_float(row["status_duration_sec"])),
     }
 
 
@@ -424,19 +694,7 @@ def pick_skills(skill_rows: list[dict[str, str]], config: dict[str, Any]) -> lis
         damage_coeff = to_float(row["damage_coeff"])
         if row["category"] != "active" or damage_coeff <= 0:
             continue
-        picked.append(
-            {
-                "skill_id": row["skill_id"],
-                "name_ko": row["name_ko"],
-                "damage_coeff": damage_coeff,
-                "cooldown_sec": max(0.0, to_float(row["cooldown_sec"])),
-                "cost_mp": max(0.0, to_float(row["cost_mp"])),
-                "element": normalize_element(row["element"]),
-                "status_effect": row["status_effect"],
-                "status_chance_pct": max(0.0, to_float(row["status_chance_pct"])),
-                "status_duration_sec": max(0.0, to_float(row["status_duration_sec"])),
-            }
-        )
+        picked.append(skill_entry(row))
 
     if len(picked) >= 2:
         return picked[:2]
@@ -456,19 +714,7 @@ def pick_skills(skill_rows: list[dict[str, str]], config: dict[str, Any]) -> lis
             break
         if any(item["skill_id"] == row["skill_id"] for item in picked):
             continue
-        picked.append(
-            {
-                "skill_id": row["skill_id"],
-                "name_ko": row["name_ko"],
-                "damage_coeff": to_float(row["damage_coeff"]),
-                "cooldown_sec": max(0.0, to_float(row["cooldown_sec"])),
-                "cost_mp": max(0.0, to_float(row["cost_mp"])),
-                "element": normalize_element(row["element"]),
-                "status_effect": row["status_effect"],
-                "status_chance_pct": max(0.0, to_float(row["status_chance_pct"])),
-                "status_duration_sec": max(0.0, to_float(row["status_duration_sec"])),
-            }
-        )
+        picked.append(skill_entry(row))
 
     if len(picked) < 2:
         raise SystemExit("unable to select 2 active skills")
@@ -500,7 +746,7 @@ def build_monster_stats(
     monster_row: dict[str, str],
     constants: dict[str, float],
 ) -> dict[str, float]:
-    mechanic_rule = get_monster_mechanic_rule(monster_row.get("special_mechanic", ""))
+    mechanic = get_monster_mechanic(monster_row.get("special_mechanic", ""))
     hp_mult = max(0.5, to_float(monster_row["hp_mult"], 1.0))
     atk_mult = max(0.5, to_float(monster_row["atk_mult"], 1.0))
     def_mult = max(0.5, to_float(monster_row["def_mult"], 1.0))
@@ -511,21 +757,9 @@ def build_monster_stats(
     damage_reduction_cap = constants.get("damage_reduction_cap", 0.70)
     accuracy_floor = constants.get("accuracy_floor", 0.55)
     accuracy_ceiling = constants.get("accuracy_ceiling", 0.98)
-    passive_def_multiplier = (
-        to_float(mechanic_rule.get("passive_def_multiplier"), 1.0)
-        if mechanic_rule
-        else 1.0
-    )
-    passive_crit_rate_add = (
-        to_float(mechanic_rule.get("passive_crit_rate_add"), 0.0)
-        if mechanic_rule
-        else 0.0
-    )
-    passive_damage_reduction_add = (
-        to_float(mechanic_rule.get("passive_damage_reduction_add"), 0.0)
-        if mechanic_rule
-        else 0.0
-    )
+    passive_def_multiplier = mechanic.passive_def_multiplier
+    passive_crit_rate_add = mechanic.passive_crit_rate_add
+    passive_damage_reduction_add = mechanic.passive_damage_reduction_add
     base_damage_reduction = max(0.0, (def_mult - 1) * 0.10)
 
     return {
@@ -551,140 +785,363 @@ def build_monster_stats(
     }
 
 
-def make_unit(kind: str, unit_id: str, name: str, stats: dict[str, float], element: str) -> dict[str, Any]:
-    return {
-        "kind": kind,
-        "id": unit_id,
-        "name": name,
-        "element": element,
-        "hp": stats["hp"],
-        "max_hp": stats["hp"],
-        "mp": stats["mp"],
-        "max_mp": stats["mp"],
-        "next_action_sec": 1.0 / max(0.2, stats["speed"]),
-        "stats": stats,
-        "cooldown_ready_sec": {},
-        "status_effects": [],
-    }
-
-
-def prune_expired_statuses(unit: dict[str, Any], now_sec: float) -> None:
-    unit["status_effects"] = [
-        effect for effect in unit["status_effects"] if float(effect["until_sec"]) > now_sec
-    ]
-
+class Unit:
+    __slots__ = (
+        "kind",
+        "id",
+        "name",
+        "element",
+        "hp",
+        "max_hp",
+        "mp",
+        "max_mp",
+        "next_action_sec",
+        "stats",
+        "cooldown_ready_sec",
+        "status_until",
+        "status_source_atk",
+        "skills",
+        "mechanic",
+        "first_strike_pending",
+    )
 
-def get_status(unit: dict[str, Any], status_type: str, now_sec: float) -> dict[str, Any] | None:
-    for effect in unit["status_effects"]:
-        if effect["type"] == status_type and float(effect["until_sec"]) > now_sec:
-            return effect
+    def __init__(self, kind: str, unit_id: str, name: str, stats: dict[str, float], element: str):
+        self.kind = kind
+        self.id = unit_id
+        self.name = name
+        self.element = element
+        self.hp = stats["hp"]
+        self.max_hp = stats["hp"]
+        self.mp = stats["mp"]
+        self.max_mp = stats["mp"]
+        self.next_action_sec = 1.0 / max(0.2, stats["speed"])
+        self.stats = stats
+        self.cooldown_ready_sec: dict[str, float] = {}
+        # One slot per STATUS_SLOTS entry; an absent status is (-inf, 0.0).
+        self.status_until = [NO_STATUS_UNTIL] * len(STATUS_SLOTS)
+        self.status_source_atk = [0.0] * len(STATUS_SLOTS)
+        # Player units act with skills; monster units with their compiled mechanic.
+        self.skills: list[dict[str, Any]] = []
+        self.mechanic = NO_MONSTER_MECHANIC
+        self.first_strike_pending = False
+
+
+def make_unit(kind: str, unit_id: str, name: str, stats: dict[str, float], element: str) -> Unit:
+    return Unit(kind, unit_id, name, stats, element)
+
+
+def make_player_unit(unit_id: str, stats: dict[str, float], skills: list[dict[str, Any]]) -> Unit:
+    unit = Unit("player", unit_id, "cultivator", stats, "none")
+    unit.skills = skills
+    return unit
+
+
+def make_monster_unit(
+    monster_row: dict[str, str],
+    monster_stats: dict[str, float],
+    unit_id: str | None = None,
+) -> Unit:
+    unit = Unit(
+        "monster",
+        unit_id or monster_row["monster_id"],
+        monster_row["name_ko"],
+        monster_stats,
+        normalize_element(monster_row["element"]),
+    )
+    unit.mechanic = get_monster_mechanic(monster_row.get("special_mechanic", ""))
+    unit.first_strike_pending = unit.mechanic.first_strike_damage_multiplier > 1.0
+    return unit
+
+
+def prune_expired_statuses(unit: Unit, now_sec: float) -> None:
+    until = unit.status_until
+    if max(until) == NO_STATUS_UNTIL:
+        return
+    for slot, until_sec in enumerate(until):
+        if until_sec <= now_sec and until_sec != NO_STATUS_UNTIL:
+            until[slot] = NO_STATUS_UNTIL
+            unit.status_source_atk[slot] = 0.0
+
+
+def get_status(unit: Unit, status_type: str, now_sec: float) -> float | None:
+    """Returns the active status' source_atk, or None when it is absent or expired."""
+    slot = STATUS_SLOTS[status_type]
+    if unit.status_until[slot] > now_sec:
+        return unit.status_source_atk[slot]
     return None
 
 
-def has_status(unit: dict[str, Any], status_type: str, now_sec: float) -> bool:
-    return get_status(unit, status_type, now_sec) is not None
+def has_status(unit: Unit, status_type: str, now_sec: float) -> bool:
+    return unit.status_until[STATUS_SLOTS[status_type]] > now_sec
 
 
-def apply_status(target: dict[str, Any], status_type: str, duration_sec: float, source_atk: float, now_sec: float) -> bool:
+def apply_status(target: Unit, status_type: str, duration_sec: float, source_atk: float, now_sec: float) -> bool:
     if duration_sec <= 0:
         return False
 
+    # An expired slot that has not been pruned yet still merges, like the old list entry did.
+    slot = STATUS_SLOTS[status_type]
     until_sec = now_sec + duration_sec
-    for effect in target["status_effects"]:
-        if effect["type"] != status_type:
-            continue
-        effect["until_sec"] = max(float(effect["until_sec"]), until_sec)
-        effect["source_atk"] = max(float(effect["source_atk"]), source_atk)
-        return True
-
-    target["status_effects"].append(
-        {
-            "type": status_type,
-            "until_sec": until_sec,
-            "source_atk": max(0.0, source_atk),
-        }
-    )
+    if until_sec > target.status_until[slot]:
+        target.status_until[slot] = until_sec
+    if source_atk > target.status_source_atk[slot]:
+        target.status_source_atk[slot] = source_atk
     return True
 
 
-def current_speed_multiplier(unit: dict[str, Any], now_sec: float) -> float:
-    return 0.75 if has_status(unit, "slow", now_sec) else 1.0
-
-
-def current_atk_multiplier(unit: dict[str, Any], now_sec: float) -> float:
-    return 0.85 if has_status(unit, "weaken", now_sec) else 1.0
+def current_speed_multiplier(unit: Unit, now_sec: float) -> float:
+    return 0.75 if unit.status_until[SLOW_SLOT] > now_sec else 1.0
+
+
+def current_atk_multiplier(unit: Unit, now_sec: float) -> float:
+    return 0.85 if unit.status_until[WEAKEN_SLOT] > now_sec else 1.0
+
+
+def current_def_multiplier(unit: Unit, now_sec: float) -> float:
+    return 0.80 if unit.status_until[ARMOR_BREAK_SLOT] > now_sec else 1.0
+
+
+class ActionLogBuffer:
+    """Columnar action log for one duel.
+
+    Values are stored raw in typed columns with strings interned to small
+    ints; rounding and dict building only happen in rows(), when a report or
+    CSV is written. With a capacity the buffer keeps the first N actions, or
+    the last N when ring=True; overflowed actions are counted in dropped.
+    """
+
+    __slots__ = (
+        "capacity",
+        "ring",
+        "size",
+        "head",
+        "dropped",
+        "strings",
+        "string_ids",
+        "turn",
+        "timestamp_sec",
+        "actor",
+        "actor_id",
+        "target_id",
+        "action_id",
+        "action_name",
+        "damage",
+        "flags",
+        "element_multiplier",
+        "applied_status",
+        "self_heal",
+        "target_hp_after",
+    )
 
+    FLAG_CRIT = 1
+    FLAG_MISS = 2
+    FLAG_STATUS_APPLIED = 4
+
+    def __init__(self, capacity: int | None = None, ring: bool = False):
+        self.capacity = capacity if capacity is not None and capacity > 0 else None
+        self.ring = ring and self.capacity is not None
+        self.size = 0
+        self.head = 0
+        self.dropped = 0
+        self.strings: list[str] = []
+        self.string_ids: dict[str, int] = {}
+        prealloc = self.capacity or 0
+        self.turn = array("l", [0]) * prealloc
+        self.timestamp_sec = array("d", [0.0]) * prealloc
+        self.actor = array("h", [0]) * prealloc
+        self.actor_id = array("h", [0]) * prealloc
+        self.target_id = array("h", [0]) * prealloc
+        self.action_id = array("h", [0]) * prealloc
+        self.action_name = array("h", [0]) * prealloc
+        self.damage = array("q", [0]) * prealloc
+        self.flags = array("b", [0]) * prealloc
+        self.element_multiplier = array("d", [0.0]) * prealloc
+        self.applied_status = array("h", [0]) * prealloc
+        self.self_heal = array("q", [0]) * prealloc
+        self.target_hp_after = array("d", [0.0]) * prealloc
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def action_count(self) -> int:
+        """Actions taken in the duel, including those a cap or ring did not keep."""
+        return self.size + self.dropped
+
+    def intern(self, value: str) -> int:
+        string_id = self.string_ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings.append(value)
+            self.string_ids[value] = string_id
+        return string_id
+
+    def record(
+        self,
+        turn: int,
+        timestamp_sec: float,
+        actor: str,
+        actor_id: str,
+        target_id: str,
+        action_id: str,
+        action_name: str,
+        damage: int,
+        is_crit: bool,
+        is_miss: bool,
+        element_multiplier: float,
+        applied_status: str,
+        status_applied: bool,
+        self_heal: int,
+        target_hp_after: float,
+    ) -> None:
+        flags = (
+            (self.FLAG_CRIT if is_crit else 0)
+            | (self.FLAG_MISS if is_miss else 0)
+            | (self.FLAG_STATUS_APPLIED if status_applied else 0)
+        )
+        values = (
+            turn,
+            timestamp_sec,
+            self.intern(actor),
+            self.intern(actor_id),
+            self.intern(target_id),
+            self.intern(action_id),
+            self.intern(action_name),
+            damage,
+            flags,
+            element_multiplier,
+            self.intern(applied_status),
+            self_heal,
+            target_hp_after,
+        )
+        columns = (
+            self.turn,
+            self.timestamp_sec,
+            self.actor,
+            self.actor_id,
+            self.target_id,
+            self.action_id,
+            self.action_name,
+            self.damage,
+            self.flags,
+            self.element_multiplier,
+            self.applied_status,
+            self.self_heal,
+            self.target_hp_after,
+        )
 
-def current_def_multiplier(unit: dict[str, Any], now_sec: float) -> float:
-    return 0.80 if has_status(unit, "armor_break", now_sec) else 1.0
+        if self.capacity is None:
+            for column, value in zip(columns, values):
+                column.append(value)
+            self.size += 1
+            return
+
+        if self.size < self.capacity:
+            slot = self.size
+            self.size += 1
+        elif self.ring:
+            slot = self.head
+            self.head = (self.head + 1) % self.capacity
+            self.dropped += 1
+        else:
+            self.dropped += 1
+            return
+        for column, value in zip(columns, values):
+            column[slot] = value
+
+    def slot_order(self) -> list[int]:
+        if self.ring and self.dropped:
+            return list(range(self.head, self.size)) + list(range(0, self.head))
+        return list(range(self.size))
+
+    def rows(self) -> list[dict[str, Any]]:
+        strings = self.strings
+        out: list[dict[str, Any]] = []
+        for slot in self.slot_order():
+            flags = self.flags[slot]
+            out.append(
+                {
+                    "turn": self.turn[slot],
+                    "timestamp_sec": to_fixed(self.timestamp_sec[slot], 3),
+                    "actor": strings[self.actor[slot]],
+                    "actor_id": strings[self.actor_id[slot]],
+                    "target_id": strings[self.target_id[slot]],
+                    "action_id": strings[self.action_id[slot]],
+                    "action_name": strings[self.action_name[slot]],
+                    "damage": self.damage[slot],
+                    "is_crit": bool(flags & self.FLAG_CRIT),
+                    "is_miss": bool(flags & self.FLAG_MISS),
+                    "element_multiplier": to_fixed(self.element_multiplier[slot], 4),
+                    "applied_status": strings[self.applied_status[slot]],
+                    "status_applied": bool(flags & self.FLAG_STATUS_APPLIED),
+                    "self_heal": self.self_heal[slot],
+                    "target_hp_after": to_fixed(self.target_hp_after[slot], 2),
+                }
+            )
+        return out
 
 
 def process_start_of_turn_statuses(
-    actor: dict[str, Any],
+    actor: Unit,
     turn: int,
     now_sec: float,
-    include_action_logs: bool,
-) -> tuple[bool, list[dict[str, Any]]]:
-    logs: list[dict[str, Any]] = []
+    logs: ActionLogBuffer | None,
+) -> bool:
     prune_expired_statuses(actor, now_sec)
 
-    burn = get_status(actor, "burn", now_sec)
-    if burn is not None:
-        burn_damage = max(1, js_round_int(float(burn["source_atk"]) * 0.12))
-        actor["hp"] = max(0.0, actor["hp"] - burn_damage)
-        if include_action_logs:
-            logs.append(
-                {
-                    "turn": turn,
-                    "timestamp_sec": to_fixed(now_sec, 3),
-                    "actor": actor["kind"],
-                    "actor_id": actor["id"],
-                    "target_id": actor["id"],
-                    "action_id": "status_burn_tick",
-                    "action_name": "burn_tick",
-                    "damage": int(burn_damage),
-                    "is_crit": False,
-                    "is_miss": False,
-                    "element_multiplier": 1.0,
-                    "applied_status": "",
-                    "status_applied": False,
-                    "self_heal": 0,
-                    "target_hp_after": to_fixed(actor["hp"], 2),
-                }
+    burn_source_atk = get_status(actor, "burn", now_sec)
+    if burn_source_atk is not None:
+        burn_damage = max(1, js_round_int(burn_source_atk * 0.12))
+        actor.hp = max(0.0, actor.hp - burn_damage)
+        if logs is not None:
+            logs.record(
+                turn,
+                now_sec,
+                actor.kind,
+                actor.id,
+                actor.id,
+                "status_burn_tick",
+                "burn_tick",
+                int(burn_damage),
+                False,
+                False,
+                1.0,
+                "",
+                False,
+                0,
+                actor.hp,
             )
 
-    if actor["hp"] <= 0:
-        return True, logs
+    if actor.hp <= 0:
+        return True
 
     if has_status(actor, "stun", now_sec):
-        if include_action_logs:
-            logs.append(
-                {
-                    "turn": turn,
-                    "timestamp_sec": to_fixed(now_sec, 3),
-                    "actor": actor["kind"],
-                    "actor_id": actor["id"],
-                    "target_id": actor["id"],
-                    "action_id": "status_stun_skip",
-                    "action_name": "stun",
-                    "damage": 0,
-                    "is_crit": False,
-                    "is_miss": False,
-                    "element_multiplier": 1.0,
-                    "applied_status": "",
-                    "status_applied": False,
-                    "self_heal": 0,
-                    "target_hp_after": to_fixed(actor["hp"], 2),
-                }
+        if logs is not None:
+            logs.record(
+                turn,
+                now_sec,
+                actor.kind,
+                actor.id,
+                actor.id,
+                "status_stun_skip",
+                "stun",
+                0,
+                False,
+                False,
+                1.0,
+                "",
+                False,
+                0,
+                actor.hp,
             )
-        return True, logs
+        return True
 
-    return False, logs
+    return False
 
 
 def maybe_apply_skill_status(
-    attacker: dict[str, Any],
-    target: dict[str, Any],
+    attacker: Unit,
+    target: Unit,
     skill: dict[str, Any],
     now_sec: float,
     rng: SeededRng,
@@ -703,7 +1160,7 @@ def maybe_apply_skill_status(
         effect,
         clamp(chance_pct / 100.0, 0.0, 1.0),
         duration_sec,
-        attacker["stats"]["atk"],
+        attacker.stats["atk"],
         now_sec,
         rng,
     )
@@ -711,7 +1168,7 @@ def maybe_apply_skill_status(
 
 
 def maybe_apply_status_with_chance(
-    target: dict[str, Any],
+    target: Unit,
     status_type: str,
     chance: float,
     duration_sec: float,
@@ -721,48 +1178,36 @@ def maybe_apply_status_with_chance(
 ) -> bool:
     if chance <= 0 or duration_sec <= 0:
         return False
-    if rng.next() > chance:
+    if rng.status_roll() > chance:
         return False
     return apply_status(target, status_type, duration_sec, source_atk, now_sec)
 
 
 def maybe_apply_monster_on_hit_status(
-    attacker: dict[str, Any],
-    target: dict[str, Any],
-    monster_mechanic_rule: dict[str, Any] | None,
+    attacker: Unit,
+    target: Unit,
+    mechanic: MonsterMechanic,
     now_sec: float,
     rng: SeededRng,
 ) -> tuple[str, bool]:
-    if not monster_mechanic_rule:
-        return "", False
-
-    on_hit = monster_mechanic_rule.get("on_hit_status")
-    if not isinstance(on_hit, dict):
+    if not mechanic.on_hit_status:
         return "", False
 
-    status_type = str(on_hit.get("type", ""))
-    if status_type not in SUPPORTED_STATUSES:
-        return "", False
-
-    chance = clamp(to_float(on_hit.get("chance"), 0.0), 0.0, 1.0)
-    duration_sec = max(0.0, to_float(on_hit.get("duration_sec"), 0.0))
-    source_scale = max(0.0, to_float(on_hit.get("source_atk_scale"), 1.0))
-
     applied = maybe_apply_status_with_chance(
         target,
-        status_type,
-        chance,
-        duration_sec,
-        attacker["stats"]["atk"] * source_scale,
+        mechanic.on_hit_status,
+        mechanic.on_hit_chance,
+        mechanic.on_hit_duration_sec,
+        attacker.stats["atk"] * mechanic.on_hit_source_atk_scale,
         now_sec,
         rng,
     )
-    return status_type, applied
+    return mechanic.on_hit_status, applied
 
 
 def calc_damage(
-    attacker: dict[str, Any],
-    defender: dict[str, Any],
+    attacker: Unit,
+    defender: Unit,
     coeff: float,
     attacker_element: str,
     rng: SeededRng,
@@ -776,41 +1221,80 @@ def calc_damage(
     crit_rate_cap = constants.get("crit_rate_cap", 0.75)
 
     hit_chance = clamp(
-        attacker["stats"]["accuracy"] - defender["stats"]["evasion"] + 0.75,
+        attacker.stats["accuracy"] - defender.stats["evasion"] + 0.75,
         accuracy_floor,
         accuracy_ceiling,
     )
-    if rng.next() > hit_chance:
+    if rng.hit_roll() > hit_chance:
         return 0, False, True, 1.0
 
-    crit_rate = clamp(attacker["stats"]["crit_rate"], 0.0, crit_rate_cap)
-    is_crit = rng.next() < crit_rate
+    crit_rate = clamp(attacker.stats["crit_rate"], 0.0, crit_rate_cap)
+    is_crit = rng.crit_roll() < crit_rate
 
-    defender_def = defender["stats"]["def"] * defender_def_multiplier
-    pen = attacker["stats"]["penetration"]
+    defender_def = defender.stats["def"] * defender_def_multiplier
+    pen = attacker.stats["penetration"]
     def_after_pen = max(0.0, defender_def * (1 - pen))
     def_ratio = def_after_pen / (def_after_pen + defense_constant_k)
 
-    element_multiplier = calc_element_multiplier(attacker_element, defender["element"], constants)
+    element_multiplier = calc_element_multiplier(attacker_element, defender.element, constants)
 
-    damage = attacker["stats"]["atk"] * attacker_atk_multiplier * coeff
+    damage = attacker.stats["atk"] * attacker_atk_multiplier * coeff
     damage *= 1 - def_ratio
-    damage *= 1 - defender["stats"]["damage_reduction"]
+    damage *= 1 - defender.stats["damage_reduction"]
     damage *= element_multiplier
     if is_crit:
-        damage *= 1 + attacker["stats"]["crit_damage"]
+        damage *= 1 + attacker.stats["crit_damage"]
 
-    variance = 0.95 + rng.next() * 0.10
+    variance = 0.95 + rng.variance_roll() * 0.10
     damage *= variance
 
     return max(1, js_round_int(damage)), is_crit, False, element_multiplier
 
 
-def choose_player_skill(player: dict[str, Any], skills: list[dict[str, Any]], now_sec: float) -> dict[str, Any] | None:
+def expected_damage(
+    attacker_stats: dict[str, float],
+    defender_stats: dict[str, float],
+    defender_element: str,
+    coeff: float,
+    attacker_element: str,
+    constants: dict[str, float],
+    attacker_atk_multiplier: float = 1.0,
+    defender_def_multiplier: float = 1.0,
+) -> tuple[float, float]:
+    """Closed-form mean of calc_damage for one attempt: (hit_chance, expected damage).
+
+    Crits enter as 1 + crit_rate * crit_damage and the variance roll by its mean
+    (1.0); the max(1, round()) floor is ignored.
+    """
+    accuracy_floor = constants.get("accuracy_floor", 0.55)
+    accuracy_ceiling = constants.get("accuracy_ceiling", 0.98)
+    defense_constant_k = constants.get("defense_constant_k", 180)
+    crit_rate_cap = constants.get("crit_rate_cap", 0.75)
+
+    hit_chance = clamp(
+        attacker_stats["accuracy"] - defender_stats["evasion"] + 0.75,
+        accuracy_floor,
+        accuracy_ceiling,
+    )
+    crit_rate = clamp(attacker_stats["crit_rate"], 0.0, crit_rate_cap)
+
+    defender_def = defender_stats["def"] * defender_def_multiplier
+    def_after_pen = max(0.0, defender_def * (1 - attacker_stats["penetration"]))
+    def_ratio = def_after_pen / (def_after_pen + defense_constant_k)
+
+    damage = attacker_stats["atk"] * attacker_atk_multiplier * coeff
+    damage *= 1 - def_ratio
+    damage *= 1 - defender_stats["damage_reduction"]
+    damage *= calc_element_multiplier(attacker_element, defender_element, constants)
+    damage *= 1 + crit_rate * attacker_stats["crit_damage"]
+    return hit_chance, hit_chance * damage
+
+
+def choose_player_skill(player: Unit, skills: list[dict[str, Any]], now_sec: float) -> dict[str, Any] | None:
     available = []
     for skill in skills:
-        ready_at = player["cooldown_ready_sec"].get(skill["skill_id"], 0.0)
-        if ready_at <= now_sec and player["mp"] >= skill["cost_mp"]:
+        ready_at = player.cooldown_ready_sec.get(skill["skill_id"], 0.0)
+        if ready_at <= now_sec and player.mp >= skill["cost_mp"]:
             available.append(skill)
 
     if not available:
@@ -820,6 +1304,135 @@ def choose_player_skill(player: dict[str, Any], skills: list[dict[str, Any]], no
     return available[0]
 
 
+def take_turn(
+    actor: Unit,
+    target: Unit,
+    turn: int,
+    now_sec: float,
+    rng: SeededRng,
+    constants: dict[str, float],
+    logs: ActionLogBuffer | None,
+    used_skills: dict[str, int],
+    status_applied_counts: dict[str, int],
+) -> None:
+    """One scheduled action of actor against target, including start-of-turn statuses."""
+    consumed = process_start_of_turn_statuses(actor, turn, now_sec, logs)
+    if actor.hp <= 0:
+        return
+    if consumed:
+        actor.next_action_sec += 1.0 / max(
+            0.2, actor.stats["speed"] * current_speed_multiplier(actor, now_sec)
+        )
+        return
+
+    action_id = "basic_attack"
+    action_name = "basic_attack"
+    coeff = 1.0
+    attack_element = actor.element
+    selected_skill: dict[str, Any] | None = None
+
+    if actor.kind == "player":
+        selected_skill = choose_player_skill(actor, actor.skills, now_sec)
+        if selected_skill is not None:
+            action_id = selected_skill["skill_id"]
+            action_name = selected_skill["name_ko"]
+            coeff = selected_skill["damage_coeff"]
+            attack_element = selected_skill["element"]
+            actor.mp -= selected_skill["cost_mp"]
+            actor.cooldown_ready_sec[selected_skill["skill_id"]] = (
+                now_sec + selected_skill["cooldown_sec"]
+            )
+            used_skills[selected_skill["skill_id"]] = (
+                used_skills.get(selected_skill["skill_id"], 0) + 1
+            )
+        else:
+            actor.mp = min(actor.max_mp, actor.mp + 6)
+
+    effective_coeff = coeff
+    mechanic = actor.mechanic
+    if actor.kind == "monster":
+        first_strike_multiplier = mechanic.first_strike_damage_multiplier
+        if actor.first_strike_pending and first_strike_multiplier > 0:
+            effective_coeff *= first_strike_multiplier
+            actor.first_strike_pending = False
+
+        if mechanic.has_execute_bonus and target.max_hp > 0:
+            target_hp_ratio = target.hp / target.max_hp
+            if target_hp_ratio <= mechanic.execute_target_hp_below_ratio:
+                effective_coeff *= mechanic.execute_damage_multiplier
+
+    damage, is_crit, is_miss, element_multiplier = calc_damage(
+        actor,
+        target,
+        effective_coeff,
+        attack_element,
+        rng,
+        constants,
+        current_atk_multiplier(actor, now_sec),
+        current_def_multiplier(target, now_sec),
+    )
+
+    applied_status = ""
+    status_applied = False
+    self_heal = 0
+    if not is_miss:
+        target.hp = max(0.0, target.hp - damage)
+        if actor.kind == "player" and selected_skill is not None:
+            applied_status, status_applied = maybe_apply_skill_status(
+                actor,
+                target,
+                selected_skill,
+                now_sec,
+                rng,
+            )
+            if applied_status and status_applied:
+                status_applied_counts[applied_status] = (
+                    status_applied_counts.get(applied_status, 0) + 1
+                )
+        elif actor.kind == "monster":
+            applied_status, status_applied = maybe_apply_monster_on_hit_status(
+                actor,
+                target,
+                mechanic,
+                now_sec,
+                rng,
+            )
+            if applied_status and status_applied:
+                status_applied_counts[applied_status] = (
+                    status_applied_counts.get(applied_status, 0) + 1
+                )
+        if actor.kind == "monster":
+            heal_ratio = mechanic.on_hit_heal_ratio
+            if heal_ratio > 0 and damage > 0:
+                heal_amount = max(1, js_round_int(damage * heal_ratio))
+                hp_before_heal = actor.hp
+                actor.hp = min(actor.max_hp, actor.hp + heal_amount)
+                self_heal = max(0, js_round_int(actor.hp - hp_before_heal))
+
+    if logs is not None:
+        logs.record(
+            turn,
+            now_sec,
+            actor.kind,
+            actor.id,
+            target.id,
+            action_id,
+            action_name,
+            int(damage),
+            bool(is_crit),
+            bool(is_miss),
+            element_multiplier,
+            applied_status,
+            bool(status_applied),
+            int(self_heal),
+            target.hp,
+        )
+
+    actor.next_action_sec += 1.0 / max(
+        0.2, actor.stats["speed"] * current_speed_multiplier(actor, now_sec)
+    )
+
+
 def simulate_duel(
     player_stats: dict[str, float],
     monster_row: dict[str, str],
@@ -829,174 +1442,45 @@ def simulate_duel(
     max_turns: int,
     include_action_logs: bool,
     constants: dict[str, float],
+    action_log_cap: int | None = None,
+    action_log_ring: bool = False,
+    common_random_numbers: bool = False,
+    rng: SeededRng | None = None,
 ) -> dict[str, Any]:
-    rng = SeededRng(seed)
-    monster_mechanic_rule = get_monster_mechanic_rule(
-        monster_row.get("special_mechanic", "")
-    )
-
-    player = make_unit("player", "player_01", "cultivator", player_stats, "none")
-    monster = make_unit(
-        "monster",
-        monster_row["monster_id"],
-        monster_row["name_ko"],
-        monster_stats,
-        normalize_element(monster_row["element"]),
-    )
+    """One player vs one monster.
+
+    common_random_numbers draws each side's rolls from DecisionStreams instead
+    of one shared SeededRng, for paired comparisons between variants. rng
+    replaces SeededRng(seed) with an equivalent generator (BlockSeededRng).
+    """
+    if common_random_numbers:
+        rng_by_kind = {"player": DecisionStreams(seed, 0), "monster": DecisionStreams(seed, 1)}
+    else:
+        if rng is None:
+            rng = SeededRng(seed)
+        rng_by_kind = {"player": rng, "monster": rng}
+    player = make_player_unit("player_01", player_stats, skills)
+    monster = make_monster_unit(monster_row, monster_stats)
 
     turn = 0
     now_sec = 0.0
-    logs: list[dict[str, Any]] = []
+    action_log = ActionLogBuffer(action_log_cap, action_log_ring)
+    logs = action_log if include_action_logs else None
     used_skills: dict[str, int] = {}
     status_applied_counts: dict[str, int] = {}
-    monster_first_strike_pending = (
-        to_float(monster_mechanic_rule.get("first_strike_damage_multiplier"), 1.0)
-        if monster_mechanic_rule
-        else 1.0
-    ) > 1.0
 
-    while turn < max_turns and player["hp"] > 0 and monster["hp"] > 0:
-        actor = player if player["next_action_sec"] <= monster["next_action_sec"] else monster
-        target = monster if actor["kind"] == "player" else player
+    while turn < max_turns and player.hp > 0 and monster.hp > 0:
+        actor = player if player.next_action_sec <= monster.next_action_sec else monster
+        target = monster if actor.kind == "player" else player
 
-        now_sec = float(actor["next_action_sec"])
+        now_sec = float(actor.next_action_sec)
         turn += 1
 
-        consumed, status_logs = process_start_of_turn_statuses(actor, turn, now_sec, include_action_logs)
-        if include_action_logs:
-            logs.extend(status_logs)
-        if actor["hp"] <= 0:
-            break
-        if consumed:
-            actor["next_action_sec"] += 1.0 / max(
-                0.2, actor["stats"]["speed"] * current_speed_multiplier(actor, now_sec)
-            )
-            continue
-
-        action_id = "basic_attack"
-        action_name = "basic_attack"
-        coeff = 1.0
-        attack_element = actor["element"]
-        selected_skill: dict[str, Any] | None = None
-
-        if actor["kind"] == "player":
-            selected_skill = choose_player_skill(actor, skills, now_sec)
-            if selected_skill is not None:
-                action_id = selected_skill["skill_id"]
-                action_name = selected_skill["name_ko"]
-                coeff = selected_skill["damage_coeff"]
-                attack_element = selected_skill["element"]
-                actor["mp"] -= selected_skill["cost_mp"]
-                actor["cooldown_ready_sec"][selected_skill["skill_id"]] = (
-                    now_sec + selected_skill["cooldown_sec"]
-                )
-                used_skills[selected_skill["skill_id"]] = (
-                    used_skills.get(selected_skill["skill_id"], 0) + 1
-                )
-            else:
-                actor["mp"] = min(actor["max_mp"], actor["mp"] + 6)
-
-        effective_coeff = coeff
-        if actor["kind"] == "monster":
-            first_strike_multiplier = (
-                to_float(monster_mechanic_rule.get("first_strike_damage_multiplier"), 1.0)
-                if monster_mechanic_rule
-                else 1.0
-            )
-            if monster_first_strike_pending and first_strike_multiplier > 0:
-                effective_coeff *= first_strike_multiplier
-                monster_first_strike_pending = False
-
-            execute_bonus = (
-                monster_mechanic_rule.get("execute_bonus")
-                if monster_mechanic_rule
-                else None
-            )
-            if isinstance(execute_bonus, dict) and target["max_hp"] > 0:
-                target_hp_ratio = target["hp"] / target["max_hp"]
-                threshold = to_float(execute_bonus.get("target_hp_below_ratio"), 0.0)
-                execute_multiplier = to_float(execute_bonus.get("damage_multiplier"), 1.0)
-                if target_hp_ratio <= threshold:
-                    effective_coeff *= execute_multiplier
-
-        damage, is_crit, is_miss, element_multiplier = calc_damage(
-            actor,
-            target,
-            effective_coeff,
-            attack_element,
-            rng,
-            constants,
-            current_atk_multiplier(actor, now_sec),
-            current_def_multiplier(target, now_sec),
-        )
-
-        applied_status = ""
-        status_applied = False
-        self_heal = 0
-        if not is_miss:
-            target["hp"] = max(0.0, target["hp"] - damage)
-            if actor["kind"] == "player" and selected_skill is not None:
-                applied_status, status_applied = maybe_apply_skill_status(
-                    actor,
-                    target,
-                    selected_skill,
-                    now_sec,
-                    rng,
-                )
-                if applied_status and status_applied:
-                    status_applied_counts[applied_status] = (
-                        status_applied_counts.get(applied_status, 0) + 1
-                    )
-            elif actor["kind"] == "monster":
-                applied_status, status_applied = maybe_apply_monster_on_hit_status(
-                    actor,
-                    target,
-                    monster_mechanic_rule,
-                    now_sec,
-                    rng,
-                )
-                if applied_status and status_applied:
-                    status_applied_counts[applied_status] = (
-                        status_applied_counts.get(applied_status, 0) + 1
-                    )
-            if actor["kind"] == "monster" and monster_mechanic_rule:
-                heal_ratio = clamp(
-                    to_float(monster_mechanic_rule.get("on_hit_heal_ratio"), 0.0),
-                    0.0,
-                    1.0,
-                )
-                if heal_ratio > 0 and damage > 0:
-                    heal_amount = max(1, js_round_int(damage * heal_ratio))
-                    hp_before_heal = actor["hp"]
-                    actor["hp"] = min(actor["max_hp"], actor["hp"] + heal_amount)
-                    self_heal = max(0, js_round_int(actor["hp"] - hp_before_heal))
-
-        if include_action_logs:
-            logs.append(
-                {
-                    "turn": turn,
-                    "timestamp_sec": to_fixed(now_sec, 3),
-                    "actor": actor["kind"],
-                    "actor_id": actor["id"],
-                    "target_id": target["id"],
-                    "action_id": action_id,
-                    "action_name": action_name,
-                    "damage": int(damage),
-                    "is_crit": bool(is_crit),
-                    "is_miss": bool(is_miss),
-                    "element_multiplier": to_fixed(element_multiplier, 4),
-                    "applied_status": applied_status,
-                    "status_applied": bool(status_applied),
-                    "self_heal": int(self_heal),
-                    "target_hp_after": to_fixed(target["hp"], 2),
-                }
-            )
-
-        actor["next_action_sec"] += 1.0 / max(
-            0.2, actor["stats"]["speed"] * current_speed_multiplier(actor, now_sec)
+        take_turn(
+            actor, target, turn, now_sec, rng_by_kind[actor.kind], constants, logs, used_skills, status_applied_counts
         )
 
-    winner = "player" if player["hp"] > 0 and monster["hp"] <= 0 else "monster"
+    winner = "player" if player.hp > 0 and monster.hp <= 0 else "monster"
 
     return {
         "monster_id": monster_row["monster_id"],
@@ -1005,174 +1489,1054 @@ def simulate_duel(
         "winner": winner,
         "turns": turn,
         "elapsed_sec": to_fixed(now_sec, 3),
-        "player_hp_left": to_fixed(player["hp"], 2),
-        "monster_hp_left": to_fixed(monster["hp"], 2),
+        "player_hp_left": to_fixed(player.hp, 2),
+        "monster_hp_left": to_fixed(monster.hp, 2),
         "used_skills": used_skills,
         "status_applied_counts": status_applied_counts,
-        "logs": logs,
+        "logs": action_log,
     }
 
 
+def report_duel(duel: dict[str, Any], include_logs: bool = True) -> dict[str, Any]:
+    action_log: ActionLogBuffer = duel["logs"]
+    row = {key: value for key, value in duel.items() if key != "logs"}
+    if include_logs:
+        row["logs"] = action_log.rows()
+    else:
+        row["action_count"] = action_log.action_count
+    if action_log.capacity is not None:
+        row["logs_dropped"] = action_log.dropped
+    return row
+
+
+SUMMARY_FIELDS = (
+    "monster_id",
+    "monster_name_ko",
+    "monster_type",
+    "winner",
+    "turns",
+    "elapsed_sec",
+    "player_hp_left",
+    "monster_hp_left",
+    "used_skills",
+    "status_applied",
+    "action_count",
+)
+TRIAL_FIELDS = (
+    "monster_id",
+    "trial_index",
+    "player_won",
+    "turns",
+    "elapsed_sec",
+    "player_hp_left",
+    "monster_hp_left",
+)
+ACTION_LOG_FIELDS = (
+    "duel_index",
+    "monster_id",
+    "monster_name_ko",
+    "turn",
+    "timestamp_sec",
+    "actor",
+    "actor_id",
+    "target_id",
+    "action_id",
+    "action_name",
+    "damage",
+    "is_crit",
+    "is_miss",
+    "element_multiplier",
+    "applied_status",
+    "status_applied",
+    "self_heal",
+    "target_hp_after",
+)
+
+
+def summary_row(duel: dict[str, Any]) -> dict[str, Any]:
+    used_skill_text = ";".join(
+        f"{skill_id}:{count}" for skill_id, count in sorted(duel["used_skills"].items())
+    )
+    status_text = ";".join(
+        f"{status}:{count}" for status, count in sorted(duel["status_applied_counts"].items())
+    )
+    return {
+        "monster_id": duel["monster_id"],
+        "monster_name_ko": duel["monster_name_ko"],
+        "monster_type": duel["monster_type"],
+        "winner": duel["winner"],
+        "turns": duel["turns"],
+        "elapsed_sec": duel["elapsed_sec"],
+        "player_hp_left": duel["player_hp_left"],
+        "monster_hp_left": duel["monster_hp_left"],
+        "used_skills": used_skill_text,
+        "status_applied": status_text,
+        "action_count": duel["logs"].action_count,
+    }
+
+
+def action_log_rows(duel_index: int, duel: dict[str, Any]) -> list[dict[str, Any]]:
+    return [
+        {
+            "duel_index": duel_index,
+            "monster_id": duel["monster_id"],
+            "monster_name_ko": duel["monster_name_ko"],
+            **log,
+        }
+        for log in duel["logs"].rows()
+    ]
+
+
+def write_report_json(report: dict[str, Any], out_path: Path) -> None:
+    """json.dumps(report, indent=2) output, encoded chunk by chunk straight into the file."""
+    encoder = json.JSONEncoder(ensure_ascii=False, indent=2)
+    with out_path.open("w", encoding="utf-8") as f:
+        for chunk in encoder.iterencode(report):
+            f.write(chunk)
+
+
 def write_summary_csv(duels: list[dict[str, Any]], out_path: Path) -> None:
-    rows = []
-    for duel in duels:
-        used_skill_text = ";".join(
-            f"{skill_id}:{count}" for skill_id, count in sorted(duel["used_skills"].items())
+    with out_path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(SUMMARY_FIELDS))
+        writer.writeheader()
+        for duel in duels:
+            writer.writerow(summary_row(duel))
+
+
+def write_action_log_csv(duels: list[dict[str, Any]], out_path: Path) -> int:
+    row_count = 0
+    with out_path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(ACTION_LOG_FIELDS))
+        writer.writeheader()
+        for duel_index, duel in enumerate(duels, start=1):
+            rows = action_log_rows(duel_index, duel)
+            writer.writerows(rows)
+            row_count += len(rows)
+
+    return row_count
+
+
+def trial_seed(base_seed: int, monster_index: int, trial_index: int) -> int:
+    return base_seed + monster_index * MONSTER_SEED_STRIDE + trial_index * TRIAL_SEED_STRIDE
+
+
+def trial_seeds(
+    base_seed: int,
+    monster_index: int,
+    monster_id: str,
+    trial_start: int,
+    trial_end: int,
+    seed_scheme: str = "stride",
+) -> list[int]:
+    if seed_scheme == "stream":
+        stream = RngStream(base_seed, ("combat", monster_id))
+        return [stream.child(trial_index).seed32() for trial_index in range(trial_start, trial_end)]
+    return [trial_seed(base_seed, monster_index, trial_index) for trial_index in range(trial_start, trial_end)]
+
+
+def resolve_jobs(raw_jobs: int) -> int:
+    if raw_jobs <= 0:
+        return max(1, os.cpu_count() or 1)
+    return raw_jobs
+
+
+def run_trial_chunk(task: dict[str, Any]) -> list[tuple[bool, int, float, float, float]]:
+    seeds = trial_seeds(
+        task["base_seed"],
+        task["monster_index"],
+        task["monster_row"]["monster_id"],
+        task["trial_start"],
+        task["trial_end"],
+        task.get("seed_scheme", "stride"),
+    )
+    if task["engine"] == "lockstep":
+        from combat_lockstep_kernel_v1 import simulate_duels_lockstep
+
+        columns = simulate_duels_lockstep(
+            task["player_stats"],
+            task["monster_row"],
+            task["monster_stats"],
+            task["skills"],
+            seeds,
+            task["max_turns"],
+            task["constants"],
         )
-        status_text = ";".join(
-            f"{status}:{count}" for status, count in sorted(duel["status_applied_counts"].items())
+        return [
+            (
+                bool(columns["player_won"][lane]),
+                int(columns["turns"][lane]),
+                to_fixed(float(columns["elapsed_sec"][lane]), 3),
+                to_fixed(float(columns["player_hp_left"][lane]), 2),
+                to_fixed(float(columns["monster_hp_left"][lane]), 2),
+            )
+            for lane in range(len(seeds))
+        ]
+
+    common_random_numbers = task.get("common_random_numbers", False)
+    if task.get("block_rng", BLOCK_RNG_DEFAULT) and not common_random_numbers:
+        from seeded_rng_block_v1 import iter_block_rngs
+
+        rngs: Any = iter_block_rngs(seeds)
+    else:
+        rngs = [None] * len(seeds)
+
+    out: list[tuple[bool, int, float, float, float]] = []
+    for seed, rng in zip(seeds, rngs):
+        duel = simulate_duel(
+            task["player_stats"],
+            task["monster_row"],
+            task["monster_stats"],
+            task["skills"],
+            seed,
+            task["max_turns"],
+            False,
+            task["constants"],
+            common_random_numbers=common_random_numbers,
+            rng=rng,
         )
-        rows.append(
-            {
-                "monster_id": duel["monster_id"],
-                "monster_name_ko": duel["monster_name_ko"],
-                "monster_type": duel["monster_type"],
-                "winner": duel["winner"],
-                "turns": duel["turns"],
-                "elapsed_sec": duel["elapsed_sec"],
-                "player_hp_left": duel["player_hp_left"],
-                "monster_hp_left": duel["monster_hp_left"],
-                "used_skills": used_skill_text,
-                "status_applied": status_text,
-                "action_count": len(duel["logs"]),
-            }
+        out.append(
+            (
+                duel["winner"] == "player",
+                int(duel["turns"]),
+                float(duel["elapsed_sec"]),
+                float(duel["player_hp_left"]),
+                float(duel["monster_hp_left"]),
+            )
         )
+    return out
 
-    with out_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
-        writer.writeheader()
-        writer.writerows(rows)
 
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    lo = math.floor(rank)
+    hi = math.ceil(rank)
+    if lo == hi:
+        return float(sorted_values[lo])
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (rank - lo)
+
+
+def wilson_interval(wins: int, total: int, z: float = WIN_RATE_CI_Z) -> tuple[float, float]:
+    if total <= 0:
+        return 0.0, 1.0
+    p = wins / total
+    denom = 1 + z * z / total
+    center = (p + z * z / (2 * total)) / denom
+    half = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def distribution_summary(values: list[float], digits: int) -> dict[str, float]:
+    ordered = sorted(values)
+    out = {"mean": to_fixed(sum(ordered) / len(ordered), digits) if ordered else 0.0}
+    for pct in TRIAL_PERCENTILES:
+        out[f"p{pct}"] = to_fixed(percentile(ordered, pct), digits)
+    return out
 
-def write_action_log_csv(duels: list[dict[str, Any]], out_path: Path) -> int:
-    rows: list[dict[str, Any]] = []
-    for duel_index, duel in enumerate(duels, start=1):
-        for log in duel["logs"]:
-            rows.append(
+
+def summarize_trials(
+    monster_row: dict[str, str],
+    results: list[tuple[bool, int, float, float, float]],
+) -> dict[str, Any]:
+    total = len(results)
+    wins = sum(1 for r in results if r[0])
+    ci_low, ci_high = wilson_interval(wins, total)
+    return {
+        "monster_id": monster_row["monster_id"],
+        "monster_name_ko": monster_row["name_ko"],
+        "monster_type": monster_row["type"],
+        "trials": total,
+        "wins": wins,
+        "win_rate": to_fixed(wins / total, 6) if total else 0.0,
+        "win_rate_ci_low": to_fixed(ci_low, 6),
+        "win_rate_ci_high": to_fixed(ci_high, 6),
+        "turns": distribution_summary([float(r[1]) for r in results], 2),
+        "elapsed_sec": distribution_summary([r[2] for r in results], 3),
+        "player_hp_left": distribution_summary([r[3] for r in results], 2),
+        "monster_hp_left": distribution_summary([r[4] for r in results], 2),
+    }
+
+
+class RunningStats:
+    """Welford running mean/variance."""
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def ci_half_width(self, z: float = WIN_RATE_CI_Z) -> float:
+        if self.count < 2:
+            return math.inf
+        return z * math.sqrt(self.variance / self.count)
+
+
+def run_adaptive_trials(task: dict[str, Any]) -> tuple[list[tuple[bool, int, float, float, float]], str]:
+    """Run trial batches until every set target holds; an unset (<= 0) target counts as met.
+
+    target_ci: Wilson win-rate CI width. target_ttk_rel_ci: TTK (elapsed_sec of
+    winning duels, Welford stats) 95% CI half-width relative to its mean.
+    Batches follow trial_index order, so the stopping point and results do not
+    depend on --jobs. Returns the results and "target_ci" or "cap".
+    """
+    target_ci = task.get("target_ci", 0.0)
+    target_ttk_rel_ci = task.get("target_ttk_rel_ci", 0.0)
+    ttk_stats = RunningStats()
+    wins = 0
+    results: list[tuple[bool, int, float, float, float]] = []
+
+    start = task["trial_start"]
+    while start < task["trial_end"]:
+        end = min(task["trial_end"], start + ADAPTIVE_BATCH_SIZE)
+        batch = run_trial_chunk({**task, "trial_start": start, "trial_end": end})
+        for row in batch:
+            if row[0]:
+                wins += 1
+                ttk_stats.add(row[2])
+        results.extend(batch)
+        start = end
+
+        ci_low, ci_high = wilson_interval(wins, len(results))
+        win_converged = target_ci <= 0 or ci_high - ci_low <= target_ci
+        ttk_converged = target_ttk_rel_ci <= 0 or ttk_stats.ci_half_width() <= target_ttk_rel_ci * ttk_stats.mean
+        if win_converged and ttk_converged:
+            return results, "target_ci"
+
+    return results, "cap"
+
+
+# on_trials(monster_row, trial_start, rows): one finished chunk of (won, turns, elapsed, hp_left, mob_hp_left).
+TrialCallback = Callable[[dict[str, str], int, list[tuple[bool, int, float, float, float]]], None]
+
+
+def trial_rows(
+    monster_row: dict[str, str],
+    trial_start: int,
+    rows: list[tuple[bool, int, float, float, float]],
+) -> list[dict[str, Any]]:
+    return [
+        {
+            "monster_id": monster_row["monster_id"],
+            "trial_index": trial_start + offset,
+            "player_won": int(won),
+            "turns": turns,
+            "elapsed_sec": elapsed,
+            "player_hp_left": player_hp,
+            "monster_hp_left": monster_hp,
+        }
+        for offset, (won, turns, elapsed, player_hp, monster_hp) in enumerate(rows)
+    ]
+
+
+def run_monte_carlo(
+    player_stats: dict[str, float],
+    monsters: list[dict[str, str]],
+    skills: list[dict[str, Any]],
+    constants: dict[str, float],
+    config: dict[str, Any],
+    trials: int,
+    jobs: int,
+    engine: str = "scalar",
+    target_ci: float = 0.0,
+    target_ttk_rel_ci: float = 0.0,
+    on_trials: TrialCallback | None = None,
+) -> list[dict[str, Any]]:
+    """Per-monster trial summaries; on_trials sees every chunk as it finishes, in task order."""
+    if target_ci > 0 or target_ttk_rel_ci > 0:
+        return run_adaptive_monte_carlo(
+            player_stats,
+            monsters,
+            skills,
+            constants,
+            config,
+            trials,
+            jobs,
+            engine,
+            target_ci,
+            target_ttk_rel_ci,
+            on_trials,
+        )
+
+    chunk_size = max(1, math.ceil(trials / (jobs * TRIAL_CHUNKS_PER_JOB)))
+    tasks: list[dict[str, Any]] = []
+    for idx, monster in enumerate(monsters):
+        monster_stats = build_monster_stats(player_stats, monster, constants)
+        for start in range(0, trials, chunk_size):
+            tasks.append(
                 {
-                    "duel_index": duel_index,
-                    "monster_id": duel["monster_id"],
-                    "monster_name_ko": duel["monster_name_ko"],
-                    **log,
+                    "player_stats": player_stats,
+                    "monster_row": monster,
+                    "monster_stats": monster_stats,
+                    "skills": skills,
+                    "constants": constants,
+                    "base_seed": config["seed"],
+                    "monster_index": idx,
+                    "trial_start": start,
+                    "trial_end": min(trials, start + chunk_size),
+                    "max_turns": config["max_turns"],
+                    "engine": engine,
+                    "seed_scheme": config.get("seed_scheme", "stride"),
                 }
             )
 
-    if not rows:
-        with out_path.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(
-                [
-                    "duel_index",
-                    "monster_id",
-                    "monster_name_ko",
-                    "turn",
-                    "timestamp_sec",
-                    "actor",
-                    "actor_id",
-                    "target_id",
-                    "action_id",
-                    "action_name",
-                    "damage",
-                    "is_crit",
-                    "is_miss",
-                    "element_multiplier",
-                    "applied_status",
-                    "status_applied",
-                    "self_heal",
-                    "target_hp_after",
-                ]
-            )
-        return 0
+    per_monster: list[list[tuple[bool, int, float, float, float]]] = [[] for _ in monsters]
+
+    def collect(chunk_results: Any) -> None:
+        # Consumed lazily: each chunk is handed to on_trials before the next one is awaited.
+        for task, rows in zip(tasks, chunk_results):
+            if on_trials is not None:
+                on_trials(task["monster_row"], task["trial_start"], rows)
+            per_monster[task["monster_index"]].extend(rows)
+
+    if jobs == 1:
+        collect(map(run_trial_chunk, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            collect(executor.map(run_trial_chunk, tasks))
+
+    return [summarize_trials(monster, per_monster[idx]) for idx, monster in enumerate(monsters)]
+
+
+def run_adaptive_monte_carlo(
+    player_stats: dict[str, float],
+    monsters: list[dict[str, str]],
+    skills: list[dict[str, Any]],
+    constants: dict[str, float],
+    config: dict[str, Any],
+    trials: int,
+    jobs: int,
+    engine: str,
+    target_ci: float,
+    target_ttk_rel_ci: float,
+    on_trials: TrialCallback | None = None,
+) -> list[dict[str, Any]]:
+    """One adaptive run per monster, with --trials as the hard cap."""
+    tasks = [
+        {
+            "player_stats": player_stats,
+            "monster_row": monster,
+            "monster_stats": build_monster_stats(player_stats, monster, constants),
+            "skills": skills,
+            "constants": constants,
+            "base_seed": config["seed"],
+            "monster_index": idx,
+            "trial_start": 0,
+            "trial_end": trials,
+            "max_turns": config["max_turns"],
+            "engine": engine,
+            "target_ci": target_ci,
+            "target_ttk_rel_ci": target_ttk_rel_ci,
+            "seed_scheme": config.get("seed_scheme", "stride"),
+        }
+        for idx, monster in enumerate(monsters)
+    ]
+
+    matchups = []
+
+    def collect(outcomes: Any) -> None:
+        for monster, (results, stopped_by) in zip(monsters, outcomes):
+            if on_trials is not None:
+                on_trials(monster, 0, results)
+            matchup = summarize_trials(monster, results)
+            matchup["stopped_by"] = stopped_by
+            matchups.append(matchup)
+
+    if jobs == 1:
+        collect(map(run_adaptive_trials, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            collect(executor.map(run_adaptive_trials, tasks))
+    return matchups
+
+
+def write_monte_carlo_csv(matchups: list[dict[str, Any]], out_path: Path) -> None:
+    rows = []
+    for matchup in matchups:
+        row: dict[str, Any] = {
+            "monster_id": matchup["monster_id"],
+            "monster_name_ko": matchup["monster_name_ko"],
+            "monster_type": matchup["monster_type"],
+            "trials": matchup["trials"],
+            "wins": matchup["wins"],
+            "win_rate": matchup["win_rate"],
+            "win_rate_ci_low": matchup["win_rate_ci_low"],
+            "win_rate_ci_high": matchup["win_rate_ci_high"],
+        }
+        if "stopped_by" in matchup:
+            row["stopped_by"] = matchup["stopped_by"]
+        for metric in ("turns", "elapsed_sec", "player_hp_left", "monster_hp_left"):
+            for key, value in matchup[metric].items():
+                row[f"{metric}_{key}"] = value
+        rows.append(row)
 
     with out_path.open("w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
         writer.writeheader()
         writer.writerows(rows)
 
-    return len(rows)
-
 
-def main() -> None:
-    args = parse_args()
-    config = build_config(args)
+class CombatProfiler:
+    """Opt-in per-phase timers for the scalar duel loop (--profile).
+
+    While active, the PROFILE_PHASES and PROFILE_SUB_PHASES functions in this
+    module (plus simulate_duel and ActionLogBuffer.record) are swapped for
+    wrappers that add perf_counter_ns() deltas and call counts; exiting
+    restores the originals, so unprofiled runs execute exactly the code they
+    always did. Phases are exclusive (logging inside status counts only as
+    logging), so their shares do not overlap; sub-phases stay inside the
+    phase that called them and are broken down by that parent.
+    """
+
+    def __init__(self) -> None:
+        self.ns = {phase: 0 for phase, _ in PROFILE_PHASES}
+        self.ns["logging"] = 0
+        self.calls = dict.fromkeys(self.ns, 0)
+        self.sub_ns = {phase: 0 for phase, _ in PROFILE_SUB_PHASES}
+        self.sub_calls = dict.fromkeys(self.sub_ns, 0)
+        # sub_calls_by_parent[sub][parent]: parent is a phase, or "duel" for the duel body itself.
+        self.sub_calls_by_parent: dict[str, dict[str, int]] = {phase: {} for phase in self.sub_ns}
+        self.duels = 0
+        self.turns = 0
+        self.duel_ns = 0
+        self._active: list[str] = []
+        self._saved: list[tuple[Any, str, Any]] = []
+
+    def _timed(self, phase: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        ns = self.ns
+        calls = self.calls
+        active = self._active
+        clock = time.perf_counter_ns
+
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            active.append(phase)
+            started = clock()
+            result = fn(*args, **kwargs)
+            elapsed = clock() - started
+            active.pop()
+            ns[phase] += elapsed
+            calls[phase] += 1
+            if active:
+                # Keep phases exclusive: a nested phase's time is not also the caller's.
+                ns[active[-1]] -= elapsed
+            return result
+
+        return timed
+
+    def _timed_sub(self, phase: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        by_parent = self.sub_calls_by_parent[phase]
+        active = self._active
+        clock = time.perf_counter_ns
+
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            started = clock()
+            result = fn(*args, **kwargs)
+            self.sub_ns[phase] += clock() - started
+            self.sub_calls[phase] += 1
+            parent = active[-1] if active else "duel"
+            by_parent[parent] = by_parent.get(parent, 0) + 1
+            return result
+
+        return timed
+
+    def _timed_duel(self, fn: Callable[..., dict[str, Any]]) -> Callable[..., dict[str, Any]]:
+        clock = time.perf_counter_ns
+
+        def timed(*args: Any, **kwargs: Any) -> dict[str, Any]:
+            started = clock()
+            duel = fn(*args, **kwargs)
+            self.duel_ns += clock() - started
+            self.duels += 1
+            self.turns += duel["turns"]
+            return duel
+
+        return timed
+
+    def _swap(self, owner: Any, name: str, wrapper: Callable[..., Any]) -> None:
+        if isinstance(owner, dict):
+            self._saved.append((owner, name, owner[name]))
+            owner[name] = wrapper
+        else:
+            self._saved.append((owner, name, getattr(owner, name)))
+            setattr(owner, name, wrapper)
+
+    def __enter__(self) -> "CombatProfiler":
+        module = globals()
+        for phase, names in PROFILE_PHASES:
+            for name in names:
+                self._swap(module, name, self._timed(phase, module[name]))
+        for phase, names in PROFILE_SUB_PHASES:
+            for name in names:
+                self._swap(module, name, self._timed_sub(phase, module[name]))
+        self._swap(ActionLogBuffer, "record", self._timed("logging", ActionLogBuffer.record))
+        self._swap(module, "simulate_duel", self._timed_duel(module["simulate_duel"]))
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        while self._saved:
+            owner, name, original = self._saved.pop()
+            if isinstance(owner, dict):
+                owner[name] = original
+            else:
+                setattr(owner, name, original)
+
+    @staticmethod
+    def timer_overhead_ns() -> float:
+        """Cost one wrapper adds to a call; report() subtracts it per call."""
+        probe = CombatProfiler()
+        timed = probe._timed("status", abs)
+        clock = time.perf_counter_ns
+        started = clock()
+        for _ in range(PROFILE_CALIBRATION_CALLS):
+            abs(0)
+        bare_ns = clock() - started
+        started = clock()
+        for _ in range(PROFILE_CALIBRATION_CALLS):
+            timed(0)
+        return max(0.0, (clock() - started - bare_ns) / PROFILE_CALIBRATION_CALLS)
+
+    def report(self) -> dict[str, Any]:
+        """Timings with the wrapper overhead of every timed call taken out."""
+        overhead = self.timer_overhead_ns()
+        sub_calls_in = {phase: 0 for phase in self.ns}
+        for by_parent in self.sub_calls_by_parent.values():
+            for parent, count in by_parent.items():
+                if parent in sub_calls_in:
+                    sub_calls_in[parent] += count
+        # A phase pays for its own wrappers and for the sub-phase wrappers it contains.
+        phase_ns = {
+            phase: max(0.0, self.ns[phase] - (self.calls[phase] + sub_calls_in[phase]) * overhead)
+            for phase in self.ns
+        }
+        sub_ns = {phase: max(0.0, self.sub_ns[phase] - self.sub_calls[phase] * overhead) for phase in self.sub_ns}
+        wrapped_calls = sum(self.calls.values()) + sum(self.sub_calls.values())
+        duel_ns = max(0.0, self.duel_ns - wrapped_calls * overhead)
+        duel_sec = duel_ns / 1e9
+
+        def timing(ns: float, calls: int) -> dict[str, Any]:
+            return {
+                "calls": calls,
+                "ns": round(ns),
+                "ns_per_call": to_fixed(ns / calls, 1) if calls else 0.0,
+                "share_of_duel": to_fixed(ns / duel_ns, 4) if duel_ns else 0.0,
+            }
 
-    OUT_DIR.mkdir(parents=True, exist_ok=True)
+        return {
+            "duels": self.duels,
+            "turns": self.turns,
+            "duel_ns": round(duel_ns),
+            "duels_per_sec": to_fixed(self.duels / duel_sec, 1) if duel_sec > 0 else None,
+            "turns_per_sec": to_fixed(self.turns / duel_sec, 1) if duel_sec > 0 else None,
+            "timer_overhead_ns_per_call": to_fixed(overhead, 1),
+            "timed_calls": wrapped_calls,
+            "phases": {phase: timing(phase_ns[phase], self.calls[phase]) for phase in self.ns},
+            "sub_phases": {
+                phase: {
+                    **timing(sub_ns[phase], self.sub_calls[phase]),
+                    "calls_by_parent": dict(sorted(self.sub_calls_by_parent[phase].items())),
+                }
+                for phase in self.sub_ns
+            },
+        }
 
-    progression_rows = read_csv_rows(PROGRESSION_CSV)
-    stat_growth_rows = read_csv_rows(STAT_GROWTH_CSV)
-    combat_constant_rows = read_csv_rows(COMBAT_CONSTANTS_CSV)
-    skill_rows = read_csv_rows(SKILLS_CSV)
-    monster_rows = read_csv_rows(MONSTERS_CSV)
 
-    progression = get_progression_row(progression_rows, config["difficulty_index"])
-    stat_rows = stat_rows_by_id(stat_growth_rows)
-    constants = combat_constants_by_key(combat_constant_rows)
+@dataclass(frozen=True)
+class CombatTables:
+    """The five balance tables, read once and shared by every CombatEngine.run()."""
+
+    progression_rows: list[dict[str, str]]
+    stat_rows: dict[str, dict[str, str]]
+    constants: dict[str, float]
+    skill_rows: list[dict[str, str]]
+    monster_rows: list[dict[str, str]]
+
+    @classmethod
+    def load(cls) -> "CombatTables":
+        return cls(
+            read_csv_rows(PROGRESSION_CSV),
+            stat_rows_by_id(read_csv_rows(STAT_GROWTH_CSV)),
+            combat_constants_by_key(read_csv_rows(COMBAT_CONSTANTS_CSV)),
+            read_csv_rows(SKILLS_CSV),
+            read_csv_rows(MONSTERS_CSV),
+        )
 
-    player_stats = build_player_stats(stat_rows, progression, config, constants)
-    skills = pick_skills(skill_rows, config)
-    monsters = pick_monsters(monster_rows, config)
 
-    duels: list[dict[str, Any]] = []
-    for idx, monster in enumerate(monsters):
-        duel_seed = config["seed"] + idx * 1009
-        monster_stats = build_monster_stats(player_stats, monster, constants)
-        duels.append(
-            simulate_duel(
+@dataclass
+class CombatReport:
+    """In-memory result of CombatEngine.run(); to_dict() is the report JSON."""
+
+    config: dict[str, Any]
+    context: dict[str, Any]
+    player_stats: dict[str, float]
+    skills: list[dict[str, Any]]
+    duels: list[dict[str, Any]]
+    summary: dict[str, Any]
+    monte_carlo: dict[str, Any] | None = None
+    profile: dict[str, Any] | None = None
+
+    @property
+    def matchups(self) -> list[dict[str, Any]]:
+        return self.monte_carlo["matchups"] if self.monte_carlo else []
+
+    def to_dict(self) -> dict[str, Any]:
+        report = {
+            "config": self.config,
+            "context": self.context,
+            "player": {
+                "stats": {k: to_fixed(v, 4) for k, v in self.player_stats.items()},
+                "skills": self.skills,
+            },
+            "duels": [report_duel(duel) if "logs" in duel else duel for duel in self.duels],
+            "summary": self.summary,
+        }
+        if self.monte_carlo is not None:
+            report["monte_carlo"] = self.monte_carlo
+        if self.profile is not None:
+            report["profile"] = self.profile
+        return report
+
+
+class CombatEngine:
+    """Library entry point: CombatEngine(CombatTables.load()).run(config) -> CombatReport.
+
+    config uses the build_config keys (difficulty_index, player_level,
+    rebirth_count, seed, max_turns, skill_ids, monster_ids, optional
+    include_action_logs / seed_scheme). Nothing is written to disk.
+    """
+
+    def __init__(self, tables: CombatTables):
+        self.tables = tables
+
+    def player_stats(self, config: dict[str, Any]) -> dict[str, float]:
+        progression = get_progression_row(self.tables.progression_rows, config["difficulty_index"])
+        return build_player_stats(self.tables.stat_rows, progression, config, self.tables.constants)
+
+    def skills(self, config: dict[str, Any]) -> list[dict[str, Any]]:
+        return pick_skills(self.tables.skill_rows, config)
+
+    def monsters(self, config: dict[str, Any]) -> list[dict[str, str]]:
+        return pick_monsters(self.tables.monster_rows, config)
+
+    def run(
+        self,
+        config: dict[str, Any],
+        trials: int = 1,
+        jobs: int = 1,
+        engine: str = "scalar",
+        target_ci: float = 0.0,
+        target_ttk_rel_ci: float = 0.0,
+        action_log_cap: int | None = None,
+        action_log_ring: bool = False,
+        on_duel: Callable[[int, dict[str, Any]], dict[str, Any]] | None = None,
+        profile: bool = False,
+        on_trials: TrialCallback | None = None,
+    ) -> CombatReport:
+        """Seeded duels against the configured monsters, plus Monte Carlo when trials > 1.
+
+        on_duel(duel_index, duel) may consume a duel as it finishes and return
+        the dict kept in the report (the streaming writer drops its logs).
+        on_trials(monster_row, trial_start, rows) receives each finished chunk
+        of Monte Carlo trial results (see run_monte_carlo).
+        profile times both under CombatProfiler; it needs the scalar engine and
+        one process, since worker processes and the NumPy kernel are not wrapped.
+        """
+        # Fail here rather than with an ImportError from inside a worker task.
+        if engine == "lockstep" and importlib.util.find_spec("numpy") is None:
+            raise SystemExit("--engine lockstep requires numpy (pip install numpy)")
+        if not profile:
+            return self._run(
+                config,
+                trials,
+                jobs,
+                engine,
+                target_ci,
+                target_ttk_rel_ci,
+                action_log_cap,
+                action_log_ring,
+                on_duel,
+                on_trials,
+            )
+        if engine != "scalar" or jobs != 1:
+            raise SystemExit("profile needs engine=scalar and jobs=1")
+        with CombatProfiler() as profiler:
+            report = self._run(
+                config,
+                trials,
+                jobs,
+                engine,
+                target_ci,
+                target_ttk_rel_ci,
+                action_log_cap,
+                action_log_ring,
+                on_duel,
+                on_trials,
+            )
+        report.profile = profiler.report()
+        return report
+
+    def _run(
+        self,
+        config: dict[str, Any],
+        trials: int,
+        jobs: int,
+        engine: str,
+        target_ci: float,
+        target_ttk_rel_ci: float,
+        action_log_cap: int | None,
+        action_log_ring: bool,
+        on_duel: Callable[[int, dict[str, Any]], dict[str, Any]] | None,
+        on_trials: TrialCallback | None = None,
+    ) -> CombatReport:
+        constants = self.tables.constants
+        progression = get_progression_row(self.tables.progression_rows, config["difficulty_index"])
+        player_stats = build_player_stats(self.tables.stat_rows, progression, config, constants)
+        skills = self.skills(config)
+        monsters = self.monsters(config)
+
+        duels: list[dict[str, Any]] = []
+        for idx, monster in enumerate(monsters):
+            duel_seed = trial_seeds(
+                config["seed"], idx, monster["monster_id"], 0, 1, config.get("seed_scheme", "stride")
+            )[0]
+            monster_stats = build_monster_stats(player_stats, monster, constants)
+            duel = simulate_duel(
                 player_stats,
                 monster,
                 monster_stats,
                 skills,
                 duel_seed,
                 config["max_turns"],
-                config["include_action_logs"],
+                config.get("include_action_logs", True),
                 constants,
+                action_log_cap,
+                action_log_ring,
             )
+            if on_duel is not None:
+                duel = on_duel(idx + 1, duel)
+            duels.append(duel)
+
+        wins = sum(1 for d in duels if d["winner"] == "player")
+        report = CombatReport(
+            config=config,
+            context={
+                "world": progression["world"],
+                "major_stage_name": progression["major_stage_name"],
+                "sub_stage_name": progression["sub_stage_name"],
+                "difficulty_index": int(progression["difficulty_index"]),
+                "defense_constant_k": constants.get("defense_constant_k", 180),
+            },
+            player_stats=player_stats,
+            skills=skills,
+            duels=duels,
+            summary={
+                "total": len(duels),
+                "wins": wins,
+                "losses": len(duels) - wins,
+                "win_rate": wins / len(duels),
+                "avg_turns": to_fixed(sum(float(d["turns"]) for d in duels) / len(duels), 2),
+                "avg_elapsed_sec": to_fixed(sum(float(d["elapsed_sec"]) for d in duels) / len(duels), 3),
+            },
         )
 
-    wins = sum(1 for d in duels if d["winner"] == "player")
-    avg_turns = to_fixed(sum(float(d["turns"]) for d in duels) / len(duels), 2)
-    avg_elapsed_sec = to_fixed(sum(float(d["elapsed_sec"]) for d in duels) / len(duels), 3)
-
-    report = {
-        "config": config,
-        "context": {
-            "world": progression["world"],
-            "major_stage_name": progression["major_stage_name"],
-            "sub_stage_name": progression["sub_stage_name"],
-            "difficulty_index": int(progression["difficulty_index"]),
-            "defense_constant_k": constants.get("defense_constant_k", 180),
-        },
-        "player": {
-            "stats": {k: to_fixed(v, 4) for k, v in player_stats.items()},
-            "skills": skills,
-        },
-        "duels": duels,
-        "summary": {
-            "total": len(duels),
-            "wins": wins,
-            "losses": len(duels) - wins,
-            "win_rate": wins / len(duels),
-            "avg_turns": avg_turns,
-            "avg_elapsed_sec": avg_elapsed_sec,
-        },
-    }
+        trials = max(1, trials)
+        if trials > 1:
+            target_ci = max(0.0, target_ci)
+            target_ttk_rel_ci = max(0.0, target_ttk_rel_ci)
+            matchups = run_monte_carlo(
+                player_stats,
+                monsters,
+                skills,
+                constants,
+                config,
+                trials,
+                jobs,
+                engine,
+                target_ci,
+                target_ttk_rel_ci,
+                on_trials,
+            )
+            report.monte_carlo = {
+                "trials_per_monster": trials,
+                "jobs": jobs,
+                "engine": engine,
+                "win_rate_ci_z": WIN_RATE_CI_Z,
+                "matchups": matchups,
+            }
+            if target_ci > 0 or target_ttk_rel_ci > 0:
+                trials_used = sum(matchup["trials"] for matchup in matchups)
+                report.monte_carlo["adaptive"] = {
+                    "target_ci": target_ci,
+                    "target_ttk_rel_ci": target_ttk_rel_ci,
+                    "batch_size": ADAPTIVE_BATCH_SIZE,
+                    "trials_cap_total": trials * len(matchups),
+                    "trials_used_total": trials_used,
+                    "trials_saved": trials * len(matchups) - trials_used,
+                }
+        return report
 
-    OUT_REPORT_JSON.write_text(
-        json.dumps(report, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
-    write_summary_csv(duels, OUT_SUMMARY_CSV)
-    action_count = write_action_log_csv(duels, OUT_ACTION_LOG_CSV)
+
+def main() -> None:
+    args = parse_args()
+    config = build_config(args)
+
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    summary_stream = None
+    action_log_stream = None
+    trial_stream = None
+    on_duel = None
+    on_trials = None
+    jobs = resolve_jobs(args.jobs)
+    if args.profile and args.engine != "scalar":
+        raise SystemExit("--profile times the scalar engine; drop --engine lockstep")
+    if args.profile and jobs > 1:
+        print(f"profile: running --trials in-process (--jobs {jobs} -> 1)")
+        jobs = 1
+
+    # Writers close on any exit path, so every gzip member already written stays complete.
+    with ExitStack() as streams:
+        if args.stream_format:
+            from combat_stream_writer_v1 import StreamTableWriter, stream_path
+
+            summary_stream = streams.enter_context(
+                StreamTableWriter(
+                    stream_path(OUT_SUMMARY_STREAM_BASE, args.stream_format, args.gzip),
+                    SUMMARY_FIELDS,
+                    args.stream_format,
+                    args.gzip,
+                )
+            )
+            action_log_stream = streams.enter_context(
+                StreamTableWriter(
+                    stream_path(OUT_ACTION_LOG_STREAM_BASE, args.stream_format, args.gzip),
+                    ACTION_LOG_FIELDS,
+                    args.stream_format,
+                    args.gzip,
+                    OUT_ACTION_LOG_INDEX_CSV,
+                )
+            )
+
+            def on_duel(duel_index: int, duel: dict[str, Any]) -> dict[str, Any]:
+                summary_stream.write_block(duel_index, duel["monster_id"], [summary_row(duel)])
+                action_log_stream.write_block(duel_index, duel["monster_id"], action_log_rows(duel_index, duel))
+                return report_duel(duel, include_logs=False)
+
+            if args.trials > 1:
+                trial_stream = streams.enter_context(
+                    StreamTableWriter(
+                        stream_path(OUT_TRIAL_STREAM_BASE, args.stream_format, args.gzip),
+                        TRIAL_FIELDS,
+                        args.stream_format,
+                        args.gzip,
+                    )
+                )
+
+                def on_trials(monster_row: dict[str, str], trial_start: int, rows: list[Any]) -> None:
+                    block = trial_rows(monster_row, trial_start, rows)
+                    trial_stream.write_block(trial_start, monster_row["monster_id"], block)
+
+        result = CombatEngine(CombatTables.load()).run(
+            config,
+            args.trials,
+            jobs,
+            args.engine,
+            args.target_ci,
+            args.target_ttk_rel_ci,
+            args.action_log_cap,
+            args.action_log_ring,
+            on_duel,
+            args.profile,
+            on_trials,
+        )
+    duels = result.duels
+    monte_carlo = result.matchups
+    report = result.to_dict()
+
+    if summary_stream is not None and action_log_stream is not None:
+        report["stream"] = {
+            "format": args.stream_format,
+            "gzip": args.gzip,
+            "summary_path": str(summary_stream.path.relative_to(ROOT)),
+            "action_log_path": str(action_log_stream.path.relative_to(ROOT)),
+            "action_log_index_path": str(OUT_ACTION_LOG_INDEX_CSV.relative_to(ROOT)),
+        }
+        if trial_stream is not None:
+            report["stream"]["trials_path"] = str(trial_stream.path.relative_to(ROOT))
+            report["stream"]["trial_rows"] = trial_stream.row_count
+
+    write_report_json(report, OUT_REPORT_JSON)
+    if summary_stream is not None and action_log_stream is not None:
+        summary_path = summary_stream.path
+        action_log_path = action_log_stream.path
+        action_count = action_log_stream.row_count
+        output_format = args.stream_format
+    else:
+        summary_path = OUT_SUMMARY_CSV
+        action_log_path = OUT_ACTION_LOG_CSV
+        write_summary_csv(duels, OUT_SUMMARY_CSV)
+        action_count = write_action_log_csv(duels, OUT_ACTION_LOG_CSV)
+        output_format = "csv"
+    if monte_carlo:
+        write_monte_carlo_csv(monte_carlo, OUT_MONTE_CARLO_CSV)
 
     print(f"wrote combat report json -> {OUT_REPORT_JSON}")
-    print(f"wrote combat summary csv -> {OUT_SUMMARY_CSV} ({len(duels)} rows)")
-    print(f"wrote combat action log csv -> {OUT_ACTION_LOG_CSV} ({action_count} rows)")
+    print(f"wrote combat summary {output_format} -> {summary_path} ({len(duels)} rows)")
+    print(f"wrote combat action log {output_format} -> {action_log_path} ({action_count} rows)")
+    if action_log_stream is not None:
+        print(f"wrote combat action log index -> {OUT_ACTION_LOG_INDEX_CSV} ({len(duels)} rows)")
+    if trial_stream is not None:
+        print(f"wrote combat trial rows -> {trial_stream.path} ({trial_stream.row_count} rows)")
     print(
         "summary: "
         f"win_rate={report['summary']['win_rate']}, "
         f"avg_turns={report['summary']['avg_turns']}, "
         f"avg_elapsed_sec={report['summary']['avg_elapsed_sec']}"
     )
+    if monte_carlo:
+        print(f"wrote combat monte carlo csv -> {OUT_MONTE_CARLO_CSV} ({len(monte_carlo)} rows)")
+        for matchup in monte_carlo:
+            print(
+                f"  {matchup['monster_id']}: trials={matchup['trials']}, "
+                f"win_rate={matchup['win_rate']} "
+                f"[{matchup['win_rate_ci_low']}, {matchup['win_rate_ci_high']}], "
+                f"turns_p50={matchup['turns']['p50']}"
+            )
+        adaptive = report["monte_carlo"].get("adaptive")
+        if adaptive:
+            print(
+                f"adaptive: target_ci={adaptive['target_ci']}, target_ttk_rel_ci={adaptive['target_ttk_rel_ci']}, "
+                f"duels_used={adaptive['trials_used_total']}/{adaptive['trials_cap_total']}, "
+                f"duels_saved={adaptive['trials_saved']}"
+            )
+    if result.profile is not None:
+        profile = result.profile
+        print(
+            f"profile: duels={profile['duels']}, turns={profile['turns']}, "
+            f"duels_per_sec={profile['duels_per_sec']}, turns_per_sec={profile['turns_per_sec']}, "
+            f"timer_overhead_ns_per_call={profile['timer_overhead_ns_per_call']}"
+        )
+        for phase, row in profile["phases"].items():
+            print(
+                f"  {phase}: calls={row['calls']}, ns_per_call={row['ns_per_call']}, "
+                f"share_of_duel={row['share_of_duel']}"
+            )
+        for phase, row in profile["sub_phases"].items():
+            print(
+                f"  ({phase}, inside the phases above): calls={row['calls']}, ns_per_call={row['ns_per_call']}, "
+                f"share_of_duel={row['share_of_duel']}, calls_by_parent={row['calls_by_parent']}"
+            )
 
 
 if __name__ == "__main__":
@@ -1,17 +1,107 @@
 #!/usr/bin/env python3
+import argparse
 import csv
+import hashlib
+import json
+import math
+import os
 import random
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from quantile_sketch_v1 import QuantileSketch
+from sim_rng_v1 import RngStream
+
+try:
+    import numpy as np
+except ImportError:  # --sampler numpy unavailable
+    np = None
+
 ROOT = Path(__file__).resolve().parent.parent
 PROGRESSION_CSV = ROOT / "data/progression/realm_progression_v1.csv"
 TRIBULATION_CSV = ROOT / "data/balance/tribulation_failure_weights_v1.csv"
 OUT_DIR = ROOT / "data/sim"
 OUT_CSV = OUT_DIR / "progression_timing_sim_v1.csv"
 OUT_SUMMARY_CSV = OUT_DIR / "progression_timing_summary_v1.csv"
+OUT_CHECK_CSV = OUT_DIR / "progression_analytic_check_v1.csv"
+OUT_PERCENTILE_CSV = OUT_DIR / "progression_stage_percentiles_v1.csv"
+OUT_COHORT_STAGE_CSV = OUT_DIR / "progression_cohort_stage_v1.csv"
+OUT_COHORT_WORLD_CSV = OUT_DIR / "progression_cohort_world_v1.csv"
+STAGE_CACHE_JSON = OUT_DIR / "progression_stage_cache_v1.json"
+STAGE_CACHE_VERSION = 1
+SIM_SOURCE_FILES = (
+    ROOT / "scripts/simulate_progression_v1.py",
+    ROOT / "scripts/sim_rng_v1.py",
+)
 
 SEED = 20260223
 TRIALS_PER_STAGE = 800
+# stream: each stage draws from its own sim_rng_v1 node (SEED, "progression", difficulty_index),
+# so stages can run in any order on any worker. legacy: one random.Random(SEED) shared by all
+# stages in row order (the pre-stream baseline; serial only).
+RNG_MODES = ("stream", "legacy")
+# monte_carlo: TRIALS_PER_STAGE sampled trials. analytic: exact absorbing-chain expectations.
+# check: both, compared per stage within --tolerance-z Monte Carlo standard errors.
+# cohort: whole journeys through every stage, cumulative hours/deaths kept in quantile sketches.
+SIM_MODES = ("monte_carlo", "analytic", "check", "cohort")
+# python: the per-trial loop below. numpy: whole-stage bulk draws (geometric attempts, categorical failures).
+SAMPLERS = ("python", "numpy")
+STAGE_HOURS_PERCENTILES = (50, 90, 99)
+WORLDS = ("mortal", "immortal", "true")
+COHORT_JOURNEYS = 1_000_000
+# Journeys per cohort shard: one seed stream and one set of sketches each; bounds per-worker memory.
+COHORT_SHARD_JOURNEYS = 50_000
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Simulate expected stage hours and deaths per realm stage.")
+    parser.add_argument(
+        "--rng-mode",
+        choices=RNG_MODES,
+        default="stream",
+        help="stream = per-stage seed tree, independent of stage order and --jobs; legacy = one shared rng",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=SIM_MODES,
+        default="monte_carlo",
+        help="analytic = exact expectations (no sampling); check = compare Monte Carlo against analytic",
+    )
+    parser.add_argument(
+        "--tolerance-z",
+        type=float,
+        default=4.0,
+        help="check mode: fail when |monte_carlo - analytic| exceeds this many standard errors",
+    )
+    parser.add_argument(
+        "--sampler",
+        choices=SAMPLERS,
+        default="python",
+        help="numpy = bulk per-stage draws on per-stage seed streams; also writes stage-hour percentiles",
+    )
+    parser.add_argument("--trials", type=int, default=TRIALS_PER_STAGE, help="sampled trials per stage")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="worker processes for sampled stages / cohort shards (0 = os.cpu_count())",
+    )
+    parser.add_argument("--journeys", type=int, default=COHORT_JOURNEYS, help="cohort mode: simulated player journeys")
+    parser.add_argument(
+        "--first-shard",
+        type=int,
+        default=0,
+        help="cohort mode: index of the first seed shard; give separate runs disjoint ranges before merging",
+    )
+    parser.add_argument("--sketch-out", default="", help="cohort mode: write the merged sketches to this JSON path")
+    parser.add_argument(
+        "--merge-sketch",
+        action="append",
+        default=[],
+        help="cohort mode: merge a --sketch-out JSON from another run (repeatable)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update the stage cache")
+    return parser.parse_args()
 
 
 def clamp(v: float, lo: float, hi: float) -> float:
@@ -101,7 +191,12 @@ def sample_fail_outcome(weights: dict, rng: random.Random) -> str:
     return "death"
 
 
-def simulate_stage(row: dict, fail_weights: dict | None, rng: random.Random) -> dict:
+def simulate_stage(
+    row: dict,
+    fail_weights: dict | None,
+    rng: random.Random,
+    trials: int = TRIALS_PER_STAGE,
+) -> dict:
     p_success = clamp(float(row["base_breakthrough_success_pct"]) / 100.0, 0.05, 0.95)
     p_death = clamp(float(row["base_death_pct"]) / 100.0, 0.0, 0.9)
 
@@ -116,7 +211,7 @@ def simulate_stage(row: dict, fail_weights: dict | None, rng: random.Random) ->
     retreat_min = int(row["fail_retreat_min"])
     retreat_max = int(row["fail_retreat_max"])
 
-    for _ in range(TRIALS_PER_STAGE):
+    for _ in range(trials):
         hours = stage_qi_hours
         while True:
             hours += attempt_minutes / 60.0
@@ -145,7 +240,7 @@ def simulate_stage(row: dict, fail_weights: dict | None, rng: random.Random) ->
         stage_hours_trials.append(hours)
 
     expected_hours = sum(stage_hours_trials) / len(stage_hours_trials)
-    death_rate_est = death_trials / TRIALS_PER_STAGE
+    death_rate_est = death_trials / trials
 
     return {
         "expected_stage_hours": round(expected_hours, 4),
@@ -155,21 +250,526 @@ def simulate_stage(row: dict, fail_weights: dict | None, rng: random.Random) ->
     }
 
 
+def draw_stage_trials_numpy(row: dict, fail_weights: dict | None, rng, trials: int) -> tuple:
+    """(stage hours, deaths) arrays of `trials` independent passes through one stage.
+
+    Failures per trial are geometric (attempts until success, minus one).
+    Tribulation failure outcomes are drawn for all failures of the stage at
+    once and folded back into their trials with np.bincount, so the cost is
+    O(trials + failures) array work. Draws differ from the python sampler;
+    the distributions are the same.
+    """
+    p_success = clamp(float(row["base_breakthrough_success_pct"]) / 100.0, 0.05, 0.95)
+    p_death = clamp(float(row["base_death_pct"]) / 100.0, 0.0, 0.9)
+
+    stage_qi_hours = base_stage_cultivation_hours(row)
+    attempt_hours = stage_attempt_time_minutes(row) / 60.0
+    recovery_hours = stage_recovery_minutes(row) / 60.0
+
+    failures = rng.geometric(p_success, trials) - 1
+    hours = stage_qi_hours + attempt_hours * (failures + 1) + recovery_hours * failures
+    deaths = np.zeros(trials)
+
+    total_failures = int(failures.sum())
+    if int(row["is_tribulation"]) == 1 and total_failures:
+        owner = np.repeat(np.arange(trials), failures)
+        penalty = np.zeros(total_failures)
+        if fail_weights is None:
+            died = rng.random(total_failures) < p_death
+        else:
+            p_minor, p_retreat, _ = fail_outcome_probs(fail_weights)
+            roll = rng.random(total_failures)
+            minor = roll < p_minor
+            retreat = ~minor & (roll < p_minor + p_retreat)
+            died = ~minor & ~retreat
+            retreat_min = int(row["fail_retreat_min"])
+            retreat_max = int(row["fail_retreat_max"])
+            if retreat_max <= retreat_min:
+                layers = np.full(total_failures, retreat_min)
+            else:
+                layers = rng.integers(retreat_min, retreat_max + 1, total_failures)
+            penalty[minor] = stage_qi_hours * 0.05
+            # retreat_penalty_hours is linear in layers.
+            penalty[retreat] = retreat_penalty_hours(1, row, stage_qi_hours) * layers[retreat]
+        penalty[died] = death_penalty_hours(row)
+        hours += np.bincount(owner, weights=penalty, minlength=trials)
+        deaths = np.bincount(owner, weights=died.astype(float), minlength=trials)
+    return hours, deaths
+
+
+def simulate_stage_numpy(row: dict, fail_weights: dict | None, rng, trials: int) -> dict:
+    """simulate_stage on draw_stage_trials_numpy, plus stage-hour percentiles."""
+    p_success = clamp(float(row["base_breakthrough_success_pct"]) / 100.0, 0.05, 0.95)
+    p_death = clamp(float(row["base_death_pct"]) / 100.0, 0.0, 0.9)
+    hours, deaths = draw_stage_trials_numpy(row, fail_weights, rng, trials)
+    percentiles = np.percentile(hours, STAGE_HOURS_PERCENTILES)
+    out = {
+        "expected_stage_hours": round(float(hours.mean()), 4),
+        "expected_death_rate": round(float(deaths.mean()), 4),
+        "p_success": round(p_success, 4),
+        "p_death": round(p_death, 4),
+    }
+    for pct, value in zip(STAGE_HOURS_PERCENTILES, percentiles):
+        out[f"stage_hours_p{pct}"] = round(float(value), 4)
+    return out
+
+
+def fail_outcome_probs(weights: dict) -> tuple[float, float, float]:
+    """(minor, retreat, death) probabilities of sample_fail_outcome's uniform(0, 100) roll."""
+    minor = float(weights.get("weight_minor_fail", 100.0))
+    retreat = float(weights.get("weight_retreat_fail", 0.0))
+    p_minor = clamp(minor, 0.0, 100.0) / 100.0
+    p_retreat = clamp(minor + retreat, 0.0, 100.0) / 100.0 - p_minor
+    return p_minor, p_retreat, 1.0 - p_minor - p_retreat
+
+
+def analytic_stage(row: dict, fail_weights: dict | None) -> dict:
+    """simulate_stage solved exactly, with the per-trial standard deviations for the check mode.
+
+    Each attempt fails independently with 1 - p_success, so the failure
+    count F is geometric: E[F] = (1 - p) / p and Var[F] = (1 - p) / p^2.
+    Every failure adds attempt + recovery time plus a penalty X drawn from
+    the failure outcome mix (retreat layers uniform in fail_retreat_min..max),
+    so stage hours = qi hours + attempt + sum of F i.i.d. (attempt + recovery
+    + X), a compound geometric sum with closed-form mean and variance.
+    """
+    p_success = clamp(float(row["base_breakthrough_success_pct"]) / 100.0, 0.05, 0.95)
+    p_death = clamp(float(row["base_death_pct"]) / 100.0, 0.0, 0.9)
+
+    stage_qi_hours = base_stage_cultivation_hours(row)
+    attempt_hours = stage_attempt_time_minutes(row) / 60.0
+    recovery_hours = stage_recovery_minutes(row) / 60.0
+
+    # (probability, penalty hours, deaths) per failure outcome.
+    outcomes = [(1.0, 0.0, 0)]
+    if int(row["is_tribulation"]) == 1:
+        death_hours = death_penalty_hours(row)
+        if fail_weights is None:
+            outcomes = [(p_death, death_hours, 1), (1.0 - p_death, 0.0, 0)]
+        else:
+            p_minor, p_retreat, p_fail_death = fail_outcome_probs(fail_weights)
+            retreat_min = int(row["fail_retreat_min"])
+            retreat_max = int(row["fail_retreat_max"])
+            layer_counts = [retreat_min] if retreat_max <= retreat_min else list(range(retreat_min, retreat_max + 1))
+            outcomes = [(p_minor, stage_qi_hours * 0.05, 0), (p_fail_death, death_hours, 1)]
+            for layers in layer_counts:
+                outcomes.append(
+                    (p_retreat / len(layer_counts), retreat_penalty_hours(layers, row, stage_qi_hours), 0)
+                )
+
+    fail_mean = sum(p * (attempt_hours + recovery_hours + pen) for p, pen, _ in outcomes)
+    fail_sq = sum(p * (attempt_hours + recovery_hours + pen) ** 2 for p, pen, _ in outcomes)
+    fail_var = max(0.0, fail_sq - fail_mean**2)
+    death_per_fail = sum(p * deaths for p, _, deaths in outcomes)
+
+    failures_mean = (1.0 - p_success) / p_success
+    failures_var = (1.0 - p_success) / (p_success * p_success)
+
+    expected_hours = stage_qi_hours + attempt_hours + failures_mean * fail_mean
+    hours_var = failures_mean * fail_var + failures_var * fail_mean**2
+    death_rate = failures_mean * death_per_fail
+    death_var = failures_mean * death_per_fail * (1.0 - death_per_fail) + failures_var * death_per_fail**2
+
+    return {
+        "expected_stage_hours": round(expected_hours, 4),
+        "expected_death_rate": round(death_rate, 4),
+        "p_success": round(p_success, 4),
+        "p_death": round(p_death, 4),
+        "stage_hours_sd": math.sqrt(hours_var),
+        "death_sd": math.sqrt(death_var),
+    }
+
+
+def stage_rng(shared: random.Random | None, difficulty: int) -> random.Random:
+    if shared is not None:
+        return shared
+    return RngStream(SEED, ("progression", difficulty)).python_random()
+
+
+def sample_stage(
+    row: dict,
+    fail_weights: dict | None,
+    shared_rng: random.Random | None,
+    sampler: str,
+    trials: int,
+) -> dict:
+    difficulty = int(row["difficulty_index"])
+    if sampler == "numpy":
+        # Always a per-stage stream: a bulk draw has no row-order position in the legacy shared rng.
+        rng = np.random.default_rng(RngStream(SEED, ("progression", difficulty)).seed)
+        return simulate_stage_numpy(row, fail_weights, rng, trials)
+    return simulate_stage(row, fail_weights, stage_rng(shared_rng, difficulty), trials)
+
+
+def run_stage_task(task: tuple) -> dict:
+    row, fail_weights, sampler, trials = task
+    return sample_stage(row, fail_weights, None, sampler, trials)
+
+
+def resolve_jobs(requested: int, task_count: int) -> int:
+    jobs = requested if requested > 0 else (os.cpu_count() or 1)
+    return max(1, min(jobs, task_count or 1))
+
+
+def source_hash() -> str:
+    digest = hashlib.sha1()
+    for path in SIM_SOURCE_FILES:
+        if path.exists():
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def stage_key(task: tuple) -> str:
+    """SHA-1 of one stage's inputs: progression row, failure-weight row, sampler, trials and seed."""
+    row, fail_weights, sampler, trials = task
+    payload = json.dumps(
+        {"row": row, "fail_weights": fail_weights, "sampler": sampler, "trials": trials, "seed": SEED},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def load_cache(path: Path, source: str) -> dict[str, dict]:
+    if not path.exists():
+        return {}
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    if raw.get("version") != STAGE_CACHE_VERSION or raw.get("source_hash") != source:
+        return {}
+    return raw.get("stages", {})
+
+
+def save_cache(path: Path, source: str, stages: dict[str, dict]) -> None:
+    path.write_text(
+        json.dumps(
+            {"version": STAGE_CACHE_VERSION, "source_hash": source, "stages": stages},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ),
+        encoding="utf-8",
+    )
+
+
+def sample_stages(
+    progression_rows: list[dict],
+    fail_by_difficulty: dict,
+    shared_rng: random.Random | None,
+    sampler: str,
+    trials: int,
+    jobs: int,
+    cache: dict[str, dict] | None = None,
+) -> tuple[list[dict], int]:
+    """sample_stage for every row, in row order, and the number of stages actually sampled.
+
+    With per-stage streams every stage is independent of the others, so the
+    rows are spread over a process pool and the results match --jobs 1
+    exactly, and a stage whose inputs hash to a cache entry is not sampled
+    again. Afterwards cache holds only this run's stages. The legacy shared
+    rng only works serially and uncached.
+    """
+    if shared_rng is not None and sampler == "python":
+        if jobs != 1:
+            raise SystemExit("--rng-mode legacy shares one rng across stages; run it with --jobs 1")
+        sims = [
+            sample_stage(row, fail_by_difficulty.get(int(row["difficulty_index"])), shared_rng, sampler, trials)
+            for row in progression_rows
+        ]
+        return sims, len(sims)
+
+    cache = {} if cache is None else cache
+    tasks = [
+        (row, fail_by_difficulty.get(int(row["difficulty_index"])), sampler, trials) for row in progression_rows
+    ]
+    keys = [stage_key(task) for task in tasks]
+    pending = [(key, task) for key, task in zip(keys, tasks) if key not in cache]
+    # Duplicate rows share a key; sample each key once.
+    pending = list({key: task for key, task in pending}.items())
+    jobs = resolve_jobs(jobs, len(pending))
+    if jobs == 1:
+        sampled = [run_stage_task(task) for _, task in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            sampled = list(
+                executor.map(
+                    run_stage_task, [task for _, task in pending], chunksize=max(1, len(pending) // (jobs * 4))
+                )
+            )
+    for (key, _), sim in zip(pending, sampled):
+        cache[key] = sim
+    # Drop stages this run did not ask for, so the saved cache tracks the current rows instead of every variant ever run.
+    for key in cache.keys() - set(keys):
+        del cache[key]
+    return [cache[key] for key in keys], len(pending)
+
+
+def z_score(sampled: float, exact: float, sd: float, trials: int) -> float:
+    se = sd / math.sqrt(trials)
+    if se == 0:
+        return 0.0 if sampled == exact else math.inf
+    return (sampled - exact) / se
+
+
+def run_check(
+    progression_rows: list[dict],
+    fail_by_difficulty: dict,
+    sampled_rows: list[dict],
+    tolerance_z: float,
+    sampler: str,
+    trials: int,
+) -> None:
+    check_rows = []
+    for row, sampled in zip(progression_rows, sampled_rows):
+        difficulty = int(row["difficulty_index"])
+        fail_weights = fail_by_difficulty.get(difficulty)
+        exact = analytic_stage(row, fail_weights)
+        hours_z = z_score(
+            sampled["expected_stage_hours"], exact["expected_stage_hours"], exact["stage_hours_sd"], trials
+        )
+        death_z = z_score(sampled["expected_death_rate"], exact["expected_death_rate"], exact["death_sd"], trials)
+        check_rows.append(
+            {
+                "difficulty_index": difficulty,
+                "world": row["world"],
+                "is_tribulation": row["is_tribulation"],
+                "monte_carlo_stage_hours": sampled["expected_stage_hours"],
+                "analytic_stage_hours": exact["expected_stage_hours"],
+                "stage_hours_z": round(hours_z, 3),
+                "monte_carlo_death_rate": sampled["expected_death_rate"],
+                "analytic_death_rate": exact["expected_death_rate"],
+                "death_rate_z": round(death_z, 3),
+                "within_tolerance": int(abs(hours_z) <= tolerance_z and abs(death_z) <= tolerance_z),
+            }
+        )
+
+    with OUT_CHECK_CSV.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(check_rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(check_rows)
+
+    failed = [r for r in check_rows if not r["within_tolerance"]]
+    max_z = max(max(abs(r["stage_hours_z"]), abs(r["death_rate_z"])) for r in check_rows)
+    print(f"wrote analytic check -> {OUT_CHECK_CSV} ({len(check_rows)} rows)")
+    print(
+        f"[progression-check] sampler={sampler} trials_per_stage={trials} max_abs_z={max_z:.3f} "
+        f"tolerance_z={tolerance_z} outside={len(failed)}"
+    )
+    if failed:
+        raise SystemExit(
+            "[progression-check] FAIL difficulty_index="
+            + ",".join(str(r["difficulty_index"]) for r in failed[:10])
+        )
+
+
+def run_cohort_shard(task: dict) -> dict:
+    """Quantile sketches of task["journeys"] full journeys on the shard's own seed stream.
+
+    Sketches: "stage:<difficulty_index>:hours"/":deaths" hold cumulative hours
+    and deaths when the stage is cleared; "world:<world>:hours"/":deaths" hold
+    the part spent inside each world. Only the running totals of the shard are
+    kept in memory, never per-stage trials.
+    """
+    rng = np.random.default_rng(RngStream(SEED, ("progression_cohort", task["shard"])).seed)
+    journeys = task["journeys"]
+    cumulative_hours = np.zeros(journeys)
+    cumulative_deaths = np.zeros(journeys)
+    sketches = {}
+
+    def close_world(world: str, start_hours, start_deaths) -> None:
+        sketches[f"world:{world}:hours"] = QuantileSketch()
+        sketches[f"world:{world}:hours"].add_many(cumulative_hours - start_hours)
+        sketches[f"world:{world}:deaths"] = QuantileSketch()
+        sketches[f"world:{world}:deaths"].add_many(cumulative_deaths - start_deaths)
+
+    world = None
+    world_start = (cumulative_hours, cumulative_deaths)
+    for row in task["progression_rows"]:
+        if row["world"] != world:
+            if world is not None:
+                close_world(world, *world_start)
+            world = row["world"]
+            world_start = (cumulative_hours.copy(), cumulative_deaths.copy())
+
+        difficulty = int(row["difficulty_index"])
+        hours, deaths = draw_stage_trials_numpy(row, task["fail_by_difficulty"].get(difficulty), rng, journeys)
+        cumulative_hours += hours
+        cumulative_deaths += deaths
+        sketches[f"stage:{difficulty}:hours"] = QuantileSketch()
+        sketches[f"stage:{difficulty}:hours"].add_many(cumulative_hours)
+        sketches[f"stage:{difficulty}:deaths"] = QuantileSketch()
+        sketches[f"stage:{difficulty}:deaths"].add_many(cumulative_deaths)
+    if world is not None:
+        close_world(world, *world_start)
+    return sketches
+
+
+def merge_sketches(into: dict, other: dict) -> None:
+    for name, sketch in other.items():
+        if name in into:
+            into[name].merge(sketch)
+        else:
+            into[name] = sketch
+
+
+def sketch_columns(sketch: QuantileSketch, prefix: str, as_count: bool = False) -> dict:
+    """mean and p50/p90/p99 columns; death counts are integers, and the sketch error (<0.5%) rounds away."""
+    out = {f"mean_{prefix}": round(sketch.mean, 4)}
+    for pct in STAGE_HOURS_PERCENTILES:
+        value = sketch.quantile(pct / 100.0)
+        out[f"{prefix}_p{pct}"] = int(round(value)) if as_count else round(value, 4)
+    return out
+
+
+def run_cohort(progression_rows: list[dict], fail_by_difficulty: dict, args: argparse.Namespace) -> None:
+    """Simulate args.journeys complete journeys as fixed-size seed shards and merge their sketches.
+
+    Shard boundaries and seeds depend only on --journeys and --first-shard, and
+    sketches are merged in shard order, so the output is the same for any
+    --jobs. Runs on disjoint shard ranges can be merged later with --merge-sketch.
+    """
+    if args.journeys < 0 or args.first_shard < 0:
+        raise SystemExit("--journeys and --first-shard must be >= 0")
+    shard_count = math.ceil(args.journeys / COHORT_SHARD_JOURNEYS)
+    tasks = [
+        {
+            "shard": args.first_shard + idx,
+            "journeys": min(COHORT_SHARD_JOURNEYS, args.journeys - idx * COHORT_SHARD_JOURNEYS),
+            "progression_rows": progression_rows,
+            "fail_by_difficulty": fail_by_difficulty,
+        }
+        for idx in range(shard_count)
+    ]
+    jobs = resolve_jobs(args.jobs, len(tasks))
+
+    merged: dict = {}
+    shard_ranges = [[args.first_shard, args.first_shard + shard_count]] if shard_count else []
+    if jobs == 1:
+        for task in tasks:
+            merge_sketches(merged, run_cohort_shard(task))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for sketches in executor.map(run_cohort_shard, tasks):
+                merge_sketches(merged, sketches)
+
+    for path in args.merge_sketch:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if data["seed"] != SEED:
+            raise SystemExit(f"{path}: seed {data['seed']} != {SEED}")
+        for lo, hi in data["shard_ranges"]:
+            for seen_lo, seen_hi in shard_ranges:
+                if lo < seen_hi and seen_lo < hi:
+                    raise SystemExit(f"{path}: shards {lo}..{hi - 1} overlap {seen_lo}..{seen_hi - 1}")
+            shard_ranges.append([lo, hi])
+        merge_sketches(merged, {name: QuantileSketch.from_dict(d) for name, d in data["sketches"].items()})
+
+    if not merged:
+        raise SystemExit("cohort mode: nothing to report (--journeys 0 and no --merge-sketch)")
+    journeys = merged[f"stage:{progression_rows[0]['difficulty_index']}:hours"].count
+
+    stage_rows = []
+    for row in progression_rows:
+        difficulty = int(row["difficulty_index"])
+        stage_rows.append(
+            {
+                "difficulty_index": difficulty,
+                "world": row["world"],
+                "major_stage_name": row["major_stage_name"],
+                "sub_stage_name": row["sub_stage_name"],
+                "journeys": journeys,
+                **sketch_columns(merged[f"stage:{difficulty}:hours"], "reach_hours"),
+                **sketch_columns(merged[f"stage:{difficulty}:deaths"], "deaths", as_count=True),
+            }
+        )
+
+    last_stage_by_world = {row["world"]: int(row["difficulty_index"]) for row in progression_rows}
+    world_rows = []
+    for world in WORLDS:
+        if world not in last_stage_by_world:
+            continue
+        world_rows.append(
+            {
+                "world": world,
+                "journeys": journeys,
+                **sketch_columns(merged[f"world:{world}:hours"], "world_hours"),
+                **sketch_columns(merged[f"stage:{last_stage_by_world[world]}:hours"], "clear_hours"),
+                **sketch_columns(merged[f"world:{world}:deaths"], "world_deaths", as_count=True),
+            }
+        )
+
+    for path, rows in ((OUT_COHORT_STAGE_CSV, stage_rows), (OUT_COHORT_WORLD_CSV, world_rows)):
+        with path.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+
+    if args.sketch_out:
+        payload = {
+            "seed": SEED,
+            "shard_journeys": COHORT_SHARD_JOURNEYS,
+            "shard_ranges": sorted(shard_ranges),
+            "sketches": {name: sketch.to_dict() for name, sketch in merged.items()},
+        }
+        Path(args.sketch_out).write_text(json.dumps(payload, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"wrote cohort sketches -> {args.sketch_out}")
+
+    print(f"wrote cohort stage curves -> {OUT_COHORT_STAGE_CSV} ({len(stage_rows)} rows, {journeys} journeys)")
+    print(f"wrote cohort world summary -> {OUT_COHORT_WORLD_CSV} ({len(world_rows)} rows)")
+
+
 def main() -> None:
-    rng = random.Random(SEED)
+    args = parse_args()
+    shared_rng = random.Random(SEED) if args.rng_mode == "legacy" else None
+    if args.trials < 1:
+        raise SystemExit("--trials must be >= 1")
+    if (args.sampler == "numpy" or args.mode == "cohort") and np is None:
+        raise SystemExit("--sampler numpy and --mode cohort require numpy (pip install numpy)")
     OUT_DIR.mkdir(parents=True, exist_ok=True)
 
     progression_rows = load_csv(PROGRESSION_CSV)
     fail_rows = load_csv(TRIBULATION_CSV)
     fail_by_difficulty = {int(r["difficulty_index"]): r for r in fail_rows}
 
+    if args.mode == "cohort":
+        run_cohort(progression_rows, fail_by_difficulty, args)
+        return
+
+    if args.mode == "analytic":
+        sims = [analytic_stage(row, fail_by_difficulty.get(int(row["difficulty_index"]))) for row in progression_rows]
+    else:
+        # Legacy stages depend on every draw before them, so only stream/numpy stages are cached.
+        use_cache = not args.no_cache and (shared_rng is None or args.sampler == "numpy")
+        source = source_hash()
+        cache = load_cache(STAGE_CACHE_JSON, source) if use_cache else None
+        sims, computed = sample_stages(
+            progression_rows, fail_by_difficulty, shared_rng, args.sampler, args.trials, args.jobs, cache
+        )
+        if use_cache:
+            save_cache(STAGE_CACHE_JSON, source, cache)
+        print(f"[progression-cache] stages={len(sims)} computed={computed} cached={len(sims) - computed}")
+
+    if args.mode == "check":
+        run_check(progression_rows, fail_by_difficulty, sims, args.tolerance_z, args.sampler, args.trials)
+        return
+
     out_rows = []
+    percentile_rows = []
     cumulative_hours = 0.0
     cumulative_deaths = 0.0
 
-    for row in progression_rows:
+    for row, sim in zip(progression_rows, sims):
         difficulty = int(row["difficulty_index"])
-        sim = simulate_stage(row, fail_by_difficulty.get(difficulty), rng)
+        if args.mode != "analytic" and args.sampler == "numpy":
+            percentile_rows.append(
+                {
+                    "difficulty_index": difficulty,
+                    "world": row["world"],
+                    "is_tribulation": row["is_tribulation"],
+                    "trials": args.trials,
+                    "expected_stage_hours": sim["expected_stage_hours"],
+                    **{f"stage_hours_p{pct}": sim[f"stage_hours_p{pct}"] for pct in STAGE_HOURS_PERCENTILES},
+                    "expected_death_rate": sim["expected_death_rate"],
+                }
+            )
 
         cumulative_hours += sim["expected_stage_hours"]
         cumulative_deaths += sim["expected_death_rate"]
@@ -221,14 +821,22 @@ def main() -> None:
         bucket["avg_stage_hours"] = round(bucket["expected_world_hours"] / count, 4)
         bucket["avg_stage_death_rate"] = round(bucket["expected_world_deaths"] / count, 4)
 
-    summary_rows = [world_summary[k] for k in ("mortal", "immortal", "true") if k in world_summary]
+    summary_rows = [world_summary[k] for k in WORLDS if k in world_summary]
     with OUT_SUMMARY_CSV.open("w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=list(summary_rows[0].keys()))
         writer.writeheader()
         writer.writerows(summary_rows)
 
+    if percentile_rows:
+        with OUT_PERCENTILE_CSV.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(percentile_rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(percentile_rows)
+
     print(f"wrote stage simulation -> {OUT_CSV} ({len(out_rows)} rows)")
     print(f"wrote summary simulation -> {OUT_SUMMARY_CSV} ({len(summary_rows)} rows)")
+    if percentile_rows:
+        print(f"wrote stage percentiles -> {OUT_PERCENTILE_CSV} ({len(percentile_rows)} rows)")
 
 
 if __name__ == "__main__":
@@ -110,6 +110,22 @@ export interface MonsterRow {
   note: string;
 }
 
+export interface MonsterMechanicRow {
+  special_mechanic: string;
+  on_hit_status: "" | "burn" | "slow" | "stun" | "armor_break" | "weaken";
+  on_hit_chance: number;
+  on_hit_duration_sec: number;
+  on_hit_source_atk_scale: number;
+  passive_def_multiplier: number;
+  passive_crit_rate_add: number;
+  passive_damage_reduction_add: number;
+  first_strike_damage_multiplier: number;
+  has_execute_bonus: boolean;
+  execute_target_hp_below_ratio: number;
+  execute_damage_multiplier: number;
+  on_hit_heal_ratio: number;
+}
+
 export interface MapNodeRow {
   node_id: string;
   world: "mortal" | "immortal" | "true";
@@ -404,6 +420,7 @@ export interface BalanceTables {
   potionTalismans: PotionTalismanRow[];
   skills: SkillRow[];
   monsters: MonsterRow[];
+  monsterMechanics: MonsterMechanicRow[];
   mapNodes: MapNodeRow[];
   mapEvents: MapEventRow[];
   dropPools: DropPoolRow[];
@@ -432,6 +449,7 @@ export interface BalanceIndexes {
   potionTalismanById: Map<string, PotionTalismanRow>;
   skillById: Map<string, SkillRow>;
   monsterById: Map<string, MonsterRow>;
+  monsterMechanicByTag: Map<string, MonsterMechanicRow>;
   mapNodeById: Map<string, MapNodeRow>;
   mapEventsByTable: Map<string, MapEventRow[]>;
   dropPoolByGroup: Map<string, DropPoolRow[]>;
@@ -492,6 +510,7 @@ export async function loadBalanceTables(
     potionTalismans,
     skills,
     monsters,
+    monsterMechanics,
     mapNodes,
     mapEvents,
     dropPools,
@@ -526,6 +545,9 @@ export async function loadBalanceTables(
     ),
     readJsonFile<SkillRow[]>(resolve(exportDir, "skills_v1.json")),
     readJsonFile<MonsterRow[]>(resolve(exportDir, "monsters_v1.json")),
+    readJsonFile<MonsterMechanicRow[]>(
+      resolve(exportDir, "monster_mechanics_v1.json"),
+    ),
     readJsonFile<MapNodeRow[]>(resolve(exportDir, "map_nodes_v1.json")),
     readJsonFile<MapEventRow[]>(resolve(exportDir, "map_events_v1.json")),
     readJsonFile<DropPoolRow[]>(resolve(exportDir, "drop_pools_v1.json")),
@@ -568,6 +590,7 @@ export async function loadBalanceTables(
     potionTalismans,
     skills,
     monsters,
+    monsterMechanics,
     mapNodes,
     mapEvents,
     dropPools,
@@ -597,6 +620,7 @@ export function buildBalanceIndexes(tables: BalanceTables): BalanceIndexes {
   const potionTalismanById = new Map<string, PotionTalismanRow>();
   const skillById = new Map<string, SkillRow>();
   const monsterById = new Map<string, MonsterRow>();
+  const monsterMechanicByTag = new Map<string, MonsterMechanicRow>();
   const mapNodeById = new Map<string, MapNodeRow>();
   const mapEventsByTable = new Map<string, MapEventRow[]>();
   const dropPoolByGroup = new Map<string, DropPoolRow[]>();
@@ -637,6 +661,9 @@ export function buildBalanceIndexes(tables: BalanceTables): BalanceIndexes {
   for (const row of tables.monsters) {
     monsterById.set(row.monster_id, row);
   }
+  for (const row of tables.monsterMechanics) {
+    monsterMechanicByTag.set(row.special_mechanic, row);
+  }
   for (const row of tables.mapNodes) {
     mapNodeById.set(row.node_id, row);
   }
@@ -709,6 +736,7 @@ export function buildBalanceIndexes(tables: BalanceTables): BalanceIndexes {
     potionTalismanById,
     skillById,
     monsterById,
+    monsterMechanicByTag,
     mapNodeById,
     mapEventsByTable,
     dropPoolByGroup,
@@ -187,182 +187,37 @@ function normalizeElement(raw: string): CombatElement {
   return "none";
 }
 
-function getMonsterMechanicRule(tag: string): MonsterMechanicRule | null {
-  switch (tag) {
-    case "burn_claw":
-      return {
-        onHitStatus: {
-          type: "burn",
-          chance: 0.42,
-          durationSec: 4.0,
-          sourceAtkScale: 0.9,
-        },
-      };
-    case "burn_field":
-      return {
-        onHitStatus: {
-          type: "burn",
-          chance: 0.35,
-          durationSec: 4.5,
-          sourceAtkScale: 0.9,
-        },
-      };
-    case "burn_stack":
-      return {
-        onHitStatus: {
-          type: "burn",
-          chance: 0.45,
-          durationSec: 5.0,
-          sourceAtkScale: 0.95,
-        },
-      };
-    case "root_bind":
-      return {
-        onHitStatus: {
-          type: "stun",
-          chance: 0.26,
-          durationSec: 1.4,
-        },
-      };
-    case "frozen_prison":
-      return {
-        onHitStatus: {
-          type: "stun",
-          chance: 0.30,
-          durationSec: 1.6,
-        },
-      };
-    case "time_stop":
-      return {
-        onHitStatus: {
-          type: "stun",
-          chance: 0.34,
-          durationSec: 1.6,
-        },
-      };
-    case "slow_aura":
-      return {
-        onHitStatus: {
-          type: "slow",
-          chance: 0.70,
-          durationSec: 4.5,
-        },
-      };
-    case "slow_field":
-      return {
-        onHitStatus: {
-          type: "slow",
-          chance: 0.62,
-          durationSec: 4.0,
-        },
-      };
-    case "charm_gaze":
-      return {
-        onHitStatus: {
-          type: "slow",
-          chance: 0.58,
-          durationSec: 3.8,
-        },
-      };
-    case "armor_break":
-    case "time_cut":
-      return {
-        onHitStatus: {
-          type: "armor_break",
-          chance: 0.56,
-          durationSec: 4.0,
-        },
-      };
-    case "law_suppress":
-    case "fear_aura":
-      return {
-        onHitStatus: {
-          type: "weaken",
-          chance: 0.55,
-          durationSec: 4.2,
-        },
-      };
-    case "poison_stack":
-      return {
-        onHitStatus: {
-          type: "burn",
-          chance: 0.38,
-          durationSec: 4.5,
-          sourceAtkScale: 0.75,
-        },
-      };
-    case "chain_lightning":
-    case "thunderstorm":
-    case "judgment_mark":
-    case "triple_tribulation":
-      return {
-        onHitStatus: {
-          type: "stun",
-          chance: 0.18,
-          durationSec: 1.0,
-        },
-      };
-    case "high_crit":
-      return {
-        passiveCritRateAdd: 0.08,
-      };
-    case "high_def":
-      return {
-        passiveDefMultiplier: 1.14,
-        passiveDamageReductionAdd: 0.08,
-      };
-    case "adaptive_armor":
-      return {
-        passiveDefMultiplier: 1.12,
-        passiveDamageReductionAdd: 0.06,
-      };
-    case "law_barrier":
-      return {
-        passiveDefMultiplier: 1.18,
-        passiveDamageReductionAdd: 0.16,
-      };
-    case "shield_cast":
-      return {
-        passiveDamageReductionAdd: 0.12,
-      };
-    case "invuln_phase":
-      return {
-        passiveDamageReductionAdd: 0.18,
-      };
-    case "blink_strike":
-    case "multi_dash":
-    case "phase_shift":
-      return {
-        firstStrikeDamageMultiplier: 1.28,
-      };
-    case "execute_mark":
-      return {
-        executeBonus: {
-          targetHpBelowRatio: 0.35,
-          damageMultiplier: 1.30,
-        },
-      };
-    case "soul_harvest":
-      return {
-        executeBonus: {
-          targetHpBelowRatio: 0.30,
-          damageMultiplier: 1.35,
-        },
-      };
-    case "origin_tribulation":
-      return {
-        executeBonus: {
-          targetHpBelowRatio: 0.45,
-          damageMultiplier: 1.40,
-        },
-      };
-    case "heal_link":
-      return {
-        onHitHealRatio: 0.08,
-      };
-    default:
-      return null;
+function getMonsterMechanicRule(
+  tag: string,
+  indexes: BalanceIndexes,
+): MonsterMechanicRule | null {
+  const row = indexes.monsterMechanicByTag.get(tag);
+  if (!row) {
+    return null;
+  }
+
+  const rule: MonsterMechanicRule = {
+    passiveCritRateAdd: row.passive_crit_rate_add,
+    passiveDamageReductionAdd: row.passive_damage_reduction_add,
+    passiveDefMultiplier: row.passive_def_multiplier,
+    onHitHealRatio: row.on_hit_heal_ratio,
+    firstStrikeDamageMultiplier: row.first_strike_damage_multiplier,
+  };
+  if (row.on_hit_status !== "") {
+    rule.onHitStatus = {
+      type: row.on_hit_status,
+      chance: row.on_hit_chance,
+      durationSec: row.on_hit_duration_sec,
+      sourceAtkScale: row.on_hit_source_atk_scale,
+    };
+  }
+  if (row.has_execute_bonus) {
+    rule.executeBonus = {
+      targetHpBelowRatio: row.execute_target_hp_below_ratio,
+      damageMultiplier: row.execute_damage_multiplier,
+    };
   }
+  return rule;
 }
 
 function isElementAdvantage(
@@ -699,7 +554,7 @@ function buildMonsterStats(
   monster: BalanceTables["monsters"][number],
   indexes: BalanceIndexes,
 ): CombatUnitStats {
-  const mechanicRule = getMonsterMechanicRule(monster.special_mechanic);
+  const mechanicRule = getMonsterMechanicRule(monster.special_mechanic, indexes);
   const hpMult = Math.max(0.5, toNumber(monster.hp_mult, 1));
   const atkMult = Math.max(0.5, toNumber(monster.atk_mult, 1));
   const defMult = Math.max(0.5, toNumber(monster.def_mult, 1));
@@ -1026,7 +881,7 @@ function simulateDuel(
   indexes: BalanceIndexes,
 ): DuelResult {
   const rng = new SeededRng(rngSeed);
-  const monsterMechanicRule = getMonsterMechanicRule(monsterRow.special_mechanic);
+  const monsterMechanicRule = getMonsterMechanicRule(monsterRow.special_mechanic, indexes);
   const player = makeUnit("player", "player_01", "수련자", playerStats, "none");
   const monster = makeUnit(
     "monster",